@@ -0,0 +1,277 @@
+"""
+Measure the startup of the repository before it does useful work:
+    - The import time of each module, cold (without the bytecode
+      cache, so everything is compiled) and warm (with the cache).
+    - The time to construct the Tuner with each backend.
+    - The time from the start of the process to the first turn.
+    - The time to collect the tests.
+
+Each measurement is done in a new Python process so nothing
+is already imported. The modules, backends and functions that don't
+exist in the measured checkout, like in the older commits, are
+recorded as "n/a".
+
+Run it from the root of the repository with:
+    python -m benchmarks.imports --output startup.json
+
+Another checkout, for example an older commit, can be measured and
+compared with a previous run with:
+    python -m benchmarks.imports --root path/to/checkout --compare startup.json
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks import results
+
+modules = [
+    "physics",
+    "sound",
+    "pitch",
+    "inference",
+    "logic",
+    "instrument",
+    "guitars",
+    "harplike",
+    "live",
+    "fleet",
+    "interaction",
+    "main",
+]
+
+# Measured inside the process, the code gives the seconds in the variable t
+firstTurn = {
+    "first turn tuner": (
+        "import logic\n"
+        "logic.Tuner().tune(440, 430, 0.65)\n"
+        "t = time.perf_counter() - start\n"
+    ),
+    # Instrument.tuneStep() and the limits of tune() are newer
+    "first turn guitar": (
+        "import guitars\n"
+        "guitar = guitars.ClassicalGuitar()\n"
+        "guitar.turner.tune(\n"
+        "    guitar.frequencies[0], guitar.stringFrequencies[0], guitar.lengths[0]\n"
+        ")\n"
+        "t = time.perf_counter() - start\n"
+    ),
+}
+
+
+def runChild(code: str, root: str, env: dict = None) -> float:
+    """
+    Run code in a new process and get the seconds it measures.
+
+    The code has the time of its start in the variable start
+    and has to leave the measured seconds in the variable t.
+
+    Args:
+        - code (str): The code to run.
+        - root (str): The directory where the code is run.
+        - env (dict): The environment variables of the process.
+
+    Returns:
+        - float: The measured seconds or None if the code failed.
+    """
+    script = f"import time\nstart = time.perf_counter()\n{code}\nprint(repr(t))\n"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def repeatChild(code: str, root: str, repeat: int, env: dict = None) -> list:
+    """
+    Run code several times with runChild().
+
+    Args:
+        - code (str): The code to run.
+        - root (str): The directory where the code is run.
+        - repeat (int): The number of measurements.
+        - env (dict): The environment variables of the processes.
+
+    Returns:
+        - list: The seconds of each measurement or None if the code failed.
+    """
+    samples = []
+    for _ in range(repeat):
+        seconds = runChild(code, root, env)
+        if seconds is None:
+            return None
+        samples.append(seconds)
+    return samples
+
+
+def timeImport(module: str, root: str, repeat: int, cold: bool) -> list:
+    """
+    Measure the time to import a module.
+
+    A cold import uses an empty directory for the bytecode cache,
+    so the module and all its dependencies are compiled again.
+
+    Args:
+        - module (str): The name of the module.
+        - root (str): The directory of the repository.
+        - repeat (int): The number of measurements.
+        - cold (bool): A boolean that indicates if the import is cold.
+
+    Returns:
+        - list: The seconds of each measurement or None if the module doesn't exist.
+    """
+    code = f"import {module}\nt = time.perf_counter() - start"
+
+    if not cold:
+        # The first import writes the bytecode cache
+        if runChild(code, root) is None:
+            return None
+        return repeatChild(code, root, repeat)
+
+    samples = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as cache:
+            env = {**os.environ, "PYTHONPYCACHEPREFIX": cache}
+            seconds = runChild(code, root, env)
+        if seconds is None:
+            return None
+        samples.append(seconds)
+
+    return samples
+
+
+def timeTuner(backend: str, root: str, repeat: int) -> list:
+    """
+    Measure the time to construct a Tuner, without the imports.
+
+    Args:
+        - backend (str): The backend of the Tuner.
+        - root (str): The directory of the repository.
+        - repeat (int): The number of measurements.
+
+    Returns:
+        - list: The seconds of each measurement or None if the backend doesn't exist.
+    """
+    # The older Tuners only have the default skfuzzy backend, without argument
+    arguments = "" if backend == "skfuzzy" else f"backend={backend!r}"
+    code = (
+        "import logic\n"
+        "start = time.perf_counter()\n"
+        f"logic.Tuner({arguments})\n"
+        "t = time.perf_counter() - start"
+    )
+    return repeatChild(code, root, repeat)
+
+
+def timeProcess(command: list, root: str, repeat: int) -> list:
+    """
+    Measure the wall time of a command in a new process.
+
+    Args:
+        - command (list): The command and its arguments.
+        - root (str): The directory where the command is run.
+        - repeat (int): The number of measurements.
+
+    Returns:
+        - list: The seconds of each measurement or None if the command failed.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            command,
+            cwd=root,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if result.returncode != 0:
+            return None
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def runBenchmark(root: str, repeat: int, verbose: bool = True) -> dict:
+    """
+    Do all the measurements of the startup.
+
+    Args:
+        - root (str): The directory of the repository.
+        - repeat (int): The number of measurements of each kind.
+        - verbose (bool): A boolean that indicates if the results are printed.
+
+    Returns:
+        - dict: The measurements, see results.measurement(),
+                or "n/a" for the ones that failed.
+    """
+    measurements = {}
+
+    def record(name: str, samples: list) -> None:
+        if samples is None:
+            measurements[name] = results.notAvailable
+            if verbose:
+                print(f"{name}: n/a")
+            return
+
+        measurements[name] = results.measurement(samples)
+        if verbose:
+            print(f"{name}: {measurements[name]['median'] * 1000:.0f} ms")
+
+    record("interpreter", timeProcess([sys.executable, "-c", "pass"], root, repeat))
+
+    for module in modules:
+        record(f"import {module} warm", timeImport(module, root, repeat, False))
+        record(f"import {module} cold", timeImport(module, root, repeat, True))
+
+    backends = ["skfuzzy", "numpy"]
+    # The table backend would create the control surface, which takes minutes
+    if os.path.exists(os.path.join(root, "turns.surface")):
+        backends.append("table")
+
+    for backend in backends:
+        record(f"tuner {backend}", timeTuner(backend, root, repeat))
+
+    for name, code in firstTurn.items():
+        record(name, repeatChild(code, root, repeat))
+
+    record(
+        "test collection",
+        timeProcess(
+            [sys.executable, "-m", "pytest", "--collect-only", "-q", "tests"],
+            root,
+            repeat,
+        ),
+    )
+
+    return measurements
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the startup time.")
+    parser.add_argument("--root", default=os.getcwd(), help="The checkout to measure.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="The JSON file where the run is saved.")
+    parser.add_argument("--compare", help="The JSON file of a run to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    run = results.createRun(
+        "imports", runBenchmark(os.path.abspath(args.root), args.repeat), args.root
+    )
+
+    if args.output:
+        results.saveRun(run, args.output)
+
+    if args.compare:
+        comparison = results.compareRuns(
+            results.loadRun(args.compare), run, args.threshold
+        )
+        print()
+        results.printComparison(comparison)
+        sys.exit(1 if any(row["regression"] for row in comparison) else 0)
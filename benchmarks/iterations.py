@@ -0,0 +1,110 @@
+"""
+Compare the iterations needed to tune the instruments with each strategy:
+    - fuzzy: The "numpy" backend of logic.Tuner.
+    - adaptive: The solver.AdaptiveTuner around the same Tuner, that
+      learns the gain of each string without knowing its material.
+    - physics: The solver.PhysicsSolver, that knows the material.
+
+The instruments that are not tuned, because of the limits or because
+some strings failed, count with the iterations they did, so they are
+also shown apart.
+
+Run it from the root of the repository with:
+    python -m benchmarks.iterations --output iterations.json
+"""
+
+import argparse
+import random
+import guitars
+import harplike
+import instrument
+import numpy as np
+import fleet
+from benchmarks import results
+
+strategies = {"fuzzy": "numpy", "adaptive": "adaptive", "physics": "physics"}
+
+
+def createInstruments(nRandom: int) -> dict:
+    """
+    Create the instruments of each group with fixed seeds.
+
+    Args:
+        - nRandom (int): The number of RandomInstruments of each size.
+
+    Returns:
+        - dict: The instruments by the name of their group.
+    """
+    np.random.seed(0)
+    random.seed(0)
+
+    groups = {
+        "ClassicalGuitar": [guitars.ClassicalGuitar()],
+        "ElectricGuitar": [guitars.ElectricGuitar()],
+        "BassTuningGuitar": [guitars.BassTuningGuitar()],
+        "Harp36String": [harplike.Harp36String()],
+    }
+
+    for nStrings in [6, 40]:
+        groups[f"RandomInstrument {nStrings}"] = [
+            instrument.RandomInstrument(nStrings) for _ in range(nRandom)
+        ]
+
+    return groups
+
+
+def runBenchmark(nRandom: int, timeLimit: float, verbose: bool = True) -> dict:
+    """
+    Tune all the instruments with each strategy.
+
+    Args:
+        - nRandom (int): The number of RandomInstruments of each size.
+        - timeLimit (float): The time limit for each instrument in seconds.
+        - verbose (bool): A boolean that indicates if the results are printed.
+
+    Returns:
+        - dict: The iterations of each group and strategy, see
+                results.measurement(), with the number of
+                instruments that converged in "converged".
+    """
+    groups = createInstruments(nRandom)
+    instruments = [inst for group in groups.values() for inst in group]
+
+    measurements = {}
+
+    for strategy, backend in strategies.items():
+        tuned, _ = fleet.runFleet(
+            instruments, backend=backend, timeLimit=timeLimit, verbose=False
+        )
+
+        start = 0
+        for group, members in groups.items():
+            groupResults = tuned[start : start + len(members)]
+            start += len(members)
+
+            name = f"{group} {strategy}"
+            measurements[name] = results.measurement(
+                [r["iterations"] for r in groupResults], "iterations"
+            )
+            measurements[name]["converged"] = sum(r["converged"] for r in groupResults)
+
+            if verbose:
+                print(
+                    f"{name}: {measurements[name]['median']:.0f} iterations, "
+                    f"{measurements[name]['converged']}/{len(members)} converged"
+                )
+
+    return measurements
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the tuning strategies.")
+    parser.add_argument("--random", type=int, default=10)
+    parser.add_argument("--timeLimit", type=float, default=2)
+    parser.add_argument("--output", help="The JSON file where the run is saved.")
+    args = parser.parse_args()
+
+    run = results.createRun("iterations", runBenchmark(args.random, args.timeLimit))
+
+    if args.output:
+        results.saveRun(run, args.output)
@@ -0,0 +1,292 @@
+"""
+Measure the hot paths of the tuner, the physics and the sound:
+    - Tuner.calculateTurn() one string at a time and
+      Tuner.calculateTurns() for many strings, with each backend.
+    - Instrument.tune() from zero tension of a ClassicalGuitar, a
+      Harp36String and big RandomInstruments, with the monitor that
+      damps the strings, until all of them are tuned.
+    - sound.createCordFrequency() for several frequencies.
+    - Tuner.createDataframe() on a reduced grid.
+
+The inputs are created with fixed seeds and every measurement is
+repeated, see benchmarks.results for the JSON files of the runs.
+
+Run it from the root of the repository with:
+    python -m benchmarks.micro --output micro.json
+
+And compare it with a previous run with:
+    python -m benchmarks.micro --compare micro.json
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import guitars
+import harplike
+import instrument
+import logic
+import numpy as np
+import sound
+from benchmarks import results
+
+
+def timeRepeats(function, repeat: int, setup=None) -> list:
+    """
+    Measure a function several times after a call to warm it up.
+
+    Args:
+        - function (function): The function to measure, it gets
+                            the result of the setup if there is one.
+        - repeat (int): The number of measurements.
+        - setup (function): The function that creates the argument of each
+                            measurement, its time is not measured.
+
+    Returns:
+        - list: The seconds of each measurement.
+    """
+    samples = []
+
+    for i in range(repeat + 1):
+        argument = setup() if setup is not None else None
+
+        start = time.perf_counter()
+        if setup is not None:
+            function(argument)
+        else:
+            function()
+        seconds = time.perf_counter() - start
+
+        # The first call fills the caches
+        if i > 0:
+            samples.append(seconds)
+
+    return samples
+
+
+def benchmarkTurns(tuners: dict, repeat: int) -> dict:
+    """
+    Measure the calculation of the turns.
+
+    Args:
+        - tuners (dict): The Tuners by backend.
+        - repeat (int): The number of measurements.
+
+    Returns:
+        - dict: The time per turn of calculateTurn() and the turns
+                per second of calculateTurns() for each backend.
+    """
+    rng = np.random.default_rng(0)
+    nSingle = 200
+    nBatch = 100000
+
+    differences = rng.uniform(-3000, 3000, nBatch)
+    stringLengths = rng.uniform(0.05, 1.5, nBatch)
+
+    measurements = {}
+
+    for backend, tuner in tuners.items():
+        # The simulation of skfuzzy caches the results, so each
+        # measurement uses the next strings of the inputs
+        nextStrings = (
+            slice(start, start + nSingle) for start in range(0, nBatch, nSingle)
+        ).__next__
+
+        def single(strings):
+            for i in range(strings.start, strings.stop):
+                tuner.calculateTurn(differences[i], stringLengths[i])
+
+        samples = timeRepeats(single, repeat, nextStrings)
+        measurements[f"calculateTurn {backend}"] = results.measurement(
+            [seconds / nSingle for seconds in samples]
+        )
+
+        # skfuzzy calculates the batch one by one
+        if backend == "skfuzzy":
+            nTurns, setup = nSingle, nextStrings
+        else:
+            nTurns, setup = nBatch, lambda: slice(None)
+
+        samples = timeRepeats(
+            lambda strings: tuner.calculateTurns(
+                differences[strings], stringLengths[strings]
+            ),
+            repeat,
+            setup,
+        )
+        measurements[f"calculateTurns {backend}"] = results.measurement(
+            [nTurns / seconds for seconds in samples], "turns/s"
+        )
+
+    return measurements
+
+
+def benchmarkInstruments(tuners: dict, repeat: int) -> dict:
+    """
+    Measure the tuning of the instruments with Instrument.tune(),
+    from zero tension until all the strings are tuned.
+
+    Args:
+        - tuners (dict): The Tuners by backend.
+        - repeat (int): The number of measurements.
+
+    Returns:
+        - dict: The time of tune() of each instrument and the strings per
+                second that it turns, for each backend.
+    """
+    measurements = {}
+
+    def randomInstrument(nStrings: int) -> instrument.Instrument:
+        np.random.seed(nStrings)
+        random.seed(nStrings)
+        return instrument.RandomInstrument(nStrings)
+
+    def tune(inst: instrument.Instrument) -> int:
+        try:
+            turns = inst.tune()
+        except instrument.TuningError as error:
+            turns = error.result["turns"]
+        return int(np.count_nonzero(turns))
+
+    for backend, tuner in tuners.items():
+
+        def create(build):
+            inst = build()
+            # A new simulation of skfuzzy so the results are not cached
+            inst.turner = logic.Tuner() if backend == "skfuzzy" else tuner
+            return inst
+
+        # The skfuzzy backend would take minutes with the big instruments
+        sizes = [] if backend == "skfuzzy" else [100, 1000]
+
+        builds = {
+            "ClassicalGuitar": guitars.ClassicalGuitar,
+            "Harp36String": harplike.Harp36String,
+        }
+        builds.update(
+            {f"RandomInstrument {n}": lambda n=n: randomInstrument(n) for n in sizes}
+        )
+
+        for name, build in builds.items():
+            # The instruments are the same every time, so are their turns
+            turned = tune(create(build))
+
+            samples = timeRepeats(tune, repeat, lambda: create(build))
+            measurements[f"tune {name} {backend}"] = results.measurement(samples)
+            measurements[f"tune {name} {backend} strings"] = results.measurement(
+                [turned / seconds for seconds in samples], "strings/s"
+            )
+
+    return measurements
+
+
+def benchmarkSound(repeat: int) -> dict:
+    """
+    Measure the synthesis of the sound of a string.
+
+    Args:
+        - repeat (int): The number of measurements.
+
+    Returns:
+        - dict: The time of createCordFrequency() for each frequency.
+    """
+    measurements = {}
+
+    for frequency in [55, 110, 220, 440, 880, 1760]:
+        rng = np.random.default_rng(0)
+        samples = timeRepeats(
+            lambda: sound.createCordFrequency(frequency, rng=rng), repeat
+        )
+        measurements[f"createCordFrequency {frequency} Hz"] = results.measurement(
+            samples
+        )
+
+    return measurements
+
+
+def benchmarkDataframe(repeat: int) -> dict:
+    """
+    Measure the creation of the DataFrame of the turns on
+    a grid with a tenth of the points of each axis.
+
+    Args:
+        - repeat (int): The number of measurements.
+
+    Returns:
+        - dict: The time of createDataframe().
+    """
+    tuner = logic.Tuner(backend="numpy")
+    frequencies = tuner.antecedentFrequency().universe[::10]
+    lengths = tuner.antecedentLength().universe[::10]
+
+    with tempfile.TemporaryDirectory() as directory:
+        tuner.dataframePath = os.path.join(directory, "turns.parquet")
+
+        samples = timeRepeats(
+            lambda: tuner.createDataframe(
+                frequencies=frequencies, lengths=lengths, nWorkers=1, resume=False
+            ),
+            repeat,
+        )
+
+    return {"createDataframe reduced": results.measurement(samples)}
+
+
+def runBenchmark(repeat: int, verbose: bool = True) -> dict:
+    """
+    Do all the measurements.
+
+    Args:
+        - repeat (int): The number of measurements of each kind.
+        - verbose (bool): A boolean that indicates if the results are printed.
+
+    Returns:
+        - dict: The measurements, see results.measurement().
+    """
+    backends = ["skfuzzy", "numpy"]
+    # The table backend would create the control surface, which takes minutes
+    if os.path.exists(logic.Tuner.surfacePath):
+        backends.append("table")
+
+    tuners = {backend: logic.Tuner(backend=backend) for backend in backends}
+
+    measurements = {}
+
+    for benchmark in [
+        lambda: benchmarkTurns(tuners, repeat),
+        lambda: benchmarkInstruments(tuners, repeat),
+        lambda: benchmarkSound(repeat),
+        lambda: benchmarkDataframe(repeat),
+    ]:
+        new = benchmark()
+        measurements.update(new)
+
+        if verbose:
+            for name, result in new.items():
+                print(f"{name}: {result['median']:.6g} {result['unit']}")
+
+    return measurements
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the hot paths.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="The JSON file where the run is saved.")
+    parser.add_argument("--compare", help="The JSON file of a run to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    run = results.createRun("micro", runBenchmark(args.repeat))
+
+    if args.output:
+        results.saveRun(run, args.output)
+
+    if args.compare:
+        comparison = results.compareRuns(
+            results.loadRun(args.compare), run, args.threshold
+        )
+        print()
+        results.printComparison(comparison)
+        sys.exit(1 if any(row["regression"] for row in comparison) else 0)
@@ -0,0 +1,227 @@
+"""
+Save the results of the benchmarks in JSON files and compare two runs.
+
+Each run is a dictionary with information about the machine and the
+commit, and the measurements in "results" as:
+    {name: {"median": float, "min": float, "max": float, "samples": list, "unit": str}}
+or notAvailable for the ones that can't be done in that checkout.
+
+Two runs are compared with:
+    python -m benchmarks.results old.json new.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+# A measurement that can't be done, for example of a module that doesn't exist
+notAvailable = "n/a"
+
+
+def measurement(samples: list, unit: str = "s") -> dict:
+    """
+    Summarize the repetitions of a measurement.
+
+    Args:
+        - samples (list): The value of each repetition.
+        - unit (str): The unit of the values.
+
+    Returns:
+        - dict: The median, minimum and maximum of the samples, the samples and the unit.
+    """
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "samples": list(samples),
+        "unit": unit,
+    }
+
+
+def commit(root: str) -> str:
+    """
+    Get the commit of a checkout of the repository.
+
+    Args:
+        - root (str): The directory of the checkout.
+
+    Returns:
+        - str: The hash of the commit or None if it is not a git repository.
+    """
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def createRun(benchmark: str, results: dict, root: str = None) -> dict:
+    """
+    Create a run with the information needed to compare it later.
+
+    Args:
+        - benchmark (str): The name of the benchmark.
+        - results (dict): The measurements, see measurement().
+        - root (str): The directory of the measured checkout.
+
+    Returns:
+        - dict: The run.
+    """
+    root = os.getcwd() if root is None else root
+
+    return {
+        "benchmark": benchmark,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit(root),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+
+
+def saveRun(run: dict, path: str) -> None:
+    """
+    Save a run in a JSON file.
+
+    Args:
+        - run (dict): The run, see createRun().
+        - path (str): The path of the file.
+
+    Returns:
+        - None
+    """
+    with open(path, "w") as file:
+        json.dump(run, file, indent=2)
+        file.write("\n")
+
+
+def loadRun(path: str) -> dict:
+    """
+    Load a run from a JSON file.
+
+    Args:
+        - path (str): The path of the file.
+
+    Returns:
+        - dict: The run.
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compareRuns(old: dict, new: dict, threshold: float = 0.1) -> list:
+    """
+    Compare the medians of the measurements that are in both runs.
+    The ones that are not available in any of them are listed apart.
+
+    The values are times, so bigger is worse. A measurement whose
+    unit ends with "/s" is a throughput, so smaller is worse.
+
+    A measurement is a regression if its median is worse by more than
+    the threshold and all its samples are worse than all the samples of
+    the reference, so the noise of a few slow repetitions is ignored.
+
+    Args:
+        - old (dict): The reference run.
+        - new (dict): The run that is checked.
+        - threshold (float): The relative change from which a measurement
+                            is a regression.
+
+    Returns:
+        - list: A dictionary for each measurement with its name, the old
+                and new medians, the relative change, where positive is
+                worse, and if it is a regression. The medians and the
+                change of the measurements that are not available are None.
+    """
+    comparison = []
+
+    for name, result in new["results"].items():
+        if name not in old["results"]:
+            continue
+
+        reference = old["results"][name]
+
+        if notAvailable in (reference, result):
+            comparison.append(
+                {
+                    "name": name,
+                    "old": None if reference == notAvailable else reference["median"],
+                    "new": None if result == notAvailable else result["median"],
+                    "unit": None,
+                    "change": None,
+                    "regression": False,
+                }
+            )
+            continue
+
+        before = reference["median"]
+        after = result["median"]
+
+        change = (after - before) / before if before else 0.0
+        separated = result["min"] > reference["max"]
+        if result["unit"].endswith("/s"):
+            change = -change
+            separated = result["max"] < reference["min"]
+
+        comparison.append(
+            {
+                "name": name,
+                "old": before,
+                "new": after,
+                "unit": result["unit"],
+                "change": change,
+                "regression": change > threshold and separated,
+            }
+        )
+
+    return comparison
+
+
+def printComparison(comparison: list) -> None:
+    """
+    Print a comparison of two runs as a table.
+
+    Args:
+        - comparison (list): The comparison, see compareRuns().
+
+    Returns:
+        - None
+    """
+    width = max([len(row["name"]) for row in comparison], default=0)
+
+    for row in comparison:
+        if row["change"] is None:
+            old = notAvailable if row["old"] is None else f"{row['old']:.6g}"
+            new = notAvailable if row["new"] is None else f"{row['new']:.6g}"
+            print(f"{row['name']:<{width}}  {old:>12} -> {new:>12}")
+            continue
+
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<{width}}  {row['old']:12.6g} -> {row['new']:12.6g} "
+            f"{row['unit']:<6} {row['change']:+8.1%}{flag}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("old", help="The JSON file of the reference run.")
+    parser.add_argument("new", help="The JSON file of the checked run.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="The relative change from which a measurement is a regression.",
+    )
+    args = parser.parse_args()
+
+    comparison = compareRuns(loadRun(args.old), loadRun(args.new), args.threshold)
+    printComparison(comparison)
+
+    # A failing exit status so it can be used in scripts
+    sys.exit(1 if any(row["regression"] for row in comparison) else 0)
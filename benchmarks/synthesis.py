@@ -0,0 +1,63 @@
+"""
+Compare the time to synthesize the strings of the instruments with the
+vectorized Karplus-Strong algorithm and with the original loop.
+
+Run it from the root of the repository with:
+    python -m benchmarks.synthesis
+"""
+
+import guitars
+import harplike
+import numpy as np
+import sound
+import time
+
+
+def timeSynthesis(function, delayLines: list, nSamples: int, repeat: int = 5) -> float:
+    """
+    Measure the time to synthesize all the strings.
+
+    The first call is not measured, because it can import the filters of
+    scipy or fill caches, and the best of the repetitions is returned.
+
+    Args:
+        - function (function): The implementation of the Karplus-Strong algorithm.
+        - delayLines (list): The initial noise of each string.
+        - nSamples (int): The number of samples of each signal.
+        - repeat (int): The number of measurements.
+
+    Returns:
+        - float: The time in seconds.
+    """
+    function(delayLines[0], nSamples, 0.99)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for delayLine in delayLines:
+            function(delayLine, nSamples, 0.99)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+if __name__ == "__main__":
+    sr = 16000
+    nSamples = 2 * sr
+
+    np.random.seed(0)
+
+    for inst in [guitars.ClassicalGuitar(), harplike.Harp36String()]:
+        delayLines = [
+            np.random.rand(int(sr / frequency)) * 2 - 1
+            for frequency in inst.frequencies
+        ]
+
+        loop = timeSynthesis(sound.karplusStrongLoop, delayLines, nSamples)
+        vectorized = timeSynthesis(sound.karplusStrong, delayLines, nSamples)
+
+        print(
+            f"{type(inst).__name__} ({len(delayLines)} strings): "
+            f"loop {loop * 1000:.1f} ms, vectorized {vectorized * 1000:.1f} ms, "
+            f"speedup {loop / vectorized:.1f}x"
+        )
@@ -0,0 +1,223 @@
+import instrument
+import logic
+import solver
+import numpy as np
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# The backends of the fuzzy Tuner, "adaptive" for the solver.AdaptiveTuner
+# around the "numpy" one and "physics" for the solver.PhysicsSolver
+backends = logic.Tuner.backends + ("adaptive", "physics")
+
+
+def tuneInstrument(
+    inst: instrument.Instrument,
+    index: int = 0,
+    timeLimit: float = 10,
+    maxIterations: int = 1000,
+) -> dict:
+    """
+    Tune an instrument and measure how it went.
+
+    It tunes it with Instrument.tune() but the strings
+    that are not tuned are reported instead of raising an error.
+
+    Args:
+        - inst (instrument.Instrument): The instrument to tune.
+        - index (int): The position of the instrument in the fleet.
+        - timeLimit (float): The time limit for the tuning in seconds, 0 for none.
+        - maxIterations (int): The maximum number of iterations, 0 for none.
+
+    Returns:
+        - dict: The result of the instrument with:
+            - index (int): The position of the instrument in the fleet.
+            - strings (int): The number of strings.
+            - iterations (int): The number of iterations.
+            - revolutions (float): The sum of the absolute turns.
+            - converged (bool): If all the strings were tuned.
+            - reason (str): Why the tuning stopped, see instrument.TuningMonitor.result().
+            - failed (dict): The status of the strings that are not tuned by their index.
+            - seconds (float): The time of the tuning.
+    """
+    start = time.perf_counter()
+
+    try:
+        turns = inst.tune(timeLimit=timeLimit, maxIterations=maxIterations)
+        reason, failed = "tuned", {}
+    except instrument.TuningError as error:
+        turns = error.result["turns"]
+        reason, failed = error.result["reason"], error.result["failed"]
+
+    return {
+        "index": index,
+        "strings": len(inst.frequencies),
+        "iterations": len(turns),
+        "revolutions": float(sum(np.sum(np.abs(turn)) for turn in turns)),
+        "converged": not failed,
+        "reason": reason,
+        "failed": failed,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def initWorker(backend: str, surfacePath: str = None) -> None:
+    """
+    Create the Tuner of a process of tuneFleet(),
+    it is shared by all the instruments of the process.
+
+    The "table" backend only opens the control surface
+    that tuneFleet() created before starting the pool.
+
+    Args:
+        - backend (str): The backend of the Tuner, see backends.
+        - surfacePath (str): The path of the control surface of the parent.
+                            By default logic.Tuner.surfacePath.
+
+    Returns:
+        - None
+    """
+    if backend == "physics":
+        instrument.Instrument.turner = solver.PhysicsSolver()
+    elif backend == "adaptive":
+        instrument.Instrument.turner = solver.AdaptiveTuner(
+            logic.Tuner(backend="numpy")
+        )
+    elif backend == "table":
+        if surfacePath is not None:
+            logic.Tuner.surfacePath = surfacePath
+        instrument.Instrument.turner = logic.Tuner(backend=backend, buildSurface=False)
+    else:
+        instrument.Instrument.turner = logic.Tuner(backend=backend)
+
+
+def tuneFleet(
+    instruments: list,
+    *,
+    backend: str = "skfuzzy",
+    nWorkers: int = None,
+    timeLimit: float = 10,
+):
+    """
+    Tune many instruments in a pool of processes, each one with its own Tuner.
+
+    The results are given as soon as each instrument finishes,
+    so they are not in the order of the instruments.
+
+    Args:
+        - instruments (list): The instruments to tune, they are not modified.
+        - backend (str): The backend of the Tuners, see backends.
+        - nWorkers (int): The number of processes. By default the number of CPUs.
+        - timeLimit (float): The time limit for each instrument in seconds.
+
+    Returns:
+        - Iterator[dict]: The results of the instruments, see tuneInstrument().
+    """
+    if backend not in backends:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {backends}")
+
+    if backend == "table":
+        # Only this process creates the control surface, the pool opens it
+        logic.Tuner(backend=backend)
+
+    with ProcessPoolExecutor(
+        max_workers=nWorkers,
+        initializer=initWorker,
+        initargs=(backend, logic.Tuner.surfacePath),
+    ) as executor:
+        futures = [
+            executor.submit(tuneInstrument, inst, index, timeLimit)
+            for index, inst in enumerate(instruments)
+        ]
+
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(results: list, seconds: float) -> dict:
+    """
+    Aggregate the results of a fleet.
+
+    Args:
+        - results (list): The results of tuneFleet().
+        - seconds (float): The wall time of the whole fleet.
+
+    Returns:
+        - dict: The number of instruments, how many converged, the mean
+                iterations and revolutions of the converged ones and the
+                throughput in instruments, strings and iterations per second.
+                The instruments that didn't converge are counted by the
+                reason why they stopped in reasons, "timeLimit" in timeouts,
+                and their strings that failed by status in failedStrings.
+    """
+    converged = [result for result in results if result["converged"]]
+    reasons = Counter(r["reason"] for r in results if not r["converged"])
+
+    return {
+        "instruments": len(results),
+        "converged": len(converged),
+        "timeouts": reasons["timeLimit"],
+        "reasons": dict(reasons),
+        "failedStrings": dict(
+            Counter(status for r in results for status in r["failed"].values())
+        ),
+        "meanIterations": (
+            float(np.mean([r["iterations"] for r in converged])) if converged else 0.0
+        ),
+        "meanRevolutions": (
+            float(np.mean([r["revolutions"] for r in converged])) if converged else 0.0
+        ),
+        "seconds": seconds,
+        "instrumentsPerSecond": len(results) / seconds,
+        "stringsPerSecond": sum(r["strings"] for r in results) / seconds,
+        "iterationsPerSecond": sum(r["iterations"] for r in results) / seconds,
+    }
+
+
+def runFleet(
+    instruments: list,
+    *,
+    backend: str = "skfuzzy",
+    nWorkers: int = None,
+    timeLimit: float = 10,
+    verbose: bool = True,
+) -> tuple:
+    """
+    Tune a fleet showing the progress and measure the throughput.
+
+    Args:
+        - instruments (list): The instruments to tune.
+        - backend (str): The backend of the Tuners, see backends.
+        - nWorkers (int): The number of processes. By default the number of CPUs.
+        - timeLimit (float): The time limit for each instrument in seconds.
+        - verbose (bool): A boolean that indicates if the progress is shown.
+
+    Returns:
+        - tuple: The results ordered like the instruments and the summary.
+    """
+    from tqdm import tqdm
+
+    start = time.perf_counter()
+    results = []
+
+    for result in tqdm(
+        tuneFleet(instruments, backend=backend, nWorkers=nWorkers, timeLimit=timeLimit),
+        total=len(instruments),
+        desc="Tuning instruments",
+        disable=not verbose,
+    ):
+        results.append(result)
+
+    summary = summarize(results, time.perf_counter() - start)
+    results.sort(key=lambda result: result["index"])
+
+    return results, summary
+
+
+if __name__ == "__main__":
+    fleet = [instrument.RandomInstrument(np.random.randint(1, 40)) for _ in range(1000)]
+
+    results, summary = runFleet(fleet, backend="numpy")
+
+    for key, value in summary.items():
+        print(f"{key}: {value}")
@@ -0,0 +1,691 @@
+from skfuzzy import control as ctrl
+from skfuzzy.control.term import Term, TermAggregate
+import numpy as np
+import bisect
+import struct
+import os
+
+
+class FuzzyEngine:
+    """
+    Precompiled Mamdani inference for a skfuzzy control system.
+
+    It reproduces what ControlSystemSimulation.compute() does (clipping,
+    fuzzification, rule aggregation, accumulation, upsampling of the
+    consequent universe and defuzzification) but with plain NumPy arrays
+    that are built only once, so each evaluation avoids the graph traversal
+    and the per-simulation state of skfuzzy.
+
+    The results are the same as the ones of skfuzzy up to floating point
+    rounding, we check them with an absolute tolerance of TOLERANCE.
+    """
+
+    # Maximum absolute difference allowed against skfuzzy
+    TOLERANCE = 1e-9
+
+    # Number of inputs whose cuts are calculated at the same time
+    cutsChunkSize = 65536
+
+    # Number of distinct cuts that are defuzzified at the same time
+    chunkSize = 1024
+
+    def __init__(self, controlSystem: ctrl.ControlSystem) -> None:
+        """
+        Initialize the FuzzyEngine class.
+
+        It reads the antecedents, the consequent, the rules and the
+        defuzzification method of the control system.
+
+        Args:
+            - controlSystem (ctrl.ControlSystem): The control system to compile.
+                                                It must have only one consequent.
+
+        Returns:
+            - None
+        """
+        consequents = list(controlSystem.consequents)
+
+        if len(consequents) != 1:
+            raise ValueError("The control system must have only one consequent.")
+
+        self.consequent = consequents[0]
+
+        if self.consequent.defuzzify_method not in ("mom", "som", "lom"):
+            raise ValueError(
+                f"Defuzzify method {self.consequent.defuzzify_method} not supported."
+            )
+
+        # The antecedents in the order they are given to compute()
+        self.antecedents = {}
+        for antecedent in controlSystem.antecedents:
+            self.antecedents[antecedent.label] = {
+                "universe": antecedent.universe.astype(np.float64),
+                "terms": {
+                    label: term.mf.astype(np.float64)
+                    for label, term in antecedent.terms.items()
+                },
+            }
+
+        self.rules = []
+        for rule in controlSystem.rules:
+            for weighted in rule.consequent:
+                self.rules.append(
+                    (
+                        self.compileExpression(
+                            rule.antecedent, rule.and_func, rule.or_func
+                        ),
+                        weighted.term.label,
+                        weighted.weight,
+                    )
+                )
+
+        # Only the terms used by a rule take part in the defuzzification
+        self.turnLabels = [
+            label
+            for label in self.consequent.terms
+            if any(label == r[1] for r in self.rules)
+        ]
+
+        self.universe = self.consequent.universe.astype(np.float64)
+        self.mfs = np.array(
+            [self.consequent.terms[label].mf for label in self.turnLabels],
+            dtype=np.float64,
+        )
+        # skfuzzy interpolates the membership over the upsampled universe,
+        # including the original points
+        self.upsampledMfs = np.array(
+            [np.interp(self.universe, self.universe, mf) for mf in self.mfs]
+        )
+        self.accumulation = self.consequent.accumulation_method
+
+    def compileExpression(self, expression, andFunc, orFunc) -> tuple:
+        """
+        Convert the antecedent of a rule into nested tuples
+        that can be evaluated without skfuzzy.
+
+        Args:
+            - expression (ctrl.term.TermPrimitive): The antecedent of the rule.
+            - andFunc (function): The function used for the AND of the rule.
+            - orFunc (function): The function used for the OR of the rule.
+
+        Returns:
+            - tuple: The compiled expression.
+        """
+        if isinstance(expression, Term):
+            return ("term", expression.parent.label, expression.label)
+
+        elif isinstance(expression, TermAggregate):
+            if expression.kind == "not":
+                return (
+                    "not",
+                    self.compileExpression(expression.term1, andFunc, orFunc),
+                )
+            return (
+                andFunc if expression.kind == "and" else orFunc,
+                self.compileExpression(expression.term1, andFunc, orFunc),
+                self.compileExpression(expression.term2, andFunc, orFunc),
+            )
+
+        raise ValueError(f"Antecedent {expression} not supported.")
+
+    def evaluateExpression(self, expression: tuple, memberships: dict) -> np.ndarray:
+        """
+        Evaluate a compiled antecedent.
+
+        Args:
+            - expression (tuple): The compiled expression.
+            - memberships (dict): The membership values of every term
+                                of every antecedent.
+
+        Returns:
+            - np.ndarray: The firing strength of the rule.
+        """
+        if expression[0] == "term":
+            return memberships[expression[1]][expression[2]]
+        elif expression[0] == "not":
+            return 1.0 - self.evaluateExpression(expression[1], memberships)
+
+        return expression[0](
+            self.evaluateExpression(expression[1], memberships),
+            self.evaluateExpression(expression[2], memberships),
+        )
+
+    def fuzzify(self, inputs: dict) -> dict:
+        """
+        Calculate the membership values of the inputs.
+
+        As skfuzzy does, the inputs are clipped to the universes.
+
+        Args:
+            - inputs (dict): The crisp values for each antecedent.
+
+        Returns:
+            - dict: The membership value of every term of every antecedent.
+        """
+        memberships = {}
+
+        for label, antecedent in self.antecedents.items():
+            universe = antecedent["universe"]
+            value = np.clip(inputs[label], universe.min(), universe.max())
+            memberships[label] = {
+                term: np.interp(value, universe, mf, left=0.0, right=0.0)
+                for term, mf in antecedent["terms"].items()
+            }
+
+        return memberships
+
+    def calculateCuts(self, inputs: dict) -> np.ndarray:
+        """
+        Calculate the activation of every term of the consequent.
+
+        Args:
+            - inputs (dict): The crisp values for each antecedent as 1D arrays.
+
+        Returns:
+            - np.ndarray: The cuts with shape (terms, inputs).
+        """
+        memberships = self.fuzzify(inputs)
+        cuts = [None] * len(self.turnLabels)
+
+        for expression, label, weight in self.rules:
+            activation = self.evaluateExpression(expression, memberships) * weight
+            i = self.turnLabels.index(label)
+            if cuts[i] is None:
+                cuts[i] = activation
+            else:
+                cuts[i] = self.accumulation(activation, cuts[i])
+
+        return np.array(cuts, dtype=np.float64)
+
+    def defuzzify(self, cuts: np.ndarray) -> np.ndarray:
+        """
+        Defuzzify the consequent for several inputs at the same time.
+
+        skfuzzy adds to the universe the points where each membership
+        function crosses its cut, so we evaluate the original universe
+        and those points separately and join them before the
+        mean/min/max of the maximum.
+
+        Args:
+            - cuts (np.ndarray): The cuts with shape (terms, inputs).
+
+        Returns:
+            - np.ndarray: The crisp value for each input.
+        """
+        nInputs = cuts.shape[1]
+        universe = self.universe
+
+        # Output membership on the original universe
+        output = np.zeros((nInputs, len(universe)))
+        for t in range(len(self.turnLabels)):
+            np.maximum(
+                output,
+                np.minimum(cuts[t][:, None], self.upsampledMfs[t][None, :]),
+                out=output,
+            )
+
+        # Points added by the cuts
+        rows = []
+        values = []
+        for t, mf in enumerate(self.mfs):
+            cut = cuts[t][:, None]
+            above = np.where(cut == 0, mf[None, :] > cut, mf[None, :] >= cut)
+            row, idx = np.nonzero(above[:, 1:] != above[:, :-1])
+            rows.append(row)
+            values.append(
+                universe[idx]
+                + (cuts[t][row] - mf[idx])
+                * (universe[idx + 1] - universe[idx])
+                / (mf[idx + 1] - mf[idx])
+            )
+        rows = np.concatenate(rows)
+        values = np.concatenate(values)
+
+        # Remove repeated points like np.union1d does
+        order = np.lexsort((values, rows))
+        rows = rows[order]
+        values = values[order]
+        unique = np.ones(len(values), dtype=bool)
+        unique[1:] = (rows[1:] != rows[:-1]) | (values[1:] != values[:-1])
+        position = np.clip(np.searchsorted(universe, values), 0, len(universe) - 1)
+        unique &= universe[position] != values
+        rows = rows[unique]
+        values = values[unique]
+
+        extraOutput = np.zeros(len(values))
+        for t, mf in enumerate(self.mfs):
+            np.maximum(
+                extraOutput,
+                np.minimum(
+                    cuts[t][rows], np.interp(values, universe, mf, left=0.0, right=0.0)
+                ),
+                out=extraOutput,
+            )
+
+        # The maximum of the whole upsampled universe
+        maximum = output.max(axis=1)
+        np.maximum.at(maximum, rows, extraOutput)
+
+        isMax = output == maximum[:, None]
+        extraIsMax = extraOutput == maximum[rows]
+        rows = rows[extraIsMax]
+        values = values[extraIsMax]
+
+        method = self.consequent.defuzzify_method
+        if method == "mom":
+            total = np.where(isMax, universe[None, :], 0).sum(axis=1)
+            total += np.bincount(rows, weights=values, minlength=nInputs)
+            count = isMax.sum(axis=1) + np.bincount(rows, minlength=nInputs)
+            return total / count
+
+        elif method == "som":
+            result = np.where(isMax, universe[None, :], np.inf).min(axis=1)
+            np.minimum.at(result, rows, values)
+            return result
+
+        result = np.where(isMax, universe[None, :], -np.inf).max(axis=1)
+        np.maximum.at(result, rows, values)
+        return result
+
+    def computeMany(self, inputs: dict) -> np.ndarray:
+        """
+        Compute the output of the controller for arrays of inputs.
+
+        Many inputs activate the rules in the same way (for example every
+        frequency difference above the last slope of "far"), so only the
+        distinct cuts are defuzzified.
+
+        Args:
+            - inputs (dict): The crisp values for each antecedent.
+                            The arrays are broadcasted against each other.
+
+        Returns:
+            - np.ndarray: The output with the broadcasted shape of the inputs.
+        """
+        arrays = np.broadcast_arrays(
+            *[np.asarray(inputs[label], dtype=np.float64) for label in self.antecedents]
+        )
+        shape = arrays[0].shape
+        flat = [a.ravel() for a in arrays]
+        output = np.empty(flat[0].size if flat else 0)
+
+        for start in range(0, len(output), self.cutsChunkSize):
+            end = start + self.cutsChunkSize
+            chunk = {
+                label: values[start:end]
+                for label, values in zip(self.antecedents, flat)
+            }
+            cuts = self.calculateCuts(chunk)
+
+            if cuts.shape[1] > 1:
+                cuts, inverse = np.unique(cuts, axis=1, return_inverse=True)
+            else:
+                inverse = np.zeros(1, dtype=np.intp)
+
+            values = np.empty(cuts.shape[1])
+            for i in range(0, len(values), self.chunkSize):
+                values[i : i + self.chunkSize] = self.defuzzify(
+                    cuts[:, i : i + self.chunkSize]
+                )
+
+            output[start:end] = values[inverse.ravel()]
+
+        return output.reshape(shape)
+
+    def compute(self, inputs: dict) -> float:
+        """
+        Compute the output of the controller for one input.
+
+        Args:
+            - inputs (dict): The crisp value for each antecedent.
+
+        Returns:
+            - float: The output of the controller.
+        """
+        return float(
+            self.computeMany({label: [value] for label, value in inputs.items()})[0]
+        )
+
+
+class ControlSurface:
+    """
+    Turns of the controller precomputed on a grid of frequency
+    differences and string lengths.
+
+    A turn is answered by bilinear interpolation between the
+    four closest points of the grid.
+
+    It can be saved in a raw binary file that is opened as a read-only
+    memory map, so several processes share the same pages without
+    copying or parsing the turns. The file has a header of headerSize bytes:
+        - magic (8 bytes), version (uint32) and padding (uint32).
+        - number of frequencies and number of lengths (uint64).
+        - maximum interpolation error (float64).
+        - fingerprint of the controller (64 ASCII bytes).
+    followed by the frequencies, the lengths and the turns in row-major
+    order, all of them little-endian float64.
+    """
+
+    magic = b"RAINSURF"
+    # The version 1 files have the error of the centres of the cells only
+    version = 2
+    headerFormat = "<8sIIQQd64s"
+    headerSize = 128
+
+    def __init__(
+        self,
+        frequencies: np.ndarray,
+        lengths: np.ndarray,
+        turns: np.ndarray,
+        *,
+        error: float = np.nan,
+        fingerprint: str = "",
+    ) -> None:
+        """
+        Initialize the ControlSurface class.
+
+        Args:
+            - frequencies (np.ndarray): The increasing frequency differences of the grid.
+            - lengths (np.ndarray): The increasing string lengths of the grid.
+            - turns (np.ndarray): The turns with shape (frequencies, lengths).
+            - error (float): The maximum interpolation error, see maxError().
+            - fingerprint (str): The fingerprint of the controller of the turns.
+
+        Returns:
+            - None
+        """
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.lengths = np.asarray(lengths, dtype=np.float64)
+        self.turns = np.asarray(turns, dtype=np.float64)
+        self.error = error
+        self.fingerprint = fingerprint
+
+        if self.turns.shape != (len(self.frequencies), len(self.lengths)):
+            raise ValueError(
+                "The shape of the turns must be the number of frequencies and lengths."
+            )
+
+        self.frequencyList = self.frequencies.tolist()
+        self.lengthList = self.lengths.tolist()
+
+    def save(self, path: str) -> None:
+        """
+        Save the surface in a file that can be opened with open().
+
+        It is written with another name and then renamed, so the
+        processes that have the old file opened are not affected.
+
+        Args:
+            - path (str): The path of the file.
+
+        Returns:
+            - None
+        """
+        header = struct.pack(
+            self.headerFormat,
+            self.magic,
+            self.version,
+            0,
+            len(self.frequencies),
+            len(self.lengths),
+            self.error,
+            self.fingerprint.encode("ascii"),
+        )
+
+        with open(path + ".tmp", "wb") as file:
+            file.write(header.ljust(self.headerSize, b"\0"))
+            for array in (self.frequencies, self.lengths, self.turns):
+                file.write(np.ascontiguousarray(array, dtype="<f8").tobytes())
+
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def readHeader(cls, path: str) -> dict:
+        """
+        Read the header of a file created with save().
+
+        Args:
+            - path (str): The path of the file.
+
+        Returns:
+            - dict: The number of frequencies and lengths,
+                    the error and the fingerprint.
+        """
+        with open(path, "rb") as file:
+            header = file.read(cls.headerSize)
+
+        if len(header) != cls.headerSize:
+            raise ValueError(f"{path} is not a control surface file.")
+
+        magic, version, _, nFrequencies, nLengths, error, fingerprint = (
+            struct.unpack_from(cls.headerFormat, header)
+        )
+
+        if magic != cls.magic or version != cls.version:
+            raise ValueError(f"{path} is not a control surface file.")
+
+        return {
+            "nFrequencies": nFrequencies,
+            "nLengths": nLengths,
+            "error": error,
+            "fingerprint": fingerprint.rstrip(b"\0").decode("ascii"),
+        }
+
+    @classmethod
+    def open(cls, path: str) -> "ControlSurface":
+        """
+        Open a file created with save() as a read-only memory map.
+
+        Args:
+            - path (str): The path of the file.
+
+        Returns:
+            - ControlSurface: The surface whose arrays are views of the file.
+        """
+        header = cls.readHeader(path)
+        nFrequencies = header["nFrequencies"]
+        nLengths = header["nLengths"]
+
+        data = np.memmap(
+            path,
+            dtype="<f8",
+            mode="r",
+            offset=cls.headerSize,
+            shape=(nFrequencies + nLengths + nFrequencies * nLengths,),
+        )
+
+        return cls(
+            data[:nFrequencies],
+            data[nFrequencies : nFrequencies + nLengths],
+            data[nFrequencies + nLengths :].reshape(nFrequencies, nLengths),
+            error=header["error"],
+            fingerprint=header["fingerprint"],
+        )
+
+    def contains(self, differences: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Check which points are inside the grid.
+
+        Args:
+            - differences (np.ndarray): The absolute frequency differences.
+            - lengths (np.ndarray): The string lengths.
+
+        Returns:
+            - np.ndarray: A boolean array that is True inside the grid.
+        """
+        return (
+            (differences >= self.frequencies[0])
+            & (differences <= self.frequencies[-1])
+            & (lengths >= self.lengths[0])
+            & (lengths <= self.lengths[-1])
+        )
+
+    @staticmethod
+    def locate(axis: np.ndarray, values: np.ndarray) -> tuple:
+        """
+        Find the cell of the axis for each value and the
+        position of the value inside the cell.
+
+        Values outside the axis are clipped to its limits.
+
+        Args:
+            - axis (np.ndarray): The increasing values of the axis.
+            - values (np.ndarray): The values to locate.
+
+        Returns:
+            - tuple: The index of the start of the cell and the weight of the end.
+        """
+        values = np.clip(values, axis[0], axis[-1])
+        index = np.clip(
+            np.searchsorted(axis, values, side="right") - 1, 0, len(axis) - 2
+        )
+        weight = (values - axis[index]) / (axis[index + 1] - axis[index])
+        return index, weight
+
+    def interpolate(self, differences: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Interpolate the turns of the grid.
+
+        Args:
+            - differences (np.ndarray): The absolute frequency differences.
+            - lengths (np.ndarray): The string lengths.
+
+        Returns:
+            - np.ndarray: The interpolated turns.
+        """
+        i, wf = self.locate(self.frequencies, differences)
+        j, wl = self.locate(self.lengths, lengths)
+
+        return (1 - wf) * (
+            (1 - wl) * self.turns[i, j] + wl * self.turns[i, j + 1]
+        ) + wf * ((1 - wl) * self.turns[i + 1, j] + wl * self.turns[i + 1, j + 1])
+
+    def interpolateOne(self, difference: float, length: float) -> float:
+        """
+        Interpolate the turn of one point inside the grid.
+
+        It is the same as interpolate() but without the overhead
+        of NumPy for a single value.
+
+        Args:
+            - difference (float): The absolute frequency difference.
+            - length (float): The string length.
+
+        Returns:
+            - float: The interpolated turn.
+        """
+        i = min(
+            max(bisect.bisect_right(self.frequencyList, difference) - 1, 0),
+            len(self.frequencyList) - 2,
+        )
+        j = min(
+            max(bisect.bisect_right(self.lengthList, length) - 1, 0),
+            len(self.lengthList) - 2,
+        )
+        wf = (difference - self.frequencyList[i]) / (
+            self.frequencyList[i + 1] - self.frequencyList[i]
+        )
+        wl = (length - self.lengthList[j]) / (
+            self.lengthList[j + 1] - self.lengthList[j]
+        )
+
+        turns = self.turns
+
+        return float(
+            (1 - wf) * ((1 - wl) * turns[i, j] + wl * turns[i, j + 1])
+            + wf * ((1 - wl) * turns[i + 1, j] + wl * turns[i + 1, j + 1])
+        )
+
+    def maxError(
+        self,
+        reference,
+        jump: float = 0.01,
+        nInterior: int = 4,
+        nSamples: int = 10000,
+        seed: int = 0,
+    ) -> float:
+        """
+        Calculate the maximum interpolation error against the controller.
+
+        The mean of maximum defuzzification makes the surface jump inside
+        some cells, so the error is bounded cell by cell:
+            - The cells whose corners differ more than jump are evaluated in
+            nInterior x nInterior interior points. The interpolation stays
+            between the smallest and the biggest corner, so the bound of the
+            cell is the furthest that the controller gets from that range.
+            - In the rest of the cells the surface is smooth, so the error is
+            evaluated in the centres of random cells, which is where bilinear
+            interpolation is furthest from the points of the grid.
+
+        Args:
+            - reference (function): The controller used as reference. It takes
+                                    the arrays of differences and lengths and
+                                    returns the turns.
+            - jump (float): The difference between the corners of a cell
+                            from which it is evaluated in its interior.
+            - nInterior (int): The number of interior points along each axis.
+            - nSamples (int): The number of random smooth cells.
+            - seed (int): The seed of the random cells.
+
+        Returns:
+            - float: The maximum absolute difference in the turns.
+        """
+        turns = np.asarray(self.turns)
+        corners = np.stack(
+            [turns[:-1, :-1], turns[1:, :-1], turns[:-1, 1:], turns[1:, 1:]]
+        )
+        low = corners.min(axis=0)
+        high = corners.max(axis=0)
+        jumps = high - low > jump
+
+        error = 0.0
+
+        # The interior points of the cells with jumps
+        i, j = np.nonzero(jumps)
+        positions = (np.arange(nInterior) + 0.5) / nInterior
+        wf, wl = np.meshgrid(positions, positions, indexing="ij")
+        differences = self.frequencies[i, None] + wf.ravel() * (
+            self.frequencies[i + 1, None] - self.frequencies[i, None]
+        )
+        lengths = self.lengths[j, None] + wl.ravel() * (
+            self.lengths[j + 1, None] - self.lengths[j, None]
+        )
+
+        if len(i):
+            values = reference(differences.ravel(), lengths.ravel()).reshape(
+                differences.shape
+            )
+            error = max(
+                error,
+                float(
+                    np.max(
+                        np.maximum(
+                            values.max(axis=1) - low[i, j],
+                            high[i, j] - values.min(axis=1),
+                        )
+                    )
+                ),
+            )
+
+        # The centres of random smooth cells
+        i, j = np.nonzero(~jumps)
+        if len(i):
+            chosen = np.random.default_rng(seed).integers(0, len(i), nSamples)
+            i, j = i[chosen], j[chosen]
+
+            differences = (self.frequencies[i] + self.frequencies[i + 1]) / 2
+            lengths = (self.lengths[j] + self.lengths[j + 1]) / 2
+
+            error = max(
+                error,
+                float(
+                    np.max(
+                        np.abs(
+                            self.interpolate(differences, lengths)
+                            - reference(differences, lengths)
+                        )
+                    )
+                ),
+            )
+
+        return error
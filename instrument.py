@@ -1,19 +1,253 @@
 import abc
 import sound
 import physics
-import logic
 import numpy as np
+import threading
 import time
+import tracing
 import random
-import matplotlib.pyplot as plt
 from typing import List
 
 
+class LazyTuner:
+    """
+    The Tuner shared by all the instruments.
+
+    It is created the first time it is used and not when the module is
+    imported, because building the fuzzy controller takes a while. If
+    several threads use it at the same time only one Tuner is created.
+
+    Assigning a Tuner to the class or to an instance replaces it.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the LazyTuner class.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.tuner = None
+        self.lock = threading.Lock()
+
+    def __get__(self, instance, owner):
+        """
+        Give the Tuner, creating it if it doesn't exist yet.
+
+        Args:
+            - instance (Instrument): The instrument or None if it is the class.
+            - owner (type): The class of the instrument.
+
+        Returns:
+            - logic.Tuner: The shared Tuner.
+        """
+        if self.tuner is None:
+            with self.lock:
+                if self.tuner is None:
+                    import logic
+
+                    self.tuner = logic.Tuner()
+
+        return self.tuner
+
+
+class TuningError(TimeoutError):
+    """
+    The tuning stopped without tuning all the strings, because of the
+    time limit, the maximum number of iterations or because the
+    remaining strings failed.
+
+    It is a TimeoutError so the code that only expected the time limit
+    still works. The details are in result, see TuningMonitor.result().
+    """
+
+    def __init__(self, message: str, result: dict) -> None:
+        """
+        Initialize the TuningError class.
+
+        Args:
+            - message (str): The description of the error.
+            - result (dict): The result of the tuning.
+
+        Returns:
+            - None
+        """
+        super().__init__(message)
+        self.result = result
+
+
+class TuningMonitor:
+    """
+    Follow the error of each string during the tuning to find
+    the strings that will never be tuned. Each string has a status:
+        - "active": It is being tuned.
+        - "tuned": It is inside its tolerance, see Instrument.tolerances().
+        - "oscillating": Its error changed sign more than maxCrossings times.
+        - "stagnated": Its error didn't improve in patience iterations.
+        - "diverged": Its error grew to divergence times the initial one,
+                    or the one after its first turn if it was bigger.
+
+    When the error of a string changes sign the string went past the
+    objective, so if damping is enabled its next turns are halved. The
+    damping is slowly undone while the string doesn't cross again.
+    """
+
+    failures = ("oscillating", "stagnated", "diverged")
+
+    def __init__(
+        self,
+        inst: "Instrument",
+        *,
+        damping: bool = True,
+        maxCrossings: int = 10,
+        patience: int = 50,
+        divergence: float = 10,
+    ) -> None:
+        """
+        Initialize the TuningMonitor class.
+
+        Args:
+            - inst (Instrument): The instrument that is tuned.
+            - damping (bool): A boolean that indicates if the turns of
+                            the strings that oscillate are damped.
+            - maxCrossings (int): The number of times that the error of a
+                                string can change sign before it fails.
+            - patience (int): The number of iterations without improving
+                            after which a string fails.
+            - divergence (float): The growth of the error over the initial
+                                one after which a string fails.
+
+        Returns:
+            - None
+        """
+        self.inst = inst
+        self.dampingEnabled = damping
+        self.maxCrossings = maxCrossings
+        self.patience = patience
+        self.divergence = divergence
+
+        nStrings = len(inst.frequencies)
+        self.status = np.full(nStrings, "active", dtype=object)
+        self.damping = np.ones(nStrings)
+        self.crossings = np.zeros(nStrings, dtype=int)
+        self.initialErrors = np.full(nStrings, np.nan)
+        self.referenceErrors = np.full(nStrings, np.nan)
+        self.previousErrors = np.full(nStrings, np.nan)
+        self.bestErrors = np.full(nStrings, np.inf)
+        self.sinceBest = np.zeros(nStrings, dtype=int)
+
+    def update(self) -> np.ndarray:
+        """
+        Update the status of the strings with their current frequencies.
+
+        Args:
+            - None
+
+        Returns:
+            - np.ndarray: A boolean for each string, True if it has to be turned.
+        """
+        errors = self.inst.frequencies - self.inst.stringFrequencies
+
+        failed = np.isin(self.status, self.failures)
+        tuned = ~self.inst.outOfTune()
+        self.status[~failed] = np.where(tuned[~failed], "tuned", "active")
+
+        active = self.status == "active"
+        absErrors = np.abs(errors)
+
+        first = active & np.isnan(self.initialErrors)
+        self.initialErrors[first] = absErrors[first]
+
+        # The first turn of a string close to its objective can go past it
+        # by more than the initial error, the damping corrects that later
+        second = active & ~first & np.isnan(self.referenceErrors)
+        self.referenceErrors[second] = np.maximum(
+            self.initialErrors[second], absErrors[second]
+        )
+
+        # The strings that went past the objective
+        crossed = active & (np.sign(errors) * np.sign(self.previousErrors) < 0)
+        self.crossings[crossed] += 1
+        if self.dampingEnabled:
+            self.damping[crossed] /= 2
+            recovering = active & ~crossed & np.isfinite(self.previousErrors)
+            self.damping[recovering] = np.minimum(self.damping[recovering] * 1.25, 1)
+        self.status[active & (self.crossings > self.maxCrossings)] = "oscillating"
+
+        improved = active & (absErrors < self.bestErrors)
+        self.bestErrors[improved] = absErrors[improved]
+        self.sinceBest[improved] = 0
+        self.sinceBest[active & ~improved] += 1
+
+        active = self.status == "active"
+        self.status[active & (self.sinceBest >= self.patience)] = "stagnated"
+
+        active = self.status == "active"
+        diverged = ~np.isfinite(errors) | (
+            absErrors
+            > self.divergence * np.fmax(self.initialErrors, self.referenceErrors)
+        )
+        self.status[active & diverged] = "diverged"
+
+        self.previousErrors = errors
+        return self.status == "active"
+
+    def result(self, turns: list, reason: str) -> dict:
+        """
+        Give the result of the tuning.
+
+        Args:
+            - turns (list): The turns of each iteration.
+            - reason (str): Why the tuning stopped: "tuned", "failed",
+                            "timeLimit" or "maxIterations".
+
+        Returns:
+            - dict: The result of the tuning with:
+                - converged (bool): If all the strings were tuned.
+                - reason (str): Why the tuning stopped.
+                - iterations (int): The number of iterations.
+                - turns (list): The turns of each iteration.
+                - status (list): The status of each string.
+                - failed (dict): The status of the strings that are not
+                                tuned by their index, "active" if the
+                                tuning stopped before they failed.
+                - damping (np.ndarray): The damping of each string.
+        """
+        status = list(self.status)
+
+        return {
+            "converged": all(value == "tuned" for value in status),
+            "reason": reason,
+            "iterations": len(turns),
+            "turns": turns,
+            "status": status,
+            "failed": {i: value for i, value in enumerate(status) if value != "tuned"},
+            "damping": self.damping.copy(),
+        }
+
+
 class Instrument(abc.ABC):
+    # How the tolerance of each string is calculated, see tolerances()
+    toleranceModels = ("cents", "jnd", "hertz")
+    toleranceModel = "cents"
+
+    # Most listeners don't notice an error of a few cents
+    toleranceCents = 5
+
     # https://en.wikipedia.org/wiki/Psychoacoustics
     frequencyDiscrimination = 3.6
 
-    turner = logic.Tuner()
+    # Wier, Jesteadt and Green (1977): log10(jnd) = a * sqrt(f) + b
+    jndCoefficients = (0.026, -0.533)
+
+    turner = LazyTuner()
+
+    # Attributes of the strings that the children define, they are
+    # kept as contiguous float64 arrays with one value per string
+    stringAttributes = ("frequencies", "lengths", "youngModulus", "density")
 
     def __init__(self) -> None:
         """
@@ -25,6 +259,8 @@ class Instrument(abc.ABC):
         It requires the following attributes to be already defined:
             - frequencies (list): The frequencies of the strings in hertz.
             - lengths (list): The lengths of the strings in meters.
+            - youngModulus (list): The young modulus of the strings in pascals.
+            - density (list): The densities of the strings in kilograms per cubic meter.
 
         Args:
             - None
@@ -32,20 +268,26 @@ class Instrument(abc.ABC):
         Returns:
             - None
         """
+        # Each instrument gets its own copy, also of the class attributes
+        for name in self.stringAttributes:
+            setattr(self, name, np.array(getattr(self, name), dtype=np.float64))
+
         self.stringFrequencies = np.zeros(len(self.frequencies))
-        # self.stringFrequencies.fill(100)
-        self.calculateTightness()
+        # Without tension the strings have their original lengths
+        self.stringLengths = self.lengths.copy()
+        self.lastTurns = np.zeros(len(self.frequencies))
         self.checker()
+        self.calculateTightness()
 
     def calculateTightness(self) -> None:
         """
         Calculate the tightness of the strings.
 
         It requires the following attributes to be already defined:
-            - stringFrequencies (list): The frequencies of the strings in hertz.
-            - lengths (list): The initial lengths of the strings in meters.
-            - youngModulus (list): The young modulus of the strings in pascals.
-            - density (list): The densities of the strings in kilograms per cubic meter.
+            - stringFrequencies (np.ndarray): The frequencies of the strings in hertz.
+            - lengths (np.ndarray): The initial lengths of the strings in meters.
+            - youngModulus (np.ndarray): The young modulus of the strings in pascals.
+            - density (np.ndarray): The densities of the strings in kilograms per cubic meter.
 
         Args:
             - None
@@ -53,26 +295,20 @@ class Instrument(abc.ABC):
         Returns:
             - None
         """
-        self.stringLengths = [
-            physics.calculateNewLengthByFrequency(
-                self.lengths[i],
-                self.stringFrequencies[i],
-                self.youngModulus[i],
-                self.density[i],
-            )
-            for i in range(len(self.frequencies))
-        ]
+        self.stringLengths = physics.calculateNewLengthByFrequency(
+            self.lengths, self.stringFrequencies, self.youngModulus, self.density
+        )
 
     def checker(self) -> None:
         """
-        Check if the lists that represent different attributes
-        of the strings have the same length.
+        Check if the arrays that represent different attributes
+        of the strings are one dimensional and have the same length.
 
         It raises a ValueError if the lengths are different.
 
         It requires the following attributes to be already defined:
-            - frequencies (list): The frequencies of the strings in hertz.
-            - lengths (list): The lengths of the strings in meters.
+            - frequencies (np.ndarray): The frequencies of the strings in hertz.
+            - lengths (np.ndarray): The lengths of the strings in meters.
 
         Args:
             - None
@@ -80,74 +316,219 @@ class Instrument(abc.ABC):
         Returns:
             - None
         """
-        if len(self.frequencies) != len(self.lengths):
+        if np.ndim(self.frequencies) != 1:
+            raise ValueError("The frequencies must be a one dimensional array.")
+        elif np.shape(self.frequencies) != np.shape(self.lengths):
             raise ValueError("The number of frequencies and lengths must be the same.")
-        elif len(self.frequencies) != len(self.stringFrequencies):
+        elif np.shape(self.frequencies) != np.shape(self.stringFrequencies):
             raise ValueError(
                 "The number of frequencies and string frequencies must be the same."
             )
-        elif len(self.frequencies) != len(self.stringLengths):
+        elif np.shape(self.frequencies) != np.shape(self.stringLengths):
             raise ValueError(
                 "The number of frequencies and string lengths must be the same."
             )
-        elif len(self.frequencies) != len(self.density):
+        elif np.shape(self.frequencies) != np.shape(self.density):
             raise ValueError("The number of frequencies and density must be the same.")
-        elif len(self.frequencies) != len(self.youngModulus):
+        elif np.shape(self.frequencies) != np.shape(self.youngModulus):
             raise ValueError(
                 "The number of frequencies and young modulus must be the same."
             )
 
-    def play(self) -> None:
+    def play(
+        self,
+        output: sound.PlaybackEngine = None,
+        tracer: tracing.Tracer = tracing.nullTracer,
+    ) -> None:
         """
         Play the instrument.
 
         Args:
-            - None
+            - output (sound.PlaybackEngine): Where the sound is played.
+                                            By default it blocks until it ends.
+            - tracer (tracing.Tracer): The tracer that measures the
+                                    synthesis and the playback.
 
         Returns:
             - None
         """
         self.checker()
-        sound.playStrum(self.stringFrequencies)
+        with tracer.phase("synthesis"):
+            strum = sound.createStrum(self.stringFrequencies)
+        with tracer.phase("playback"):
+            sound.playSound(strum, output=output)
 
-    def playPerfect(self) -> None:
+    def playPerfect(self, output: sound.PlaybackEngine = None) -> None:
         """
         Play the perfect sound of the instrument.
 
         It requires the following attributes to be already defined:
-            - frequencies (list): The frequencies of the strings in hertz.
+            - frequencies (np.ndarray): The frequencies of the strings in hertz.
 
         Args:
-            - None
+            - output (sound.PlaybackEngine): Where the sound is played.
+                                            By default it blocks until it ends.
 
         Returns:
             - None
         """
         self.checker()
-        sound.playStrum(self.frequencies)
+        sound.playStrum(self.frequencies, output=output)
+
+    def tolerances(self) -> np.ndarray:
+        """
+        Calculate the difference in hertz under which each string is tuned.
+
+        It depends on the toleranceModel:
+            - cents: toleranceCents above and below the objective
+                    frequency, so the same relative error for all the strings.
+            - jnd: The just noticeable difference of pitch at the objective
+                    frequency, that grows slower than the frequency.
+            - hertz: The same frequencyDiscrimination for all the strings.
+
+        Args:
+            - None
+
+        Returns:
+            - np.ndarray: The tolerance of each string in hertz.
+        """
+        if self.toleranceModel == "cents":
+            # The flat side is the narrower one in hertz
+            return -self.frequencies * np.expm1(-self.toleranceCents * np.log(2) / 1200)
+        elif self.toleranceModel == "jnd":
+            a, b = self.jndCoefficients
+            return 10 ** (a * np.sqrt(self.frequencies) + b)
+        elif self.toleranceModel == "hertz":
+            return np.full(len(self.frequencies), float(self.frequencyDiscrimination))
+
+        raise ValueError(
+            f"The tolerance model must be one of {self.toleranceModels}, "
+            f"not {self.toleranceModel!r}."
+        )
+
+    def outOfTune(self) -> np.ndarray:
+        """
+        Find the strings that are out of tune, see tolerances().
+
+        Args:
+            - None
+
+        Returns:
+            - np.ndarray: A boolean for each string, True if it has to be turned.
+        """
+        return np.abs(self.frequencies - self.stringFrequencies) > self.tolerances()
+
+    def tuneStep(
+        self,
+        strings: np.ndarray = None,
+        damping: np.ndarray = None,
+        tracer: tracing.Tracer = tracing.nullTracer,
+    ) -> np.ndarray:
+        """
+        Make one iteration of the tuning.
+
+        All the strings that are out of tune are turned at the same time,
+        their turns, new lengths and new frequencies are calculated in one
+        pass over the arrays.
+
+        The turns are given by the turner, the fuzzy logic.Tuner by
+        default or any other strategy with tuneStrings(), like the
+        solver.PhysicsSolver. The turns that are made are kept in lastTurns.
+
+        It requires the following attributes to be already defined:
+            - frequencies (np.ndarray): The frequencies of the strings in hertz.
+            - lengths (np.ndarray): The lengths of the strings in meters.
+            - youngModulus (np.ndarray): The young modulus of the strings in pascals.
+            - density (np.ndarray): The densities of the strings in kilograms per cubic meter.
+
+        Args:
+            - strings (np.ndarray): A boolean for each string, True if it is
+                                    turned. By default the ones out of tune.
+            - damping (np.ndarray): The factor of the turn of each string.
+                                    By default the turns are not damped.
+            - tracer (tracing.Tracer): The tracer that measures the
+                                    inference and the physics.
+
+        Returns:
+            - np.ndarray: The turns of the strings, zero for the ones not turned.
+        """
+        turnIteration = np.zeros(len(self.frequencies))
+
+        outOfTune = np.flatnonzero(self.outOfTune() if strings is None else strings)
+
+        if len(outOfTune) == 0:
+            self.lastTurns = turnIteration
+            return turnIteration
+
+        lengths = self.lengths[outOfTune]
+        stringLengths = self.stringLengths[outOfTune]
+
+        with tracer.phase("inference"):
+            turn = self.turner.tuneStrings(self, outOfTune)
+        if damping is not None:
+            turn = turn * damping[outOfTune]
+        turnIteration[outOfTune] = turn
+
+        with tracer.phase("physics"):
+            self.stringFrequencies[outOfTune] = physics.calculateStringNewFrequency(
+                lengths,
+                stringLengths,
+                turn,
+                self.youngModulus[outOfTune],
+                self.density[outOfTune],
+            )
+            self.stringLengths[outOfTune] = physics.calculateNewLength(
+                lengths, stringLengths, turn
+            )
+        self.lastTurns = turnIteration
+
+        return turnIteration
 
     def tune(
         self,
         *,
         soundEnabled: bool = False,
+        soundOutput: sound.PlaybackEngine = None,
         timeLimit: int = 0,
+        maxIterations: int = 1000,
+        damping: bool = True,
         verbose: bool = False,
         showGraph: bool = False,
+        tracer: tracing.Tracer = None,
     ) -> list:
         """
         Tune the instrument.
 
+        The strings that oscillate around the objective get their turns
+        damped and the ones that oscillate, stagnate or diverge without
+        remedy stop being turned, see TuningMonitor.
+
+        It raises a TuningError with the result of the tuning, see
+        TuningMonitor.result(), if not all the strings are tuned.
+
+        A tracer is told about each iteration and each string that is
+        turned and measures the phases of the tuning, for example a
+        tracing.ProfileTracer prints where the time went at the end.
+
         It requires the following attributes to be already defined:
-            - frequencies (list): The frequencies of the strings in hertz.
-            - lengths (list): The lengths of the strings in meters.
-            - youngModulus (list): The young modulus of the strings in pascals.
-            - density (list): The densities of the strings in kilograms per cubic meter.
+            - frequencies (np.ndarray): The frequencies of the strings in hertz.
+            - lengths (np.ndarray): The lengths of the strings in meters.
+            - youngModulus (np.ndarray): The young modulus of the strings in pascals.
+            - density (np.ndarray): The densities of the strings in kilograms per cubic meter.
 
         Args:
             - soundEnabled (bool): A boolean that indicates if the sound is enabled.
-            - timeLimit (int): The time limit for the tuning process in seconds.
+            - soundOutput (sound.PlaybackEngine): Where the sound is played. With a
+                                            started PlaybackEngine the tuning doesn't
+                                            wait for each strum to end and with an
+                                            OfflineRenderer the strums are saved.
+            - timeLimit (int): The time limit for the tuning process in seconds, 0 for none.
+            - maxIterations (int): The maximum number of iterations, 0 for none.
+            - damping (bool): A boolean that indicates if the turns of the
+                            strings that oscillate are damped.
             - verbose (bool): A boolean that indicates if the tuning process is verbose.
             - showGraph (bool): A boolean that indicates if the tuning process is graphed.
+            - tracer (tracing.Tracer): The tracer of the tuning, by default none.
 
         Returns:
             - list: A list of the turns that were made to tune the instrument.
@@ -157,75 +538,98 @@ class Instrument(abc.ABC):
         turns = []
         frequenciesIter = []
 
-        if timeLimit:
-            startTime = time.time()
+        monitor = TuningMonitor(self, damping=damping)
+        reason = None
+
+        # Without a tracer the hooks of each string are skipped
+        traced = tracer is not None
+        if not traced:
+            tracer = tracing.nullTracer
+        tracer.startTuning(self)
+
+        startTime = time.monotonic()
+
+        while True:
+            with tracer.phase("monitor"):
+                active = monitor.update()
+            if not np.any(active):
+                break
+
+            if timeLimit and time.monotonic() - startTime > timeLimit:
+                reason = "timeLimit"
+                break
+            if maxIterations and len(turns) >= maxIterations:
+                reason = "maxIterations"
+                break
+
+            iteration = len(turns)
+            tracer.startIteration(iteration)
 
-        while np.any(
-            np.abs(self.frequencies - self.stringFrequencies)
-            > self.frequencyDiscrimination
-        ):
             # Show the frequencies of the strings
             if verbose:
-                print(
-                    np.array2string(
-                        self.stringFrequencies, separator=", ", max_line_width=np.inf
+                with tracer.phase("output"):
+                    print(
+                        np.array2string(
+                            self.stringFrequencies,
+                            separator=", ",
+                            max_line_width=np.inf,
+                        )
                     )
-                )
 
             # Play the sound of the current strings
             if soundEnabled:
-                self.play()
+                self.play(soundOutput, tracer)
 
             # We add the actual frequencies for the graph
             if showGraph:
                 frequenciesIter.append(self.stringFrequencies.copy())
 
-            turnIteration = np.zeros(len(self.frequencies))
-
-            for i in range(len(self.frequencies)):
-                difference = self.frequencies[i] - self.stringFrequencies[i]
-                if abs(difference) > self.frequencyDiscrimination:
-
-                    turn = self.turner.tune(
-                        self.frequencies[i],
-                        self.stringFrequencies[i],
-                        self.lengths[i],
-                    )
-
-                    turnIteration[i] = turn
-
-                    newLength = physics.calculateNewLength(
-                        self.lengths[i], self.stringLengths[i], turn
-                    )
-
-                    self.stringFrequencies[i] = physics.calculateStringNewFrequency(
-                        self.lengths[i],
-                        self.stringLengths[i],
-                        turn,
-                        self.youngModulus[i],
-                        self.density[i],
-                    )
-
-                    self.stringLengths[i] = newLength
+            turnIteration = self.tuneStep(active, monitor.damping, tracer)
 
             if verbose:
-                for i in range(len(turnIteration)):
-                    if turnIteration[i] != 0:
-                        print(f"Turn string {i+1}: {turnIteration[i]}")
-                print("---------------------------------------------")
+                with tracer.phase("output"):
+                    for i in range(len(turnIteration)):
+                        if turnIteration[i] != 0:
+                            print(f"Turn string {i+1}: {turnIteration[i]}")
+                    print("---------------------------------------------")
+
+            if traced:
+                for i in np.flatnonzero(turnIteration):
+                    tracer.stringTurned(
+                        iteration,
+                        int(i),
+                        float(turnIteration[i]),
+                        float(self.frequencies[i] - self.stringFrequencies[i]),
+                    )
 
             turns.append(turnIteration)
-            if timeLimit:
-                if time.time() - startTime > timeLimit:
-                    raise TimeoutError("Time limit exceeded")
+            tracer.endIteration(iteration, turnIteration)
+
+        if reason is None and np.any(monitor.status != "tuned"):
+            reason = "failed"
 
         if verbose:
-            print("Tuning finished")
+            if reason is None:
+                print("Tuning finished")
+            else:
+                print(f"Tuning stopped: {reason}")
             print(f"Results: {self.frequencies}")
 
         if showGraph:
             frequenciesIter.append(self.stringFrequencies.copy())
-            self.graphsFromTuning(turns, frequenciesIter)
+            with tracer.phase("plotting"):
+                self.graphsFromTuning(turns, frequenciesIter)
+
+        if traced:
+            tracer.endTuning(self, monitor.result(turns, reason or "tuned"))
+
+        if reason is not None:
+            result = monitor.result(turns, reason)
+            raise TuningError(
+                f"The tuning stopped ({reason}) with the strings "
+                f"{result['failed']} not tuned",
+                result,
+            )
 
         return turns
 
@@ -249,6 +653,8 @@ class Instrument(abc.ABC):
         Returns:
             - None
         """
+        import matplotlib.pyplot as plt
+
         turns = np.array(turns)
         frequencies = np.array(frequencies)
 
@@ -270,21 +676,23 @@ class Instrument(abc.ABC):
 
         # The difference between the objective and the actual frequency
         # for each iteration
-        frequencies = [fr - self.frequencies for fr in frequencies]
+        frequencies = frequencies - self.frequencies
 
         # Then we represent the difference between the objective and the actual frequency
         fig = plt.figure()
         fig.canvas.manager.set_window_title("Difference by string")
 
-        # Draw the frequency discrimination zone
-        plt.axhspan(
-            -self.frequencyDiscrimination, self.frequencyDiscrimination, color="black"
-        )
-
         # Draw the differences
-        plt.plot(
+        lines = plt.plot(
             frequencies, label=[f"String {i+1}" for i in range(len(self.frequencies))]
         )
+
+        # Draw the tolerance zone of each string with its color
+        iterations = np.arange(len(frequencies))
+        for line, tolerance in zip(lines, self.tolerances()):
+            plt.fill_between(
+                iterations, -tolerance, tolerance, color=line.get_color(), alpha=0.15
+            )
         plt.xlabel("Iteration")
         plt.xticks(range(len(frequencies)))
         plt.ylabel("Difference (Hz)")
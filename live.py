@@ -0,0 +1,382 @@
+import abc
+import logic
+import pitch
+import numpy as np
+import wave
+from collections import deque
+
+
+class AudioSource(abc.ABC):
+    """
+    A stream of audio cut in overlapping frames.
+
+    The children only have to give the samples in blocks
+    of any length with blocks(), this class makes the frames.
+    """
+
+    def __init__(self, sr: int, frameLength: int = 640, hop: int = 320) -> None:
+        """
+        Initialize the AudioSource class.
+
+        Args:
+            - sr (int): The sample rate of the audio.
+            - frameLength (int): The number of samples of each frame.
+            - hop (int): The number of samples between the starts of the frames.
+
+        Returns:
+            - None
+        """
+        self.sr = sr
+        self.frameLength = frameLength
+        self.hop = hop
+
+    @abc.abstractmethod
+    def blocks(self):
+        """
+        Give the samples of the audio.
+
+        Args:
+            - None
+
+        Returns:
+            - Iterator[np.ndarray]: The blocks of mono samples.
+        """
+
+    def __iter__(self):
+        """
+        Give the frames of the audio. The samples of a frame
+        are kept in a buffer until they are not needed.
+
+        Args:
+            - None
+
+        Returns:
+            - Iterator[np.ndarray]: The frames.
+        """
+        buffer = np.zeros(0)
+
+        for block in self.blocks():
+            buffer = np.concatenate((buffer, block))
+
+            start = 0
+            while start + self.frameLength <= len(buffer):
+                yield buffer[start : start + self.frameLength]
+                start += self.hop
+
+            buffer = buffer[start:]
+
+
+class SignalSource(AudioSource):
+    """
+    Audio from an array, for example a synthetic
+    sound of sound.createCordFrequency().
+    """
+
+    def __init__(
+        self,
+        signal: np.ndarray,
+        sr: int = 16000,
+        frameLength: int = 640,
+        hop: int = 320,
+    ) -> None:
+        """
+        Initialize the SignalSource class.
+
+        Args:
+            - signal (np.ndarray): The samples of the audio.
+            - sr (int): The sample rate of the audio.
+            - frameLength (int): The number of samples of each frame.
+            - hop (int): The number of samples between the starts of the frames.
+
+        Returns:
+            - None
+        """
+        super().__init__(sr, frameLength, hop)
+        self.signal = np.asarray(signal, dtype=np.float64)
+
+    def blocks(self):
+        """
+        Give the whole signal as a single block.
+
+        Args:
+            - None
+
+        Returns:
+            - Iterator[np.ndarray]: The blocks of mono samples.
+        """
+        yield self.signal
+
+
+class WavSource(AudioSource):
+    """
+    Audio read from a 16 bit PCM WAV file, like the ones of
+    sound.OfflineRenderer. The file is read in blocks and
+    the channels are averaged.
+    """
+
+    blockLength = 16000
+
+    def __init__(self, path: str, frameLength: int = 640, hop: int = 320) -> None:
+        """
+        Initialize the WavSource class.
+
+        Args:
+            - path (str): The path of the file.
+            - frameLength (int): The number of samples of each frame.
+            - hop (int): The number of samples between the starts of the frames.
+
+        Returns:
+            - None
+        """
+        with wave.open(path, "rb") as file:
+            if file.getsampwidth() != 2:
+                raise ValueError("Only 16 bit WAV files are supported")
+            sr = file.getframerate()
+
+        super().__init__(sr, frameLength, hop)
+        self.path = path
+
+    def blocks(self):
+        """
+        Give the samples of the file in blocks.
+
+        Args:
+            - None
+
+        Returns:
+            - Iterator[np.ndarray]: The blocks of mono samples.
+        """
+        with wave.open(self.path, "rb") as file:
+            channels = file.getnchannels()
+
+            while True:
+                data = file.readframes(self.blockLength)
+                if not data:
+                    break
+
+                samples = np.frombuffer(data, dtype="<i2").reshape(-1, channels)
+                yield samples.mean(axis=1) / 32768
+
+
+class DeviceSource(AudioSource):
+    """
+    Audio recorded from an input device with sounddevice.
+    It never ends, the session has to be stopped.
+    """
+
+    def __init__(
+        self,
+        sr: int = 16000,
+        frameLength: int = 640,
+        hop: int = 320,
+        device=None,
+    ) -> None:
+        """
+        Initialize the DeviceSource class.
+
+        Args:
+            - sr (int): The sample rate of the audio.
+            - frameLength (int): The number of samples of each frame.
+            - hop (int): The number of samples between the starts of the frames.
+            - device (int | str): The input device of sounddevice.
+
+        Returns:
+            - None
+        """
+        super().__init__(sr, frameLength, hop)
+        self.device = device
+
+    def blocks(self):
+        """
+        Give the samples recorded by the device, a hop at a time.
+
+        Args:
+            - None
+
+        Returns:
+            - Iterator[np.ndarray]: The blocks of mono samples.
+        """
+        # Imported here so the module can be used without an audio device
+        import sounddevice as sd
+
+        with sd.InputStream(
+            samplerate=self.sr, channels=1, dtype="float32", device=self.device
+        ) as stream:
+            while True:
+                data, _ = stream.read(self.hop)
+                yield data[:, 0]
+
+
+class TuningSession:
+    """
+    Tune a string from its sound.
+
+    The pitch of every frame is detected and, when several frames in a row
+    agree, the turn is calculated with the Tuner. The same instruction is
+    not repeated while the pitch stays the same; it is given again when the
+    pitch changes or when the string is plucked again after a silence.
+    """
+
+    def __init__(
+        self,
+        objectiveFrequency: float,
+        stringLength: float,
+        *,
+        tuner: logic.Tuner = None,
+        detector: pitch.PitchDetector = None,
+        minConfidence: float = 0.8,
+        stableFrames: int = 3,
+        stableCents: float = 10,
+        frequencyDiscrimination: float = 3.6,
+    ) -> None:
+        """
+        Initialize the TuningSession class.
+
+        Args:
+            - objectiveFrequency (float): The objective frequency of the string in hertz.
+            - stringLength (float): The length of the string in meters.
+            - tuner (logic.Tuner): The tuner that calculates the turns.
+            - detector (pitch.PitchDetector): The detector of the pitch.
+            - minConfidence (float): The confidence under which a frame is ignored.
+            - stableFrames (int): The number of frames in a row that have to agree.
+            - stableCents (float): The maximum difference in cents between
+                                the frames that agree.
+            - frequencyDiscrimination (float): The difference in hertz under
+                                            which the string is tuned.
+
+        Returns:
+            - None
+        """
+        self.objectiveFrequency = objectiveFrequency
+        self.stringLength = stringLength
+        self.tuner = logic.Tuner() if tuner is None else tuner
+        self.detector = detector
+        self.minConfidence = minConfidence
+        self.stableFrames = stableFrames
+        self.stableCents = stableCents
+        self.frequencyDiscrimination = frequencyDiscrimination
+
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget the previous frames.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.recent = deque(maxlen=self.stableFrames)
+        self.silentFrames = 0
+        self.lastFrequency = None
+        self.frames = 0
+
+    def process(self, frame: np.ndarray, sr: int = 16000) -> dict:
+        """
+        Process the next frame of the audio.
+
+        Args:
+            - frame (np.ndarray): The audio frame.
+            - sr (int): The sample rate of the frame.
+
+        Returns:
+            - dict: The instruction or None if there is nothing new. It has:
+                - frame (int): The number of the frame in the session.
+                - frequency (float): The frequency of the string in hertz.
+                - turn (float): The turn in revolutions, positive to tighten.
+                - tuned (bool): If the string is already tuned.
+        """
+        if self.detector is None or self.detector.sr != sr:
+            self.detector = pitch.PitchDetector(sr)
+
+        frequency, confidence = self.detector.detect(frame)
+        self.frames += 1
+
+        if confidence < self.minConfidence:
+            self.recent.clear()
+            self.silentFrames += 1
+            # A new pluck after a silence repeats the instruction
+            if self.silentFrames >= self.stableFrames:
+                self.lastFrequency = None
+            return None
+
+        self.silentFrames = 0
+        self.recent.append(frequency)
+
+        if len(self.recent) < self.stableFrames:
+            return None
+
+        if 1200 * np.log2(max(self.recent) / min(self.recent)) > self.stableCents:
+            return None
+
+        frequency = float(np.median(self.recent))
+
+        if (
+            self.lastFrequency is not None
+            and abs(1200 * np.log2(frequency / self.lastFrequency)) <= self.stableCents
+        ):
+            return None
+
+        self.lastFrequency = frequency
+
+        tuned = abs(self.objectiveFrequency - frequency) <= self.frequencyDiscrimination
+
+        return {
+            "frame": self.frames - 1,
+            "frequency": frequency,
+            "turn": (
+                0.0
+                if tuned
+                else self.tuner.tune(
+                    self.objectiveFrequency, frequency, self.stringLength
+                )
+            ),
+            "tuned": tuned,
+        }
+
+    def run(self, source: AudioSource):
+        """
+        Process all the frames of a source.
+
+        Args:
+            - source (AudioSource): The source of the audio.
+
+        Returns:
+            - Iterator[dict]: The instructions, see process().
+        """
+        for frame in source:
+            instruction = self.process(frame, source.sr)
+            if instruction is not None:
+                yield instruction
+
+
+if __name__ == "__main__":
+    import interaction
+
+    print("¡Bienvenido al afinador de cuerdas en directo!")
+
+    l = interaction.ensureNumber("¿Qué longitud tiene la cuerda (en cm)? ") / 100
+    f = interaction.ensureNumber("¿Qué frecuencia quiere para la cuerda (en Hz)? ")
+
+    session = TuningSession(f, l)
+
+    print("Toque la cuerda. Pulse Ctrl+C para terminar.")
+
+    try:
+        for instruction in session.run(DeviceSource()):
+            t = instruction["turn"]
+            print(f"La cuerda está a {instruction['frequency']:.2f} Hz. ", end="")
+
+            if instruction["tuned"]:
+                print("¡Está afinada!")
+            elif t >= 0:
+                print(f"Aprite la cuerda {t} vueltas.")
+            else:
+                print(f"Afloje la cuerda {-t} vueltas.")
+
+    except KeyboardInterrupt:
+        pass
+
+    print("¡Gracias por usar el afinador de cuerdas!")
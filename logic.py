@@ -1,28 +1,59 @@
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
+import hashlib
 import os
-from concurrent.futures import ProcessPoolExecutor
-from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import shutil
+import inference
+
+# matplotlib, pandas, pyarrow and tqdm are slow to import, so they
+# are imported in the methods that use them and not with the module
 
 
 class Tuner:
+    backends = ("skfuzzy", "numpy", "table")
+
+    dataframePath = "turns.parquet"
+    surfacePath = "turns.surface"
 
-    def __init__(self) -> None:
+    def __init__(self, backend: str = "skfuzzy", buildSurface: bool = True) -> None:
         """
         Initialize the Tuner class.
 
         It creates the fuzzy controller to tune a string.
 
+        The backend chooses how the turns are calculated:
+            - "skfuzzy": With the ControlSystemSimulation of skfuzzy.
+            - "numpy": With the precompiled inference.FuzzyEngine.
+                    It gives the same turns as skfuzzy within
+                    inference.FuzzyEngine.TOLERANCE but much faster.
+            - "table": Interpolating in the control surface memory mapped
+                    from turns.surface, that is created from turns.parquet
+                    if it doesn't exist. The points outside the surface use
+                    the FuzzyEngine. The maximum interpolation error is in
+                    surfaceError.
+
         Args:
-            - None
+            - backend (str): The backend used to calculate the turns.
+            - buildSurface (bool): A boolean that indicates if turns.surface
+                                is created when it is not up to date, only
+                                used by the "table" backend. The processes
+                                of a pool open the one of the parent.
 
         Returns:
             - None
         """
+        if backend not in self.backends:
+            raise ValueError(f"The backend must be one of {self.backends}.")
+
+        self.backend = backend
         self.tuner = self.createController()
+        self.engine = inference.FuzzyEngine(self.tuner.ctrl)
+
+        if backend == "table":
+            self.surface = self.loadControlSurface(build=buildSurface)
+            self.surfaceError = self.surface.error
 
     def antecedentFrequency(self) -> ctrl.Antecedent:
         """
@@ -303,6 +334,32 @@ class Tuner:
         """
         Calculate the turn to tune a string.
 
+        Args:
+            - difference (float): The difference between the objective frequency
+                                and the current frequency of the string.
+            - stringLength (float): The current length of the string.
+
+        Returns:
+            - float: The turn to tune the string.
+        """
+        if self.backend == "numpy":
+            return self.engine.compute(
+                {"frequency": abs(difference), "stringLength": stringLength}
+            )
+
+        elif self.backend == "table":
+            if self.surface.contains(abs(difference), stringLength):
+                return self.surface.interpolateOne(abs(difference), stringLength)
+            return self.engine.compute(
+                {"frequency": abs(difference), "stringLength": stringLength}
+            )
+
+        return self.calculateTurnSkfuzzy(difference, stringLength)
+
+    def calculateTurnSkfuzzy(self, difference: float, stringLength: float) -> float:
+        """
+        Calculate the turn to tune a string with the simulation of skfuzzy.
+
         Args:
             - difference (float): The difference between the objective frequency
                                 and the current frequency of the string.
@@ -318,6 +375,70 @@ class Tuner:
 
         return self.tuner.output["turn"]
 
+    def calculateTurns(
+        self, differences: np.ndarray, stringLengths: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the turns to tune several strings at the same time.
+
+        With the "numpy" backend all the turns are calculated in one
+        vectorized pass, with the "skfuzzy" backend they are calculated
+        one by one.
+
+        Args:
+            - differences (np.ndarray): The differences between the objective frequencies
+                                        and the current frequencies of the strings.
+            - stringLengths (np.ndarray): The current lengths of the strings.
+
+        Returns:
+            - np.ndarray: The turns to tune the strings with the broadcasted shape
+                        of the arguments.
+        """
+        differences, stringLengths = np.broadcast_arrays(
+            np.asarray(differences, dtype=np.float64),
+            np.asarray(stringLengths, dtype=np.float64),
+        )
+
+        if self.backend == "numpy":
+            return self.calculateTurnsExact(differences, stringLengths)
+
+        elif self.backend == "table":
+            differences = np.abs(differences)
+            turns = np.array(self.surface.interpolate(differences, stringLengths))
+
+            outside = ~self.surface.contains(differences, stringLengths)
+            if np.any(outside):
+                turns[outside] = self.calculateTurnsExact(
+                    differences[outside], stringLengths[outside]
+                )
+
+            return turns
+
+        turns = np.empty(differences.shape)
+        for i in np.ndindex(differences.shape):
+            turns[i] = self.calculateTurnSkfuzzy(differences[i], stringLengths[i])
+
+        return turns
+
+    def calculateTurnsExact(
+        self, differences: np.ndarray, stringLengths: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the turns to tune several strings with the FuzzyEngine,
+        without interpolating in the control surface.
+
+        Args:
+            - differences (np.ndarray): The differences between the objective frequencies
+                                        and the current frequencies of the strings.
+            - stringLengths (np.ndarray): The current lengths of the strings.
+
+        Returns:
+            - np.ndarray: The turns to tune the strings.
+        """
+        return self.engine.computeMany(
+            {"frequency": np.abs(differences), "stringLength": stringLengths}
+        )
+
     def tune(
         self,
         objFrecuency: float,
@@ -350,6 +471,58 @@ class Tuner:
             print(turn)
         return turn
 
+    def tuneMany(
+        self,
+        objFrequencies: np.ndarray,
+        frequencies: np.ndarray,
+        stringLengths: np.ndarray,
+        verbose: bool = False,
+    ) -> np.ndarray:
+        """
+        Calculate the turns to tune several strings at the same time with
+        the same signs as tune(). The arguments are broadcasted against
+        each other.
+
+        Args:
+            - objFrequencies (np.ndarray): The objective frequencies of the strings.
+            - frequencies (np.ndarray): The current frequencies of the strings.
+            - stringLengths (np.ndarray): The current lengths of the strings.
+            - verbose (bool): A boolean that indicates if the tuning process is verbose.
+
+        Returns:
+            - np.ndarray: The turns to tune the strings.
+        """
+        differences = np.subtract(objFrequencies, frequencies, dtype=np.float64)
+
+        turns = self.calculateTurns(differences, stringLengths)
+
+        np.negative(turns, out=turns, where=differences < 0)
+
+        if verbose:
+            print(turns)
+        return turns
+
+    def tuneStrings(
+        self, inst: "instrument.Instrument", strings: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the turns to tune some strings of an instrument,
+        see tuneMany(). Only the objective and current frequencies
+        and the original lengths of the strings are used.
+
+        Args:
+            - inst (instrument.Instrument): The instrument.
+            - strings (np.ndarray): The indices of the strings.
+
+        Returns:
+            - np.ndarray: The turns to tune the strings.
+        """
+        return self.tuneMany(
+            inst.frequencies[strings],
+            inst.stringFrequencies[strings],
+            inst.lengths[strings],
+        )
+
     def showAntecedentFrequency(self) -> None:
         """
         Show the antecedent for the frequency difference.
@@ -360,6 +533,8 @@ class Tuner:
         Returns:
             - None
         """
+        import matplotlib.pyplot as plt
+
         self.antecedentFrequency().view()
         plt.title("Frequency Difference")
 
@@ -373,6 +548,8 @@ class Tuner:
         Returns:
             - None
         """
+        import matplotlib.pyplot as plt
+
         self.antecedentLength().view()
         plt.title("String Length")
 
@@ -386,6 +563,8 @@ class Tuner:
         Returns:
             - None
         """
+        import matplotlib.pyplot as plt
+
         self.consequentTurn().view()
         plt.title("Turn")
 
@@ -413,44 +592,13 @@ class Tuner:
         Returns:
             - None
         """
-
-        if not os.path.exists("turns.parquet"):
-            self.createDataframe()
-
-        data = pd.read_parquet("turns.parquet")
-
-        # We check that the Dataframe is up to date
-        repeat = False
-
-        if np.array_equal(self.antecedentFrequency().universe, data.index.values):
-            diff = np.where(self.antecedentFrequency().universe != data.index.values)
-            if diff[0].size > 0:
-                repeat = True
-                print(
-                    "Not the same frequencyDifference range. Need to update the Dataframe."
-                )
-
-        if np.allclose(self.antecedentLength().universe, data.columns.values):
-            diff = np.where(self.antecedentLength().universe != data.columns.values)
-            if diff[0].size > 0:
-                repeat = True
-                print("Not the same stringLength range. Need to update the Dataframe.")
-
-        # We check 100 values to see if they are correct
-        for _ in range(100):
-            frequency = np.random.choice(data.index.values)
-            length = np.random.choice(data.columns.values)
-            turn = self.calculateTurn(frequency, length)
-            if turn != data.loc[frequency, length]:
-                repeat = True
-                print("Not the same calculations. Need to update the Dataframe.")
-                break
+        import pandas as pd
 
         # We create the Dataframe again if it is not up to date
-        if repeat:
-            del data
+        if not self.isDataframeUpToDate():
             self.createDataframe()
-            data = pd.read_parquet("turns.parquet")
+
+        data = pd.read_parquet(self.dataframePath)
 
         frequencyDifference = self.antecedentFrequency()
         fUni = frequencyDifference.universe
@@ -466,7 +614,7 @@ class Tuner:
 
     def createGraphs(
         self,
-        dataFrame: pd.DataFrame,
+        dataFrame: "pd.DataFrame",
         *,
         title: str = "Heatmap of Turns for Frequency and Length",
     ) -> None:
@@ -479,6 +627,8 @@ class Tuner:
         Returns:
             - None
         """
+        import matplotlib.pyplot as plt
+
         # Extract frequency, length, and turns from the DataFrame
         frequencies = dataFrame.index.values
         lengths = dataFrame.columns.values
@@ -522,64 +672,258 @@ class Tuner:
         plt.ylabel("String Length")
         plt.title(title)
 
-    def createDataframe(self) -> None:
+    def createDataframe(
+        self,
+        *,
+        frequencies: np.ndarray = None,
+        lengths: np.ndarray = None,
+        nWorkers: int = None,
+        chunkSize: int = 100,
+        resume: bool = True,
+    ) -> None:
         """
         Create a DataFrame with the turns for all the possible
         combinations of frequencies and lengths.
 
+        The frequencies are split in contiguous chunks that are calculated
+        with the vectorized calculateTurns() by a single pool of processes,
+        each one with its own Tuner. The table backend uses the "numpy"
+        backend in the workers.
+
+        Each finished chunk is saved in the directory turns.parquet.partial
+        so if the process stops it continues from there.
+
         Args:
+            - frequencies (np.ndarray): The frequency differences of the DataFrame.
+                                        By default the universe of the antecedent.
+            - lengths (np.ndarray): The string lengths of the DataFrame.
+                                    By default the universe of the antecedent.
+            - nWorkers (int): The number of processes. By default the number of CPUs.
+            - chunkSize (int): The number of frequencies calculated in each task.
+            - resume (bool): A boolean that indicates if the saved chunks are used.
+
+        Returns:
             - None
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from tqdm import tqdm
+
+        if frequencies is None:
+            frequencies = self.antecedentFrequency().universe
+        if lengths is None:
+            lengths = self.antecedentLength().universe
+
+        backend = "numpy" if self.backend == "table" else self.backend
+
+        chunks = [
+            (start, min(start + chunkSize, len(frequencies)))
+            for start in range(0, len(frequencies), chunkSize)
+        ]
+
+        partialPath = self.dataframePath + ".partial"
+        gridPath = os.path.join(partialPath, "grid.npz")
+
+        fingerprint = self.fingerprint(frequencies, lengths)
+
+        # The saved chunks are only valid for the same controller, grid and backend
+        if resume and os.path.exists(gridPath):
+            grid = np.load(gridPath)
+            if not (
+                str(grid["fingerprint"]) == fingerprint
+                and str(grid["backend"]) == backend
+            ):
+                resume = False
+
+        if not resume or not os.path.exists(gridPath):
+            shutil.rmtree(partialPath, ignore_errors=True)
+            os.makedirs(partialPath)
+            np.savez(gridPath, fingerprint=fingerprint, backend=backend)
+
+        def chunkPath(start: int, end: int) -> str:
+            return os.path.join(partialPath, f"{start}-{end}.npy")
+
+        pending = [
+            (start, end)
+            for start, end in chunks
+            if not os.path.exists(chunkPath(start, end))
+        ]
+
+        with tqdm(
+            total=len(chunks),
+            initial=len(chunks) - len(pending),
+            desc="Processing Chunks",
+        ) as progress:
+            if pending:
+                with ProcessPoolExecutor(
+                    max_workers=nWorkers, initializer=initWorker, initargs=(backend,)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            calculateChunk, frequencies[start:end], lengths
+                        ): (start, end)
+                        for start, end in pending
+                    }
+
+                    for future in as_completed(futures):
+                        path = chunkPath(*futures[future])
+                        # Written with another name so a crash never leaves half a chunk
+                        with open(path + ".tmp", "wb") as file:
+                            np.save(file, future.result())
+                        os.replace(path + ".tmp", path)
+                        progress.update()
+
+        turns = np.concatenate(
+            [np.load(chunkPath(start, end)) for start, end in chunks]
+        )
+
+        # Save the DataFrame to a Parquet file with the fingerprint of the controller
+        table = pa.Table.from_pandas(
+            pd.DataFrame(turns, index=frequencies, columns=lengths)
+        )
+        table = table.replace_schema_metadata(
+            {
+                **table.schema.metadata,
+                b"fingerprint": self.fingerprint(frequencies, lengths).encode(),
+            }
+        )
+        pq.write_table(table, self.dataframePath)
+
+        shutil.rmtree(partialPath)
+
+    def fingerprint(
+        self, frequencies: np.ndarray = None, lengths: np.ndarray = None
+    ) -> str:
+        """
+        Calculate a hash of everything that defines the turns of the controller:
+        the universes and membership functions of the antecedents and the
+        consequent, the rules, the accumulation and defuzzify methods and
+        the grid of the DataFrame.
+
+        Args:
+            - frequencies (np.ndarray): The frequency differences of the DataFrame.
+                                        By default the universe of the antecedent.
+            - lengths (np.ndarray): The string lengths of the DataFrame.
+                                    By default the universe of the antecedent.
 
         Returns:
+            - str: The hexadecimal SHA-256 of the controller.
+        """
+        if frequencies is None:
+            frequencies = self.frequencyDifferenceAntecedent.universe
+        if lengths is None:
+            lengths = self.stringLengthAntecedent.universe
+
+        def toBytes(array: np.ndarray) -> bytes:
+            return np.ascontiguousarray(array, dtype=np.float64).tobytes()
+
+        digest = hashlib.sha256()
+
+        for variable in (
+            self.frequencyDifferenceAntecedent,
+            self.stringLengthAntecedent,
+            self.turnConsequent,
+        ):
+            digest.update(variable.label.encode())
+            digest.update(toBytes(variable.universe))
+            for label, term in variable.terms.items():
+                digest.update(label.encode())
+                digest.update(toBytes(term.mf))
+
+        # The order of the rules doesn't change the turns
+        for rule in sorted(str(rule) for rule in self.tuner.ctrl.rules):
+            digest.update(rule.encode())
+
+        digest.update(self.turnConsequent.accumulation_method.__name__.encode())
+        digest.update(self.turnConsequent.defuzzify_method.encode())
+
+        digest.update(toBytes(frequencies))
+        digest.update(toBytes(lengths))
+
+        return digest.hexdigest()
+
+    def isDataframeUpToDate(self) -> bool:
+        """
+        Check if turns.parquet exists and was created with this controller.
+
+        It only reads the metadata of the file, so no turns are calculated.
+
+        Args:
             - None
+
+        Returns:
+            - bool: A boolean that indicates if the DataFrame can be used.
         """
+        import pyarrow.parquet as pq
 
-        frequencyDifference = self.antecedentFrequency()
-        stringLength = self.antecedentLength()
-
-        # Define the full range of frequencies and lengths
-        frequenciesAll = frequencyDifference.universe
-        lengths = stringLength.universe
-
-        batchSize = 50
-        # Number of batches rounded up
-        nBatches = (len(frequenciesAll) + batchSize - 1) // batchSize
-        all_turns = []
-
-        for batch_index in tqdm(range(nBatches), desc="Processing Batches"):
-            # Extract the current batch of 50 frequencies
-            start = batch_index * batchSize
-            end = min(
-                start + batchSize, len(frequenciesAll)
-            )  # Ensure we don't go out of bounds
-            frequencies = frequenciesAll[start:end]
-
-            # Create a meshgrid of frequencies and lengths
-            frequency_grid, length_grid = np.meshgrid(
-                frequencies, lengths, indexing="ij"
-            )
+        if not os.path.exists(self.dataframePath):
+            return False
+
+        metadata = pq.read_schema(self.dataframePath).metadata or {}
+
+        if metadata.get(b"fingerprint", b"").decode() != self.fingerprint():
+            print("Not the same controller. Need to update the Dataframe.")
+            return False
+
+        return True
+
+    def loadControlSurface(self, build: bool = True) -> inference.ControlSurface:
+        """
+        Open the control surface of turns.surface as a read-only memory map,
+        so all the processes that use it share the same memory.
+
+        If the file doesn't exist, it has another version or it was created
+        with another controller, it is created again from turns.parquet, which is also created again
+        if it is not up to date. The maximum interpolation error is
+        calculated at that moment and saved in the file.
+
+        Creating it is not safe in several processes at the same time,
+        so a pool must create it before starting its processes and
+        they open it with build=False.
+
+        Args:
+            - build (bool): A boolean that indicates if the file is created
+                        when it is not up to date. If it is False a
+                        FileNotFoundError is raised instead.
+
+        Returns:
+            - inference.ControlSurface: The control surface.
+        """
+        import pandas as pd
 
-            # Create an array filled with zeros of the same shape as frequency_grid and length_grid
-            turns = [0] * len(frequencies) * len(lengths)
+        fingerprint = self.fingerprint()
 
-            with ProcessPoolExecutor() as executor:
-                for i, (f, l) in enumerate(
-                    zip(frequency_grid.flatten(), length_grid.flatten())
-                ):
-                    turns[i] = executor.submit(self.calculateTurn, f, l)
+        if os.path.exists(self.surfacePath):
+            try:
+                header = inference.ControlSurface.readHeader(self.surfacePath)
+            except ValueError:
+                # An older version of the file
+                header = {"fingerprint": None}
 
-            turns = [turn.result() for turn in turns]
+            if header["fingerprint"] == fingerprint:
+                return inference.ControlSurface.open(self.surfacePath)
 
-            turns = np.array(turns).reshape(frequency_grid.shape)
+        if not build:
+            raise FileNotFoundError(
+                f"{self.surfacePath} is not up to date and it can't be created."
+            )
 
-            batch_df = pd.DataFrame(turns, index=frequencies, columns=lengths)
-            all_turns.append(batch_df)
+        if not self.isDataframeUpToDate():
+            self.createDataframe()
 
-        # Concatenate all batches to form the full DataFrame
-        full_df = pd.concat(all_turns, axis=0)
+        data = pd.read_parquet(self.dataframePath)
+
+        surface = inference.ControlSurface(
+            data.index.values,
+            data.columns.values.astype(float),
+            data.values,
+            fingerprint=fingerprint,
+        )
+        surface.error = surface.maxError(self.calculateTurnsExact)
+        surface.save(self.surfacePath)
 
-        # Save the DataFrame to a Parquet file
-        full_df.to_parquet("turns.parquet")
+        return inference.ControlSurface.open(self.surfacePath)
 
     def graphExample(self, difference: float, stringLength: float) -> None:
         """
@@ -593,7 +937,9 @@ class Tuner:
         Returns:
             - None
         """
-        self.calculateTurn(difference, stringLength)
+        import matplotlib.pyplot as plt
+
+        self.calculateTurnSkfuzzy(difference, stringLength)
 
         self.turnConsequent.view(sim=self.tuner)
         plt.title("Turn")
@@ -603,7 +949,44 @@ class Tuner:
         plt.title("String Length")
 
 
+# The Tuner of each process of createDataframe()
+workerTuner = None
+
+
+def initWorker(backend: str) -> None:
+    """
+    Create the Tuner of a process of createDataframe().
+
+    Args:
+        - backend (str): The backend of the Tuner.
+
+    Returns:
+        - None
+    """
+    global workerTuner
+    workerTuner = Tuner(backend=backend)
+
+
+def calculateChunk(frequencies: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Calculate the turns of a chunk of createDataframe()
+    with the Tuner of the process.
+
+    Args:
+        - frequencies (np.ndarray): The frequency differences of the chunk.
+        - lengths (np.ndarray): The string lengths.
+
+    Returns:
+        - np.ndarray: The turns with shape (frequencies, lengths).
+    """
+    frequencyGrid, lengthGrid = np.meshgrid(frequencies, lengths, indexing="ij")
+
+    return workerTuner.calculateTurns(frequencyGrid, lengthGrid)
+
+
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     turner = Tuner()
 
     # turner.showAntecedentsAndConsequents()
@@ -1,8 +1,46 @@
 import numpy as np
 
+# The kernels only use +, -, *, / and sqrt, that are correctly rounded,
+# so a string gives the same bits alone or inside an array of strings.
+
+# Length wound per revolution of a peg of 3 mm in radius
+pegCircumference = 2 * np.pi * 0.003
+
+
+def prepareOutput(out: np.ndarray, *args) -> np.ndarray:
+    """
+    Give the array where the result of a kernel is written.
+
+    Args:
+        - out (np.ndarray): The array given by the user or None.
+        - *args: The arguments of the kernel.
+
+    Returns:
+        - np.ndarray: The output with the broadcast shape of the arguments.
+    """
+    if out is None:
+        out = np.empty(np.broadcast_shapes(*(np.shape(arg) for arg in args)))
+    return out
+
+
+def finishOutput(out: np.ndarray):
+    """
+    Give the result of a kernel, a scalar if the arguments were scalars.
+
+    Args:
+        - out (np.ndarray): The array with the result.
+
+    Returns:
+        - np.ndarray | np.float64: The result.
+    """
+    return out[()] if out.ndim == 0 else out
+
 
 def calculateNewLength(
-    origLength: float, actualLength: float, turnAngle: float
+    origLength: float,
+    actualLength: float,
+    turnAngle: float,
+    out: np.ndarray = None,
 ) -> float:
     """
     This function calculates the new length of a string given its original length,
@@ -20,18 +58,26 @@ def calculateNewLength(
         - origLength (float): The original length of the string in meters.
         - actualLength (float): The actual length of the string in meters.
         - turnAngle (float): The turn angle of the string in revolutions.
+        - out (np.ndarray): The array where the result is written.
 
     Returns:
         - float: The new length of the string in meters.
     """
+    out = prepareOutput(out, origLength, actualLength, turnAngle)
 
-    newLength = actualLength + (2 * np.pi * 0.003 * turnAngle)
+    np.multiply(pegCircumference, turnAngle, out=out)
+    np.add(actualLength, out, out=out)
+    np.maximum(origLength, out, out=out)
 
-    return max(origLength, newLength)
+    return finishOutput(out)
 
 
 def calculateStringTension(
-    elasticModulus: float, crossSection: float, originalLength: float, newLength: float
+    elasticModulus: float,
+    crossSection: float,
+    originalLength: float,
+    newLength: float,
+    out: np.ndarray = None,
 ) -> float:
     """
     This formula appears in the "Tensional stress of a uniform bar"
@@ -46,15 +92,23 @@ def calculateStringTension(
         - crossSection (float): The cross section of the string in square meters.
         - originalLength (float): The original length of the string in meters.
         - newLength (float): The new length of the string in meters.
+        - out (np.ndarray): The array where the result is written.
 
     Returns:
         - float: The tension of the string in newtons.
     """
-    return elasticModulus * crossSection * (newLength - originalLength) / originalLength
+    out = prepareOutput(out, elasticModulus, crossSection, originalLength, newLength)
+
+    np.subtract(newLength, originalLength, out=out)
+    np.multiply(crossSection, out, out=out)
+    np.multiply(elasticModulus, out, out=out)
+    np.divide(out, originalLength, out=out)
+
+    return finishOutput(out)
 
 
 def calculateStringFrequencyMersenne(
-    length: float, tension: float, massPerLegth: float
+    length: float, tension: float, massPerLegth: float, out: np.ndarray = None
 ) -> float:
     """
     This formula is extracted from the following link:
@@ -67,11 +121,19 @@ def calculateStringFrequencyMersenne(
         - tension (float): The tension or force of the string in newtons.
         - massPerLegth (float): The mass per length of the string in
             kilograms per meter. https://en.wikipedia.org/wiki/Linear_density
+        - out (np.ndarray): The array where the result is written.
 
     Returns:
         - float: The frequency of the string in hertz.
     """
-    return np.sqrt(tension / massPerLegth) / (2 * length)
+    out = prepareOutput(out, length, tension, massPerLegth)
+
+    np.divide(tension, massPerLegth, out=out)
+    np.sqrt(out, out=out)
+    np.divide(out, 2, out=out)
+    np.divide(out, length, out=out)
+
+    return finishOutput(out)
 
 
 def calculateStringNewFrequency(
@@ -80,6 +142,7 @@ def calculateStringNewFrequency(
     turnAngle: float,
     youngModulus: float,
     density: float,
+    out: np.ndarray = None,
 ) -> float:
     """
     We calculate the new frequency of the string.
@@ -93,21 +156,39 @@ def calculateStringNewFrequency(
         - turnAngle (float): The turn angle of the string in degrees.
         - youngModulus (float): The Young's modulus of the string in pascals.
         - density (float): The density of the string in kilograms per cubic meter.
+        - out (np.ndarray): The array where the result is written.
 
     Returns:
         - float: The new frequency of the string in hertz.
     """
+    out = prepareOutput(out, origLength, actualLength, turnAngle, youngModulus, density)
+    scratch = np.empty_like(out)
+
+    newLength = calculateNewLength(origLength, actualLength, turnAngle, out=out)
+
+    # youngModulus * lengthDifference * newLength
+    np.subtract(newLength, origLength, out=scratch)
+    np.multiply(youngModulus, scratch, out=scratch)
+    np.multiply(scratch, newLength, out=out)
+
+    # density * origLength ** 2
+    np.multiply(origLength, origLength, out=scratch)
+    np.multiply(density, scratch, out=scratch)
 
-    newLength = calculateNewLength(origLength, actualLength, turnAngle)
-    lengthDifference = newLength - origLength
-    return (
-        ((youngModulus * lengthDifference * newLength) / (density * origLength**2))
-        ** (1 / 2)
-    ) / (2 * origLength)
+    np.divide(out, scratch, out=out)
+    np.sqrt(out, out=out)
+    np.divide(out, 2, out=out)
+    np.divide(out, origLength, out=out)
+
+    return finishOutput(out)
 
 
 def calculateNewLengthByFrequency(
-    initialLength: float, frequency: float, youngModulus: float, density: float
+    initialLength: float,
+    frequency: float,
+    youngModulus: float,
+    density: float,
+    out: np.ndarray = None,
 ) -> float:
     """
     We calculate the length of the stretched string so it gives a certain frequency.
@@ -120,15 +201,62 @@ def calculateNewLengthByFrequency(
         - frequency (float): The frequency of the string in hertz.
         - youngModulus (float): The Young's modulus of the string in pascals.
         - density (float): The density of the string in kilograms per cubic meter.
+        - out (np.ndarray): The array where the result is written.
 
     Returns:
         - float: The new length of the string in meters.
     """
-    return (
-        initialLength
-        + (
-            initialLength**2
-            + (16 * density * frequency**2 * initialLength**4) / youngModulus
-        )
-        ** (1 / 2)
-    ) / 2
+    out = prepareOutput(out, initialLength, frequency, youngModulus, density)
+    scratch = np.empty_like(out)
+
+    # 16 * density * frequency ** 2 * initialLength ** 4 / youngModulus
+    np.multiply(frequency, frequency, out=out)
+    np.multiply(density, out, out=out)
+    np.multiply(out, 16, out=out)
+    np.multiply(initialLength, initialLength, out=scratch)
+    np.multiply(out, scratch, out=out)
+    np.multiply(out, scratch, out=out)
+    np.divide(out, youngModulus, out=out)
+
+    # The square root of initialLength ** 2 plus the previous term
+    np.add(scratch, out, out=out)
+    np.sqrt(out, out=out)
+
+    np.add(initialLength, out, out=out)
+    np.divide(out, 2, out=out)
+
+    return finishOutput(out)
+
+
+def calculateTurnByFrequency(
+    origLength: float,
+    actualLength: float,
+    frequency: float,
+    youngModulus: float,
+    density: float,
+    out: np.ndarray = None,
+) -> float:
+    """
+    We calculate the turn that gives a certain frequency to the string.
+
+    It is the difference between the length of calculateNewLengthByFrequency()
+    and the actual length in revolutions of the peg of calculateNewLength().
+
+    Args:
+        - origLength (float): The original length of the string in meters.
+        - actualLength (float): The actual length of the string in meters.
+        - frequency (float): The objective frequency of the string in hertz.
+        - youngModulus (float): The Young's modulus of the string in pascals.
+        - density (float): The density of the string in kilograms per cubic meter.
+        - out (np.ndarray): The array where the result is written.
+
+    Returns:
+        - float: The turn of the string in revolutions.
+    """
+    out = prepareOutput(out, origLength, actualLength, frequency, youngModulus, density)
+
+    calculateNewLengthByFrequency(origLength, frequency, youngModulus, density, out=out)
+    np.subtract(out, actualLength, out=out)
+    np.divide(out, pegCircumference, out=out)
+
+    return finishOutput(out)
@@ -0,0 +1,197 @@
+import numpy as np
+
+
+class PitchDetector:
+    """
+    Estimate the fundamental frequency of audio frames with the YIN algorithm.
+    http://audition.ens.fr/adc/pdf/2002_JASA_YIN.pdf
+
+    The difference function is calculated with the autocorrelation given by
+    the FFT, so each frame costs a couple of FFTs of the frame size.
+
+    A frame must contain at least two periods of the lowest frequency.
+    """
+
+    def __init__(
+        self,
+        sr: int = 16000,
+        *,
+        minFrequency: float = 60,
+        maxFrequency: float = 2000,
+        threshold: float = 0.03,
+        silence: float = 1e-8,
+    ) -> None:
+        """
+        Initialize the PitchDetector class.
+
+        Args:
+            - sr (int): The sample rate of the frames.
+            - minFrequency (float): The lowest frequency that is detected in hertz.
+            - maxFrequency (float): The highest frequency that is detected in hertz.
+            - threshold (float): The value of the normalized difference under
+                                which the first minimum is taken as the period.
+            - silence (float): The mean power under which a frame is silent.
+
+        Returns:
+            - None
+        """
+        if not 0 < minFrequency < maxFrequency:
+            raise ValueError("The frequencies must verify 0 < minimum < maximum")
+
+        self.sr = sr
+        self.minFrequency = minFrequency
+        self.maxFrequency = maxFrequency
+        self.threshold = threshold
+        self.silence = silence
+
+        # Range of the lags in samples, with one more at each
+        # side to find the minima at the limits
+        self.tauMin = max(2, int(sr / maxFrequency))
+        self.tauMax = int(np.ceil(sr / minFrequency)) + 1
+
+    def minFrameLength(self) -> int:
+        """
+        Calculate the shortest frame that can be analyzed.
+
+        Args:
+            - None
+
+        Returns:
+            - int: The number of samples.
+        """
+        return 2 * self.tauMax + 1
+
+    def differenceFunction(self, frame: np.ndarray, tauMax: int) -> np.ndarray:
+        """
+        Calculate the difference function of YIN:
+            d(tau) = sum_j (x[j] - x[j + tau]) ** 2
+
+        The sums go over the first len(frame) - tauMax samples, so
+        d(tau) = E(0) + E(tau) - 2 * r(tau), where E are the energies
+        of the windows and r the cross correlation done with the FFT.
+
+        Args:
+            - frame (np.ndarray): The audio frame.
+            - tauMax (int): The maximum lag.
+
+        Returns:
+            - np.ndarray: The difference for the lags from 0 to tauMax.
+        """
+        window = len(frame) - tauMax
+        size = 1 << int(np.ceil(np.log2(len(frame) + window)))
+
+        spectrum = np.fft.rfft(frame, size)
+        windowSpectrum = np.fft.rfft(frame[:window], size)
+        correlation = np.fft.irfft(spectrum * np.conj(windowSpectrum), size)
+
+        energies = np.concatenate(([0.0], np.cumsum(frame**2)))
+        windowEnergies = energies[window : window + tauMax + 1] - energies[: tauMax + 1]
+
+        difference = energies[window] + windowEnergies - 2 * correlation[: tauMax + 1]
+
+        # Rounding errors of the FFT can give small negative values
+        return np.maximum(difference, 0)
+
+    def detect(self, frame: np.ndarray) -> tuple:
+        """
+        Estimate the fundamental frequency of a frame.
+
+        The lowest frequency that can be detected is limited by
+        the length of the frame, see minFrameLength().
+
+        Args:
+            - frame (np.ndarray): The audio frame.
+
+        Returns:
+            - tuple: The frequency in hertz and the confidence between 0 and 1.
+                    A silent frame or one without a clear period gives (0, 0).
+        """
+        frame = np.asarray(frame, dtype=np.float64)
+        frame = frame - frame.mean()
+
+        tauMax = min(self.tauMax, (len(frame) - 1) // 2)
+
+        if tauMax <= self.tauMin or np.mean(frame**2) < self.silence:
+            return 0.0, 0.0
+
+        difference = self.differenceFunction(frame, tauMax)
+
+        # Cumulative mean normalized difference
+        cumulative = np.cumsum(difference[1:])
+        normalized = np.ones(tauMax + 1)
+        np.divide(
+            difference[1:] * np.arange(1, tauMax + 1),
+            cumulative,
+            out=normalized[1:],
+            where=cumulative > 0,
+        )
+
+        # Local minima of the normalized difference and their
+        # values at the vertex of the parabola through their neighbours
+        before = normalized[self.tauMin - 1 : tauMax - 1]
+        at = normalized[self.tauMin : tauMax]
+        after = normalized[self.tauMin + 1 : tauMax + 1]
+        minima = np.flatnonzero((at <= before) & (at < after))
+
+        if len(minima) == 0:
+            return 0.0, 0.0
+
+        before, at, after = before[minima], at[minima], after[minima]
+        curvature = np.maximum(before - 2 * at + after, np.finfo(float).tiny)
+        shifts = (before - after) / (2 * curvature)
+        values = at - (before - after) * shifts / 4
+
+        # The period is the first minimum under the threshold, the values of
+        # the grid alone are too high when the period is between two samples
+        candidates = np.flatnonzero(values < self.threshold)
+        best = candidates[0] if len(candidates) else np.argmin(values)
+
+        confidence = float(np.clip(1 - values[best], 0, 1))
+
+        if confidence == 0:
+            return 0.0, 0.0
+
+        # The normalization biases the position of the minimum,
+        # so the period is refined on the difference function
+        tau = self.tauMin + minima[best]
+        before, at, after = difference[tau - 1 : tau + 2]
+        curvature = before - 2 * at + after
+        shift = (before - after) / (2 * curvature) if curvature > 0 else 0.0
+
+        return self.sr / (tau + np.clip(shift, -1, 1)), confidence
+
+    def detectFrames(self, signal: np.ndarray, frameLength: int, hop: int) -> tuple:
+        """
+        Estimate the fundamental frequency along a signal.
+
+        Args:
+            - signal (np.ndarray): The audio signal.
+            - frameLength (int): The number of samples of each frame.
+            - hop (int): The number of samples between the starts of the frames.
+
+        Returns:
+            - tuple: The frequencies and the confidences of the frames as np.ndarray.
+        """
+        starts = range(0, len(signal) - frameLength + 1, hop)
+        results = [self.detect(signal[i : i + frameLength]) for i in starts]
+
+        if not results:
+            return np.zeros(0), np.zeros(0)
+
+        frequencies, confidences = zip(*results)
+        return np.array(frequencies), np.array(confidences)
+
+
+def detectPitch(frame: np.ndarray, sr: int = 16000, **kwargs) -> tuple:
+    """
+    Estimate the fundamental frequency of a frame, see PitchDetector.detect().
+
+    Args:
+        - frame (np.ndarray): The audio frame.
+        - sr (int): The sample rate of the frame.
+        - **kwargs: The other arguments of PitchDetector.
+
+    Returns:
+        - tuple: The frequency in hertz and the confidence between 0 and 1.
+    """
+    return PitchDetector(sr, **kwargs).detect(frame)
@@ -0,0 +1,242 @@
+import instrument
+import logic
+import physics
+import numpy as np
+import weakref
+
+
+class PhysicsSolver:
+    """
+    Tune the strings with the physical model instead of the fuzzy logic.
+
+    When the material of the strings is known the turn that gives the
+    objective frequency is calculated in closed form with
+    physics.calculateTurnByFrequency(), so without damping every string
+    is tuned in a single iteration.
+
+    It can replace the logic.Tuner of an instrument:
+        inst.turner = PhysicsSolver()
+    """
+
+    def __init__(self, damping: float = 1) -> None:
+        """
+        Initialize the PhysicsSolver class.
+
+        Args:
+            - damping (float): The fraction of the exact turn that is made. With
+                            less than 1 the strings get closer to the objective
+                            in each iteration, like turning them by hand.
+
+        Returns:
+            - None
+        """
+        if not 0 < damping <= 1:
+            raise ValueError("The damping must verify 0 < damping <= 1")
+
+        self.damping = damping
+
+    def tuneStrings(
+        self, inst: instrument.Instrument, strings: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the turns to tune some strings of an instrument,
+        positive to tighten them and negative to loosen them.
+
+        Args:
+            - inst (instrument.Instrument): The instrument.
+            - strings (np.ndarray): The indices of the strings.
+
+        Returns:
+            - np.ndarray: The turns to tune the strings.
+        """
+        turns = physics.calculateTurnByFrequency(
+            inst.lengths[strings],
+            inst.stringLengths[strings],
+            inst.frequencies[strings],
+            inst.youngModulus[strings],
+            inst.density[strings],
+        )
+
+        if self.damping != 1:
+            np.multiply(turns, self.damping, out=turns)
+
+        return turns
+
+
+class AdaptiveTuner:
+    """
+    Rescale the turns of a fuzzy Tuner with the gain of each string,
+    learned from the frequencies measured after each turn.
+
+    The Tuner gives the same turn to all the strings with the same length
+    and difference, but a stiff string changes its frequency many more
+    hertz per revolution than a soft one. The gain of each string in hertz
+    per revolution is estimated with recursive least squares on the
+    changes of frequency of its last turns, forgetting the old ones because
+    the gain grows with the tension. Once a string has a gain, its turn is
+    the difference over the gain, kept between minScale and maxScale times
+    the fuzzy turn.
+
+    The material of the strings is not used, only the frequencies of the
+    instrument, so it works with real instruments. The state of each
+    instrument is kept while the instrument exists, so it can be shared.
+    """
+
+    def __init__(
+        self,
+        tuner: logic.Tuner = None,
+        *,
+        forgetting: float = 0.5,
+        minScale: float = 0.01,
+        maxScale: float = 100,
+    ) -> None:
+        """
+        Initialize the AdaptiveTuner class.
+
+        Args:
+            - tuner (logic.Tuner): The tuner that gives the turns before
+                                the gain of a string is known.
+            - forgetting (float): The weight of the previous turns in the
+                                estimation of the gain, between 0 and 1.
+            - minScale (float): The minimum fraction of the fuzzy turn.
+            - maxScale (float): The maximum multiple of the fuzzy turn.
+
+        Returns:
+            - None
+        """
+        if not 0 < forgetting <= 1:
+            raise ValueError("The forgetting must verify 0 < forgetting <= 1")
+        if not 0 < minScale <= 1 <= maxScale:
+            raise ValueError("The scales must verify 0 < minScale <= 1 <= maxScale")
+
+        self.tuner = logic.Tuner() if tuner is None else tuner
+        self.forgetting = forgetting
+        self.minScale = minScale
+        self.maxScale = maxScale
+
+        self.states = weakref.WeakKeyDictionary()
+
+    def state(self, inst: instrument.Instrument) -> dict:
+        """
+        Give the state of the strings of an instrument,
+        creating it the first time. It has one value per string of:
+            - frequency: The frequency before the last turn, NaN if not turned.
+            - gain: The estimated gain in hertz per revolution, NaN if unknown.
+            - covariance: The covariance of the estimation of the gain.
+
+        Args:
+            - inst (instrument.Instrument): The instrument.
+
+        Returns:
+            - dict: The state of the strings.
+        """
+        if inst not in self.states:
+            nStrings = len(inst.frequencies)
+            self.states[inst] = {
+                "frequency": np.full(nStrings, np.nan),
+                "gain": np.full(nStrings, np.nan),
+                "covariance": np.full(nStrings, np.nan),
+            }
+        return self.states[inst]
+
+    def updateGains(
+        self, inst: instrument.Instrument, state: dict, strings: np.ndarray
+    ) -> None:
+        """
+        Update the gains of some strings with the change of frequency
+        given by their last turn, the one in lastTurns of the instrument
+        because it can be damped.
+
+        Args:
+            - inst (instrument.Instrument): The instrument.
+            - state (dict): The state of the strings, see state().
+            - strings (np.ndarray): The indices of the strings.
+
+        Returns:
+            - None
+        """
+        frequencies = inst.stringFrequencies[strings]
+        turns = inst.lastTurns[strings]
+        changes = frequencies - state["frequency"][strings]
+
+        # A string loosened until it has no tension changes less than the
+        # turn would give, but a string tightened from no tension is fine
+        measured = np.isfinite(changes) & (turns != 0) & (frequencies > 0)
+        turns, changes = turns[measured], changes[measured]
+        strings = strings[measured]
+
+        gains = state["gain"][strings]
+        covariances = state["covariance"][strings]
+
+        # The first turn gives the secant, then the recursive least squares of
+        # changes = gain * turns with the previous turns weighted by forgetting
+        new = np.isnan(gains)
+        gains[new] = changes[new] / turns[new]
+        covariances[new] = 1 / (turns[new] * turns[new])
+
+        old = ~new
+        t, P = turns[old], covariances[old]
+        k = P * t / (self.forgetting + P * t * t)
+        gains[old] += k * (changes[old] - gains[old] * t)
+        covariances[old] = (P - k * t * P) / self.forgetting
+
+        state["gain"][strings] = gains
+        state["covariance"][strings] = covariances
+
+    def tuneStrings(
+        self, inst: instrument.Instrument, strings: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the turns to tune some strings of an instrument,
+        positive to tighten them and negative to loosen them.
+
+        Args:
+            - inst (instrument.Instrument): The instrument.
+            - strings (np.ndarray): The indices of the strings.
+
+        Returns:
+            - np.ndarray: The turns to tune the strings.
+        """
+        state = self.state(inst)
+        frequencies = inst.stringFrequencies[strings]
+
+        self.updateGains(inst, state, strings)
+
+        turns = self.tuner.tuneStrings(inst, strings)
+
+        # A string without tension or loosened too much can give no gain
+        gains = state["gain"][strings]
+        known = gains > 0
+
+        exact = (inst.frequencies[strings][known] - frequencies[known]) / gains[known]
+        fuzzy = np.abs(turns[known])
+        turns[known] = np.sign(exact) * np.clip(
+            np.abs(exact), self.minScale * fuzzy, self.maxScale * fuzzy
+        )
+
+        state["frequency"][strings] = frequencies
+
+        return turns
+
+
+if __name__ == "__main__":
+    import fleet
+    import guitars
+    import harplike
+
+    np.random.seed(0)
+
+    instruments = [guitars.ClassicalGuitar(), harplike.Harp36String()]
+    instruments += [instrument.RandomInstrument(n) for n in range(1, 41)]
+
+    # Iterations to convergence of the fuzzy Tuner, alone and adaptive, and the solver
+    for backend in ["numpy", "adaptive", "physics"]:
+        results, summary = fleet.runFleet(
+            instruments, backend=backend, timeLimit=10, verbose=False
+        )
+
+        print(
+            f"{backend}: {summary['converged']}/{summary['instruments']} converged, "
+            f"{summary['meanIterations']:.1f} iterations on average, "
+            f"at most {max(r['iterations'] for r in results if r['converged'])}"
+        )
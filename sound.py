@@ -1,8 +1,20 @@
 import numpy as np
-import sounddevice as sd
+from collections import OrderedDict
+import threading
+import time
+import wave
+import os
+import shutil
 
 
-def createCordFrequency(frequency: float) -> np.ndarray:
+def createCordFrequency(
+    frequency: float,
+    *,
+    sr: int = 16000,
+    decay: float = 0.99,
+    duration: float = 2,
+    rng: np.random.Generator = None,
+) -> np.ndarray:
     """
     Create a sound with the given frequency using the Karplus-Strong algorithm.
     https://en.wikipedia.org/wiki/Karplus%E2%80%93Strong_string_synthesis
@@ -13,13 +25,17 @@ def createCordFrequency(frequency: float) -> np.ndarray:
 
     Args:
         - frequency (float): The frequency of the sound to play.
+        - sr (int): The sample rate.
+        - decay (float): The feedback decay factor.
+        - duration (float): The duration in seconds.
+        - rng (np.random.Generator): The generator of the initial noise.
+                                    By default the global one of NumPy.
 
     Returns:
-        - np.ndarray: The sound signal. The sample rate is 16000 Hz.
+        - np.ndarray: The sound signal.
     """
-    sr = 16000  # Sample rate
-    decay = 0.99  # Feedback decay factor
-    duration = 2  # Duration in seconds
+    if rng is None:
+        rng = np.random
 
     if frequency <= 0:
         signal = np.zeros(int(sr * duration))
@@ -28,91 +44,868 @@ def createCordFrequency(frequency: float) -> np.ndarray:
         frequency = max(frequency, 1)
         # Calculate delay length based on frequency
         delay_length = int(sr / frequency)  # Samples
-        delay_line = (
-            np.random.rand(delay_length) * 2 - 1
-        )  # Initialize with random values
+        delay_line = rng.random(delay_length) * 2 - 1  # Initialize with random values
 
-        # Initialize the output signal
-        signal = np.zeros(int(sr * duration))
+        signal = karplusStrong(delay_line, int(sr * duration), decay)
+
+    return signal
+
+
+class WaveformCache:
+    """
+    Bounded cache of the signals of createCordFrequency().
+
+    The frequencies are rounded to a number of cents, so strings whose
+    frequency barely changed between iterations reuse the same signal.
+    When it is full the least recently used signal is removed.
+    """
+
+    # Frequency used as the origin of the cents
+    referenceFrequency = 440.0
+
+    def __init__(self, maxSize: int = 256, centResolution: float = 1.0) -> None:
+        """
+        Initialize the WaveformCache class.
+
+        Args:
+            - maxSize (int): The maximum number of signals kept.
+            - centResolution (float): The size in cents of the frequency steps.
+
+        Returns:
+            - None
+        """
+        if maxSize < 1:
+            raise ValueError("The cache must keep at least one signal.")
+        if centResolution <= 0:
+            raise ValueError("The cent resolution must be positive.")
+
+        self.maxSize = maxSize
+        self.centResolution = centResolution
+        self.signals = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, frequency: float) -> int:
+        """
+        Calculate the number of frequency steps from the reference frequency.
+
+        Args:
+            - frequency (float): The frequency in hertz.
+
+        Returns:
+            - int: The step of the frequency, None if there is no sound.
+        """
+        if frequency <= 0:
+            return None
+
+        cents = 1200 * np.log2(frequency / self.referenceFrequency)
+        return int(round(cents / self.centResolution))
+
+    def get(
+        self,
+        frequency: float,
+        *,
+        sr: int = 16000,
+        decay: float = 0.99,
+        duration: float = 2,
+        seed: int = 0,
+    ) -> np.ndarray:
+        """
+        Get the signal of a string, synthesizing it if it is not in the cache.
+
+        The signal is synthesized with the quantized frequency and its noise
+        with the seed, so it only depends on the key. It is read-only
+        because it is shared by all the callers.
+
+        Args:
+            - frequency (float): The frequency of the string.
+            - sr (int): The sample rate.
+            - decay (float): The feedback decay factor.
+            - duration (float): The duration in seconds.
+            - seed (int): The seed of the initial noise.
+
+        Returns:
+            - np.ndarray: The sound signal.
+        """
+        step = self.quantize(frequency)
+        key = (step, sr, duration, decay, seed)
+
+        if key in self.signals:
+            self.hits += 1
+            self.signals.move_to_end(key)
+            return self.signals[key]
+
+        self.misses += 1
+
+        quantized = (
+            0
+            if step is None
+            else self.referenceFrequency * 2 ** (step * self.centResolution / 1200)
+        )
+        signal = createCordFrequency(
+            quantized,
+            sr=sr,
+            decay=decay,
+            duration=duration,
+            rng=np.random.default_rng(seed),
+        )
+        signal.flags.writeable = False
+
+        self.signals[key] = signal
+        if len(self.signals) > self.maxSize:
+            self.signals.popitem(last=False)
+
+        return signal
+
+    def clear(self) -> None:
+        """
+        Remove all the signals and reset the counters.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.signals.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Cache used by playStrum()
+waveformCache = WaveformCache()
+
+
+# Shorter delay lines are generated with an IIR filter instead of by periods
+minBlockLength = 64
+
+
+def karplusStrong(delayLine: np.ndarray, nSamples: int, decay: float) -> np.ndarray:
+    """
+    Generate the signal of the Karplus-Strong algorithm without a Python
+    loop over the samples.
+
+    Each sample is the decayed average of the samples one period
+    and one period minus one before it:
+
+        signal[i] = 0.5 * (signal[i - D] + signal[i - D + 1]) * decay
+
+    For long delay lines the signal is calculated one period at a time,
+    for short ones (with many periods) the recurrence is applied as an
+    IIR filter by scipy.signal.lfilter().
+
+    Args:
+        - delayLine (np.ndarray): The initial noise of the delay line.
+        - nSamples (int): The number of samples of the signal.
+        - decay (float): The feedback decay factor.
+
+    Returns:
+        - np.ndarray: The sound signal.
+    """
+    if len(delayLine) == 0:
+        raise ValueError("The delay line must have at least one sample.")
+
+    if len(delayLine) < minBlockLength:
+        return karplusStrongFilter(delayLine, nSamples, decay)
+
+    return karplusStrongBlocks(delayLine, nSamples, decay)
+
+
+def karplusStrongFilter(
+    delayLine: np.ndarray, nSamples: int, decay: float
+) -> np.ndarray:
+    """
+    Generate the signal of the Karplus-Strong algorithm as an IIR filter
+    whose input is the initial noise.
+
+    The cost is proportional to the number of samples times the length
+    of the delay line. The signal is the same as the one of
+    karplusStrongLoop() up to floating point rounding.
 
-        # Fill the output signal with the initial noise
-        for i in range(delay_length):
-            signal[i] = delay_line[i]
+    Args:
+        - delayLine (np.ndarray): The initial noise of the delay line.
+        - nSamples (int): The number of samples of the signal.
+        - decay (float): The feedback decay factor.
+
+    Returns:
+        - np.ndarray: The sound signal.
+    """
+    # scipy is only needed by this implementation and it is slow to import
+    import scipy.signal
+
+    delayLength = len(delayLine)
+    gain = 0.5 * decay
+
+    # With only one sample both values of the average are the previous sample
+    feedback = np.zeros(delayLength + 1)
+    feedback[0] = 1
+    feedback[delayLength] -= gain
+    feedback[delayLength - 1 if delayLength > 1 else delayLength] -= gain
+
+    excitation = np.zeros(nSamples)
+    excitation[:delayLength] = delayLine[:nSamples]
+
+    # The last sample of the noise must not be averaged with the first one
+    if 1 < delayLength <= nSamples:
+        excitation[delayLength - 1] -= gain * delayLine[0]
+
+    return scipy.signal.lfilter([1.0], feedback, excitation)
+
+
+def karplusStrongBlocks(
+    delayLine: np.ndarray, nSamples: int, decay: float
+) -> np.ndarray:
+    """
+    Generate the signal of the Karplus-Strong algorithm one period
+    of the delay line at a time.
+
+    All the samples of a period except the last one only depend on
+    the previous period and are calculated together. The last one depends
+    on the first sample of its own period. The operations are the same
+    as in karplusStrongLoop() so the signal is exactly the same.
 
-        # Generate the signal using the Karplus-Strong method
-        for i in range(delay_length, len(signal)):
-            # Average the first two samples of the delay line
-            avg = 0.5 * (
-                delay_line[i % delay_length] + delay_line[(i + 1) % delay_length]
+    Args:
+        - delayLine (np.ndarray): The initial noise of the delay line.
+        - nSamples (int): The number of samples of the signal.
+        - decay (float): The feedback decay factor.
+
+    Returns:
+        - np.ndarray: The sound signal.
+    """
+    delayLength = len(delayLine)
+
+    signal = np.zeros(nSamples)
+
+    # Fill the output signal with the initial noise
+    signal[:delayLength] = delayLine[:nSamples]
+
+    for start in range(delayLength, nSamples, delayLength):
+        end = min(start + delayLength, nSamples)
+        previous = start - delayLength
+        n = min(end - start, delayLength - 1)
+
+        signal[start : start + n] = (
+            0.5
+            * (
+                signal[previous : previous + n]
+                + signal[previous + 1 : previous + 1 + n]
             )
-            # Apply decay
-            output = avg * decay
-            # Store in the delay line and signal
-            delay_line[i % delay_length] = output
-            signal[i] = output
+            * decay
+        )
+
+        # The last sample of the period uses the first one of the same period,
+        # which is itself if the period has only one sample
+        if end - start == delayLength:
+            first = signal[start] if delayLength > 1 else signal[previous]
+            signal[end - 1] = 0.5 * (signal[previous + delayLength - 1] + first) * decay
+
+    return signal
+
+
+def karplusStrongLoop(delayLine: np.ndarray, nSamples: int, decay: float) -> np.ndarray:
+    """
+    Generate the signal of the Karplus-Strong algorithm sample by sample.
+
+    It is the original implementation of createCordFrequency(). It is kept
+    to check and benchmark karplusStrong(), which gives the same signal.
+
+    Args:
+        - delayLine (np.ndarray): The initial noise of the delay line.
+        - nSamples (int): The number of samples of the signal.
+        - decay (float): The feedback decay factor.
+
+    Returns:
+        - np.ndarray: The sound signal.
+    """
+    delay_length = len(delayLine)
+    delay_line = delayLine.copy()
+
+    # Initialize the output signal
+    signal = np.zeros(nSamples)
+
+    # Fill the output signal with the initial noise
+    for i in range(delay_length):
+        signal[i] = delay_line[i]
+
+    # Generate the signal using the Karplus-Strong method
+    for i in range(delay_length, len(signal)):
+        # Average the first two samples of the delay line
+        avg = 0.5 * (delay_line[i % delay_length] + delay_line[(i + 1) % delay_length])
+        # Apply decay
+        output = avg * decay
+        # Store in the delay line and signal
+        delay_line[i % delay_length] = output
+        signal[i] = output
 
     return signal
 
 
-def playSound(signal: np.ndarray, sr: int = 16000) -> None:
+def playSound(signal: np.ndarray, sr: int = 16000, output=None) -> None:
     """
     Play the given sound using the sounddevice library.
 
+    If an output is given the sound is sent to it instead, for example
+    a started PlaybackEngine that plays it without blocking.
+
     Args:
         - signal (np.ndarray): The sound signal to play.
         - sr (int): The sample rate of the sound signal.
+        - output (PlaybackEngine): An object with a play(signal) method,
+                                like PlaybackEngine or OfflineRenderer.
 
     Returns:
         - None
     """
+    if output is not None:
+        output.play(signal)
+        return
+
+    # Imported here so the module can be used without an audio device
+    import sounddevice as sd
+
     # Play the synthesized sound
     sd.play(signal, samplerate=sr)
     sd.wait()  # Wait until the audio is done playing
 
 
-def combineSounds(signals: list, soundLength: int = 2000) -> np.ndarray:
+class NullOutputStream:
+    """
+    Output stream without audio device.
+
+    It has the methods of sounddevice.OutputStream that PlaybackEngine
+    uses and calls the callback from a thread at the pace of the sample
+    rate, discarding the samples. It allows to test the playback
+    without sound card.
+    """
+
+    def __init__(
+        self,
+        samplerate: int,
+        blocksize: int,
+        channels: int,
+        callback,
+        dtype: str = "float32",
+    ) -> None:
+        """
+        Initialize the NullOutputStream class.
+
+        Args:
+            - samplerate (int): The sample rate.
+            - blocksize (int): The number of frames of each callback.
+            - channels (int): The number of channels.
+            - callback (function): The function that fills the output.
+            - dtype (str): The type of the samples.
+
+        Returns:
+            - None
+        """
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.channels = channels
+        self.callback = callback
+        self.dtype = dtype
+        self.stopEvent = threading.Event()
+        self.thread = None
+
+    def run(self) -> None:
+        """
+        Call the callback once per block until the stream is stopped.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        outdata = np.zeros((self.blocksize, self.channels), dtype=self.dtype)
+        period = self.blocksize / self.samplerate
+        nextTime = time.perf_counter()
+
+        while not self.stopEvent.is_set():
+            self.callback(outdata, self.blocksize, None, None)
+            nextTime += period
+            self.stopEvent.wait(max(0, nextTime - time.perf_counter()))
+
+    def start(self) -> None:
+        """
+        Start calling the callback from a thread.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop calling the callback.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.thread = None
+
+    def close(self) -> None:
+        """
+        Close the stream. There is nothing to release.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.stop()
+
+
+class PlaybackEngine:
+    """
+    Non-blocking playback of sounds.
+
+    The sounds are mixed into a ring buffer that the callback of an output
+    stream reads, so play() returns immediately and a new sound can start
+    while the previous ones are still sounding.
+
+    The device "null" uses a NullOutputStream instead of sounddevice.
+    """
+
+    nullDevice = "null"
+
+    def __init__(
+        self,
+        sr: int = 16000,
+        *,
+        bufferSeconds: float = 10,
+        blocksize: int = 512,
+        device=None,
+    ) -> None:
+        """
+        Initialize the PlaybackEngine class.
+
+        Args:
+            - sr (int): The sample rate of the sounds.
+            - bufferSeconds (float): The length of the ring buffer in seconds.
+                                    Longer sounds are cut.
+            - blocksize (int): The number of frames of each callback.
+            - device (int | str): The output device of sounddevice or "null".
+
+        Returns:
+            - None
+        """
+        self.sr = sr
+        self.blocksize = blocksize
+        self.device = device
+        self.buffer = np.zeros(int(sr * bufferSeconds), dtype=np.float32)
+        # Position of the next sample to be played
+        self.position = 0
+        # Number of samples to be played
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.stream = None
+
+    def play(self, signal: np.ndarray) -> None:
+        """
+        Add a sound to the ones that are playing.
+
+        Args:
+            - signal (np.ndarray): The sound signal to play.
+
+        Returns:
+            - None
+        """
+        signal = np.asarray(signal, dtype=np.float32)[: len(self.buffer)]
+        n = len(signal)
+
+        with self.lock:
+            first = min(n, len(self.buffer) - self.position)
+            self.buffer[self.position : self.position + first] += signal[:first]
+            self.buffer[: n - first] += signal[first:]
+            self.pending = max(self.pending, n)
+
+    def callback(self, outdata: np.ndarray, frames: int, timeInfo, status) -> None:
+        """
+        Fill the output of the stream with the next samples of the ring
+        buffer, leaving them at zero for the next sounds.
+
+        Args:
+            - outdata (np.ndarray): The output with shape (frames, channels).
+            - frames (int): The number of frames.
+            - timeInfo: The times of the stream, not used.
+            - status: The status of the stream, not used.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            first = min(frames, len(self.buffer) - self.position)
+            outdata[:first, 0] = self.buffer[self.position : self.position + first]
+            outdata[first:, 0] = self.buffer[: frames - first]
+            self.buffer[self.position : self.position + first] = 0
+            self.buffer[: frames - first] = 0
+
+            self.position = (self.position + frames) % len(self.buffer)
+            self.pending = max(0, self.pending - frames)
+
+        # The other channels repeat the first one
+        outdata[:, 1:] = outdata[:, :1]
+
+    def start(self) -> None:
+        """
+        Open and start the output stream.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        if self.device == self.nullDevice:
+            self.stream = NullOutputStream(
+                self.sr, self.blocksize, 1, self.callback, dtype="float32"
+            )
+        else:
+            # Imported here so the module can be used without an audio device
+            import sounddevice as sd
+
+            self.stream = sd.OutputStream(
+                samplerate=self.sr,
+                blocksize=self.blocksize,
+                channels=1,
+                dtype="float32",
+                device=self.device,
+                callback=self.callback,
+            )
+
+        self.stream.start()
+
+    def wait(self) -> None:
+        """
+        Wait until all the sounds have been played.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        while self.pending > 0 and self.stream is not None:
+            time.sleep(self.blocksize / self.sr)
+
+    def stop(self) -> None:
+        """
+        Stop and close the output stream.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def __enter__(self) -> "PlaybackEngine":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+class OfflineRenderer:
+    """
+    Render the sounds to a file instead of playing them.
+
+    Each sound that is played is appended after the previous one, so a whole
+    tuning session ends in a single file. The samples are written as they
+    arrive, the session is never kept in memory.
+
+    The format depends on the extension of the path:
+        - ".wav": 16 bit mono PCM, the samples are clipped to [-1, 1]
+                like the audio device does.
+        - ".npy": float32 array that can be opened with np.load(mmap_mode="r").
+                The samples go to a ".part" file until close() writes the header.
+    """
+
+    formats = (".wav", ".npy")
+
+    def __init__(self, path: str, sr: int = 16000) -> None:
+        """
+        Initialize the OfflineRenderer class.
+
+        Args:
+            - path (str): The path of the file, ending in ".wav" or ".npy".
+            - sr (int): The sample rate of the sounds.
+
+        Returns:
+            - None
+        """
+        self.path = path
+        self.sr = sr
+        self.extension = os.path.splitext(path)[1].lower()
+
+        if self.extension not in self.formats:
+            raise ValueError(
+                f"Unknown format {self.extension!r}, expected one of {self.formats}"
+            )
+
+        self.samples = 0
+        self.file = None
+        self.start()
+
+    def start(self) -> None:
+        """
+        Open the file. It is called when the renderer is created.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        if self.file is not None:
+            return
+
+        if self.extension == ".wav":
+            self.file = wave.open(self.path, "wb")
+            self.file.setnchannels(1)
+            self.file.setsampwidth(2)
+            self.file.setframerate(self.sr)
+        else:
+            self.file = open(self.path + ".part", "wb")
+
+    def play(self, signal: np.ndarray) -> None:
+        """
+        Append a sound to the file.
+
+        Args:
+            - signal (np.ndarray): The sound signal to render.
+
+        Returns:
+            - None
+        """
+        if self.extension == ".wav":
+            samples = np.clip(signal, -1, 1) * 32767
+            self.file.writeframes(np.round(samples).astype("<i2").tobytes())
+        else:
+            self.file.write(np.asarray(signal, dtype="<f4").tobytes())
+
+        self.samples += len(signal)
+
+    def wait(self) -> None:
+        """
+        There is nothing to wait for, the sounds are written when played.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+
+    def stop(self) -> None:
+        """
+        Finish the file. For ".npy" the header is written
+        and the samples are copied after it.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        if self.file is None:
+            return
+
+        self.file.close()
+        self.file = None
+
+        if self.extension == ".npy":
+            header = {"descr": "<f4", "fortran_order": False, "shape": (self.samples,)}
+            with open(self.path, "wb") as file, open(self.path + ".part", "rb") as part:
+                np.lib.format.write_array_header_1_0(file, header)
+                shutil.copyfileobj(part, file)
+            os.remove(self.path + ".part")
+
+    def close(self) -> None:
+        """
+        Same as stop().
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.stop()
+
+    def __enter__(self) -> "OfflineRenderer":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+def combineSounds(
+    signals: list,
+    soundLength: int = 2000,
+    *,
+    out: np.ndarray = None,
+    gains=None,
+    offsets=None,
+) -> np.ndarray:
     """
     Combine a list of sound signals into a single sound signal.
 
-    The lengths calculations are to check what the length of the final
-    sound is going to be. It is going to be at least the sound length
-    times the number of sounds plus the remaining time.
+    Each signal starts at its offset, by default soundLength samples after
+    the previous one. The final sound lasts until the end of the longest
+    signal and at least soundLength samples after the last start.
+
+    The signals can also be a 2-D array with one voice per row, then the
+    gains are applied in a single operation and the voices that start
+    at the same offset are mixed in a single operation.
+
+    If out is given the signals are mixed in place in it, so the same buffer
+    can be used every time. Its beginning is overwritten and returned.
 
     Args:
-        - signals (list): A list of sound signals.
+        - signals (list | np.ndarray): A list of sound signals or
+                                        a 2-D array of voices.
         - soundLength (int): The length from the start of one sound
                             to the start of the next sound.
+        - out (np.ndarray): A buffer where the signals are mixed.
+        - gains (float | list): The gain of each signal, 1 by default.
+        - offsets (list): The start of each signal in samples.
 
     Returns:
-        - np.ndarray: The concatenated sound signal.
+        - np.ndarray: The combined sound signal.
     """
-    lengths = [len(s) for s in signals]
-    lengths = [
-        lengths[i] - soundLength * (len(lengths) - i) for i in range(len(lengths))
-    ]
+    n = len(signals)
+
+    if offsets is None:
+        offsets = range(0, n * soundLength, soundLength)
+    else:
+        offsets = [int(offset) for offset in offsets]
+        if len(offsets) != n or any(offset < 0 for offset in offsets):
+            raise ValueError("There must be a non negative offset for each signal")
+
+    if gains is None:
+        gains = [1] * n
+    else:
+        gains = np.broadcast_to(gains, (n,))
+
+    finalSignalLength = max(
+        [offset + soundLength for offset in offsets]
+        + [offset + len(signal) for offset, signal in zip(offsets, signals)],
+        default=0,
+    )
+
+    if out is None:
+        out = np.zeros(finalSignalLength)
+    elif len(out) < finalSignalLength:
+        raise ValueError(
+            f"The buffer has {len(out)} samples but {finalSignalLength} are needed"
+        )
+    else:
+        out = out[:finalSignalLength]
+        out.fill(0)
 
-    finalSignalLength = soundLength * len(signals) + max(lengths + [0])
+    if isinstance(signals, np.ndarray) and signals.ndim == 2:
+        # All the voices are scaled at once
+        if any(gain != 1 for gain in gains):
+            signals = signals * np.asarray(gains)[:, None]
 
-    finalSignal = np.zeros(finalSignalLength)
+        # The voices that start together are summed in one operation
+        length = signals.shape[1]
+        starts, groups = np.unique(
+            np.asarray(offsets, dtype=np.intp), return_inverse=True
+        )
 
-    for i in range(len(signals)):
-        finalSignal[i * soundLength : i * soundLength + len(signals[i])] += signals[i]
+        if len(starts) == 1:
+            np.sum(signals, axis=0, out=out[starts[0] : starts[0] + length])
+        else:
+            order = np.argsort(groups, kind="stable")
+            bounds = np.cumsum(np.bincount(groups))[:-1]
 
-    return finalSignal
+            for start, voices in zip(starts, np.split(order, bounds)):
+                segment = out[start : start + length]
+                # A voice alone is added without copying it
+                if len(voices) == 1:
+                    segment += signals[voices[0]]
+                else:
+                    segment += signals[voices].sum(axis=0)
+
+        return out
+
+    for signal, offset, gain in zip(signals, offsets, gains):
+        segment = out[offset : offset + len(signal)]
+        if gain == 1:
+            segment += signal
+        else:
+            segment += gain * signal
+
+    return out
+
+
+def createStrum(
+    frequencies: list,
+    cache: WaveformCache = waveformCache,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Create the signal of a strum of sounds with the given frequencies.
+
+    Args:
+        - frequencies (list): A list of frequencies to combine.
+        - cache (WaveformCache): The cache of the signals. If it is None
+                                the signals are always synthesized again.
+        - out (np.ndarray): A buffer for the strum that can be reused,
+                            see combineSounds().
+
+    Returns:
+        - np.ndarray: The signal of the strum.
+    """
+    if cache is None:
+        signals = [createCordFrequency(f) for f in frequencies]
+    else:
+        signals = [cache.get(f) for f in frequencies]
+    return combineSounds(signals, out=out)
 
 
-def playStrum(frequencies: list) -> None:
+def playStrum(
+    frequencies: list,
+    cache: WaveformCache = waveformCache,
+    output=None,
+    out: np.ndarray = None,
+) -> None:
     """
     Play a strum of sounds with the given frequencies.
 
     Args:
         - frequencies (list): A list of frequencies to play.
+        - cache (WaveformCache): The cache of the signals. If it is None
+                                the signals are always synthesized again.
+        - output (PlaybackEngine): Where the strum is played, see playSound().
+        - out (np.ndarray): A buffer for the strum that can be reused,
+                            see combineSounds().
 
     Returns:
         - None
     """
-    signals = [createCordFrequency(f) for f in frequencies]
-    playSound(combineSounds(signals))
+    playSound(createStrum(frequencies, cache, out), output=output)
 
 
 if __name__ == "__main__":
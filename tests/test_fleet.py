@@ -0,0 +1,159 @@
+import unittest
+import fleet
+import instrument
+import guitars
+import logic
+import solver
+import numpy as np
+import copy
+import os
+import tempfile
+from unittest import mock
+
+
+class numTests(unittest.TestCase):
+    numTests = 12
+
+
+class zeroTurner:
+    """
+    A turner that never turns the strings.
+    """
+
+    def tuneStrings(self, inst: instrument.Instrument, strings):
+        return np.zeros(len(strings))
+
+
+class test_fleet(numTests):
+
+    def test_sameAsSerial(self):
+        """
+        We test that the instruments tuned in the pool give
+        the same results as tuning them one by one.
+        """
+        instruments = []
+        for _ in range(self.numTests):
+            guitar = guitars.ClassicalGuitar()
+            guitar.stringFrequencies += guitar.frequencies + np.random.uniform(
+                -50, 50, len(guitar.frequencies)
+            )
+            guitar.calculateTightness()
+            instruments.append(guitar)
+        serial = copy.deepcopy(instruments)
+        initial = [inst.stringFrequencies.copy() for inst in instruments]
+
+        results, summary = fleet.runFleet(
+            instruments, backend="numpy", nWorkers=2, timeLimit=5, verbose=False
+        )
+
+        self.assertEqual([r["index"] for r in results], list(range(self.numTests)))
+        self.assertEqual(summary["instruments"], self.numTests)
+        self.assertEqual(
+            summary["converged"] + sum(summary["reasons"].values()), self.numTests
+        )
+        self.assertGreater(summary["instrumentsPerSecond"], 0)
+
+        tuner = logic.Tuner(backend="numpy")
+
+        for result, inst in zip(results, serial):
+            inst.turner = tuner
+
+            try:
+                turns = inst.tune(timeLimit=5)
+            except TimeoutError:
+                self.assertFalse(result["converged"])
+                continue
+
+            self.assertTrue(result["converged"])
+            self.assertEqual(result["strings"], len(inst.frequencies))
+            self.assertEqual(result["iterations"], len(turns))
+            self.assertAlmostEqual(
+                result["revolutions"], float(np.sum(np.abs(turns))), places=9
+            )
+
+        # The instruments of the fleet are not modified
+        for inst, frequencies in zip(instruments, initial):
+            self.assertTrue(np.array_equal(inst.stringFrequencies, frequencies))
+
+    def test_timeout(self):
+        """
+        We test that the instruments that reach the
+        time limit are reported and not lost.
+        """
+        instruments = [instrument.RandomInstrument(5) for _ in range(4)]
+
+        results = list(
+            fleet.tuneFleet(instruments, backend="numpy", nWorkers=2, timeLimit=1e-9)
+        )
+
+        self.assertEqual(sorted(r["index"] for r in results), [0, 1, 2, 3])
+        self.assertFalse(any(r["converged"] for r in results))
+        self.assertEqual(fleet.summarize(results, 1)["timeouts"], 4)
+
+    def test_reasons(self):
+        """
+        We test that the instruments that didn't converge
+        are counted by the reason why they stopped.
+        """
+        tuned = instrument.RandomInstrument(5)
+        tuned.turner = solver.PhysicsSolver()
+
+        stagnated = instrument.RandomInstrument(5)
+        stagnated.turner = zeroTurner()
+
+        results = [
+            fleet.tuneInstrument(tuned),
+            fleet.tuneInstrument(stagnated),
+            fleet.tuneInstrument(instrument.RandomInstrument(5), maxIterations=1),
+            fleet.tuneInstrument(instrument.RandomInstrument(5), timeLimit=1e-9),
+        ]
+
+        summary = fleet.summarize(results, 1)
+
+        self.assertEqual(summary["converged"], 1)
+        self.assertEqual(summary["timeouts"], 1)
+        self.assertEqual(
+            summary["reasons"], {"failed": 1, "maxIterations": 1, "timeLimit": 1}
+        )
+        # The strings of the instruments that were stopped are still active
+        self.assertEqual(summary["failedStrings"], {"stagnated": 5, "active": 10})
+
+    def test_tableBackend(self):
+        """
+        We test that the control surface is created only once before
+        the pool and that the processes open it without creating it.
+        """
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(
+            logic.Tuner, "dataframePath", os.path.join(directory, "turns.parquet")
+        ), mock.patch.object(
+            logic.Tuner, "surfacePath", os.path.join(directory, "turns.surface")
+        ):
+            # Without the surface the processes can't create it
+            with self.assertRaises(FileNotFoundError):
+                fleet.initWorker("table")
+
+            with mock.patch.object(
+                logic.Tuner,
+                "createDataframe",
+                autospec=True,
+                side_effect=logic.Tuner.createDataframe,
+            ) as createDataframe:
+                results, summary = fleet.runFleet(
+                    [guitars.ClassicalGuitar() for _ in range(4)],
+                    backend="table",
+                    nWorkers=2,
+                    verbose=False,
+                )
+
+            self.assertEqual(createDataframe.call_count, 1)
+            self.assertEqual(summary["converged"], 4)
+            self.assertEqual(
+                sorted(os.listdir(directory)), ["turns.parquet", "turns.surface"]
+            )
+
+    def test_unknownBackend(self):
+        """
+        We test that an unknown backend is rejected.
+        """
+        with self.assertRaises(ValueError):
+            list(fleet.tuneFleet([], backend="unknown"))
@@ -0,0 +1,206 @@
+import unittest
+import logic
+import inference
+import random
+import numpy as np
+import tempfile
+import os
+from unittest import mock
+
+
+class numTests(unittest.TestCase):
+    numTests = 500
+    tolerance = inference.FuzzyEngine.TOLERANCE
+
+
+class test_engine(numTests):
+
+    def test_sameTurnAsSkfuzzy(self):
+        """
+        We test that the compiled engine gives the same
+        turn as the simulation of skfuzzy.
+        """
+        difference = [random.uniform(-3000, 3000) for _ in range(self.numTests)]
+        stringLength = [random.uniform(0, 2) for _ in range(self.numTests)]
+
+        turner = logic.Tuner()
+
+        for i in range(self.numTests):
+            self.assertAlmostEqual(
+                turner.engine.compute(
+                    {"frequency": abs(difference[i]), "stringLength": stringLength[i]}
+                ),
+                turner.calculateTurnSkfuzzy(difference[i], stringLength[i]),
+                delta=self.tolerance,
+            )
+
+    def test_universePoints(self):
+        """
+        We test the points of the universes, where the
+        membership functions change their slope.
+        """
+        turner = logic.Tuner()
+
+        for frequency in range(0, 300):
+            stringLength = random.choice(turner.stringLengthAntecedent.universe)
+            self.assertAlmostEqual(
+                turner.engine.compute(
+                    {"frequency": frequency, "stringLength": stringLength}
+                ),
+                turner.calculateTurnSkfuzzy(frequency, stringLength),
+                delta=self.tolerance,
+            )
+
+    def test_numpyBackend(self):
+        """
+        We test that both backends of the Tuner
+        give the same signed turn.
+        """
+        objectiveFrequency = [random.uniform(0, 1000) for _ in range(self.numTests)]
+        frequency = [random.uniform(0, 1000) for _ in range(self.numTests)]
+        stringLength = [random.uniform(0, 2) for _ in range(self.numTests)]
+
+        turner = logic.Tuner()
+        fastTurner = logic.Tuner(backend="numpy")
+
+        for i in range(self.numTests):
+            self.assertAlmostEqual(
+                fastTurner.tune(objectiveFrequency[i], frequency[i], stringLength[i]),
+                turner.tune(objectiveFrequency[i], frequency[i], stringLength[i]),
+                delta=self.tolerance,
+            )
+
+    def test_unknownBackend(self):
+        """
+        We test that an unknown backend is rejected.
+        """
+        with self.assertRaises(ValueError):
+            logic.Tuner(backend="unknown")
+
+
+class test_surface(numTests):
+
+    def test_plane(self):
+        """
+        We test that the bilinear interpolation of
+        a plane gives the plane.
+        """
+        frequencies = np.arange(0, 100, 1.0)
+        lengths = np.arange(0.08, 1.2, 0.01)
+        turns = 0.002 * frequencies[:, None] + 0.5 * lengths[None, :]
+
+        surface = inference.ControlSurface(frequencies, lengths, turns)
+
+        differences = np.array([random.uniform(0, 99) for _ in range(self.numTests)])
+        stringLength = np.array(
+            [random.uniform(0.08, lengths[-1]) for _ in range(self.numTests)]
+        )
+
+        expected = 0.002 * differences + 0.5 * stringLength
+
+        self.assertTrue(
+            np.allclose(surface.interpolate(differences, stringLength), expected)
+        )
+
+        for i in range(self.numTests):
+            self.assertAlmostEqual(
+                surface.interpolateOne(differences[i], stringLength[i]), expected[i]
+            )
+
+    def test_tableBackend(self):
+        """
+        We test that the table backend reports its error,
+        that it is respected inside the grid and that the
+        points outside the grid use the exact inference.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.object(
+                logic.Tuner, "dataframePath", os.path.join(directory, "turns.parquet")
+            ), mock.patch.object(
+                logic.Tuner, "surfacePath", os.path.join(directory, "turns.surface")
+            ):
+                turner = logic.Tuner(backend="table")
+
+                self.assertTrue(os.path.exists(logic.Tuner.dataframePath))
+                self.assertTrue(os.path.exists(logic.Tuner.surfacePath))
+
+                # The second time the saved surface is opened
+                os.remove(logic.Tuner.dataframePath)
+                self.assertEqual(
+                    logic.Tuner(backend="table").surfaceError, turner.surfaceError
+                )
+                self.assertFalse(os.path.exists(logic.Tuner.dataframePath))
+
+        self.assertGreaterEqual(turner.surfaceError, 0)
+
+        frequency = turner.surface.frequencies
+        lengths = turner.surface.lengths
+        i = np.array([random.randrange(len(frequency)) for _ in range(self.numTests)])
+        j = np.array([random.randrange(len(lengths)) for _ in range(self.numTests)])
+
+        # In the points of the grid there is no interpolation
+        self.assertTrue(
+            np.allclose(
+                turner.calculateTurns(frequency[i], lengths[j]),
+                turner.calculateTurnsExact(frequency[i], lengths[j]),
+                atol=self.tolerance,
+            )
+        )
+
+        # Between the points of the grid, also where the surface jumps
+        for high in [300, frequency[-1]]:
+            differences = np.random.uniform(0, high, 100 * self.numTests)
+            stringLengths = np.random.uniform(
+                lengths[0], lengths[-1], 100 * self.numTests
+            )
+            self.assertLessEqual(
+                np.max(
+                    np.abs(
+                        turner.calculateTurns(differences, stringLengths)
+                        - turner.calculateTurnsExact(differences, stringLengths)
+                    )
+                ),
+                turner.surfaceError + self.tolerance,
+            )
+
+        for length in [0.01, 2]:
+            self.assertAlmostEqual(
+                turner.calculateTurn(50, length),
+                turner.calculateTurnSkfuzzy(50, length),
+                delta=self.tolerance,
+            )
+
+    def test_memoryMap(self):
+        """
+        We test that a saved surface is opened as a
+        memory map with the same turns and header.
+        """
+        frequencies = np.arange(0, 100, 1.0)
+        lengths = np.arange(0.08, 1.2, 0.01)
+        turns = np.array([[random.uniform(0, 1) for _ in lengths] for _ in frequencies])
+
+        surface = inference.ControlSurface(
+            frequencies, lengths, turns, error=0.25, fingerprint="abc"
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "turns.surface")
+            surface.save(path)
+
+            opened = inference.ControlSurface.open(path)
+
+            self.assertIsInstance(opened.turns.base, np.memmap)
+            self.assertFalse(opened.turns.flags.writeable)
+            self.assertTrue(np.array_equal(opened.frequencies, frequencies))
+            self.assertTrue(np.array_equal(opened.lengths, lengths))
+            self.assertTrue(np.array_equal(opened.turns, turns))
+            self.assertEqual(opened.error, 0.25)
+            self.assertEqual(opened.fingerprint, "abc")
+
+            del opened
+
+            with open(path, "r+b") as file:
+                file.write(b"NOTASURF")
+
+            with self.assertRaises(ValueError):
+                inference.ControlSurface.open(path)
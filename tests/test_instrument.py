@@ -6,6 +6,13 @@ import harplike
 import numpy as np
 import random
 import inspect
+import copy
+import logic
+import physics
+import subprocess
+import sys
+import threading
+from unittest import mock
 
 
 def getClasses() -> list:
@@ -174,9 +181,10 @@ class test_instrument(numTests):
             actual = inst.stringFrequencies
 
             nTurns = np.zeros(len(objective))
+            tolerances = inst.tolerances()
 
             for i in range(len(objective)):
-                actual[i] = objective[i] + random.uniform(-3, 3)
+                actual[i] = objective[i] + random.uniform(-1, 1) * tolerances[i]
 
             inst.calculateTightness()
 
@@ -282,3 +290,440 @@ class test_instrument(numTests):
         print(f"Success rate: {100*nCorrect/self.numTests}%")
         print(f"Average turns by string: {sum(turns)/(len(turns) if turns else 1)}")
         print(f"Turns by instrument: {sum(turns)/(nCorrect if nCorrect else 1)}")
+
+
+class test_state(numTests):
+
+    def test_arrays(self):
+        """
+        We test that the attributes of the strings are
+        contiguous float64 arrays of the same length and
+        that the class attributes are not modified.
+        """
+        for cls in self.instruments:
+            inst = cls()
+
+            for name in instrument.Instrument.stringAttributes + (
+                "stringFrequencies",
+                "stringLengths",
+            ):
+                array = getattr(inst, name)
+
+                self.assertIsInstance(array, np.ndarray)
+                self.assertEqual(array.dtype, np.float64)
+                self.assertTrue(array.flags.c_contiguous)
+                self.assertEqual(array.shape, (len(inst.frequencies),))
+
+        harp = harplike.Harp36String()
+        harp.frequencies[0] = 0
+        self.assertIsInstance(harplike.Harp36String.frequencies, list)
+        self.assertNotEqual(harplike.Harp36String.frequencies[0], 0)
+
+    def test_differentLengths(self):
+        """
+        We test that the strings must have
+        all their attributes.
+        """
+        inst = guitars.ClassicalGuitar()
+
+        inst.density = inst.density[:-1]
+        with self.assertRaises(ValueError):
+            inst.checker()
+
+        class Incomplete(guitars.ClassicalGuitar):
+            def __init__(self) -> None:
+                self.frequencies = [100, 200]
+                self.lengths = [0.65]
+                self.youngModulus = [5e9, 5e9]
+                self.density = [1000, 1000]
+                instrument.Instrument.__init__(self)
+
+        with self.assertRaises(ValueError):
+            Incomplete()
+
+
+def loopStep(inst: instrument.Instrument) -> np.ndarray:
+    """
+    Make one iteration of the tuning string by string,
+    like Instrument.tune did before Instrument.tuneStep().
+
+    Args:
+        - inst (instrument.Instrument): The instrument to tune.
+
+    Returns:
+        - np.ndarray: The turns of the strings.
+    """
+    turnIteration = np.zeros(len(inst.frequencies))
+
+    for i in range(len(inst.frequencies)):
+        difference = inst.frequencies[i] - inst.stringFrequencies[i]
+        if abs(difference) > inst.tolerances()[i]:
+            turn = inst.turner.tune(
+                inst.frequencies[i], inst.stringFrequencies[i], inst.lengths[i]
+            )
+            turnIteration[i] = turn
+
+            newLength = physics.calculateNewLength(
+                inst.lengths[i], inst.stringLengths[i], turn
+            )
+            inst.stringFrequencies[i] = physics.calculateStringNewFrequency(
+                inst.lengths[i],
+                inst.stringLengths[i],
+                turn,
+                inst.youngModulus[i],
+                inst.density[i],
+            )
+            inst.stringLengths[i] = newLength
+
+    return turnIteration
+
+
+class test_tuneStep(numTests):
+
+    def compare(self, first: instrument.Instrument, second: instrument.Instrument):
+        """
+        Tune two equal instruments, one with tuneStep() and the other
+        with loopStep(), checking that they give the same bits.
+
+        Args:
+            - first (instrument.Instrument): The instrument tuned with tuneStep().
+            - second (instrument.Instrument): The instrument tuned with loopStep().
+
+        Returns:
+            - None
+        """
+        for _ in range(50):
+            self.assertTrue(np.array_equal(first.tuneStep(), loopStep(second)))
+            self.assertTrue(
+                np.array_equal(first.stringFrequencies, second.stringFrequencies)
+            )
+            self.assertTrue(np.array_equal(first.stringLengths, second.stringLengths))
+
+    def test_sameAsLoop(self):
+        """
+        We test that the iterations of all the strings at
+        the same time are the same as string by string.
+        """
+        tuner = logic.Tuner(backend="numpy")
+
+        for _ in range(self.numTests // 10):
+            first = instrument.RandomInstrument(random.randint(1, 40))
+            second = copy.deepcopy(first)
+            first.turner = second.turner = tuner
+
+            self.compare(first, second)
+
+    def test_sameAsLoopSkfuzzy(self):
+        """
+        We test it also with the default Tuner.
+        """
+        first = guitars.ClassicalGuitar()
+        first.stringFrequencies[:] = np.random.uniform(0, 500, 6)
+        first.calculateTightness()
+        second = copy.deepcopy(first)
+
+        self.compare(first, second)
+
+    def test_tuned(self):
+        """
+        We test that tuned strings are not turned.
+        """
+        guitar = guitars.ClassicalGuitar()
+        guitar.stringFrequencies[:] = guitar.frequencies
+        guitar.calculateTightness()
+
+        self.assertFalse(np.any(guitar.tuneStep()))
+        self.assertEqual(guitar.tune(), [])
+
+
+class test_lazyTuner(numTests):
+
+    def test_notCreatedOnImport(self):
+        """
+        We test that importing the instruments doesn't
+        create the Tuner nor import the fuzzy logic.
+        """
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, guitars, harplike; print('logic' in sys.modules)",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_singleTuner(self):
+        """
+        We test that the threads that use the Tuner
+        at the same time share a single one.
+        """
+
+        class Owner:
+            turner = instrument.LazyTuner()
+
+        nThreads = 8
+        barrier = threading.Barrier(nThreads)
+        tuners = []
+
+        def use():
+            barrier.wait()
+            tuners.append(Owner().turner)
+
+        with mock.patch.object(logic, "Tuner", side_effect=object) as tunerClass:
+            threads = [threading.Thread(target=use) for _ in range(nThreads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(tunerClass.call_count, 1)
+        self.assertEqual(len(tuners), nThreads)
+        self.assertTrue(all(tuner is tuners[0] for tuner in tuners))
+
+    def test_replaceTuner(self):
+        """
+        We test that an instrument can use its own Tuner.
+        """
+        tuner = logic.Tuner(backend="numpy")
+
+        guitar = guitars.ClassicalGuitar()
+        guitar.turner = tuner
+
+        self.assertIs(guitar.turner, tuner)
+        self.assertIsNot(guitars.ClassicalGuitar().turner, tuner)
+
+
+class scaledTurner:
+    """
+    A turner that gives the exact turn of the physics multiplied by a scale.
+    """
+
+    def __init__(self, scale: float) -> None:
+        self.scale = scale
+
+    def tuneStrings(self, inst: instrument.Instrument, strings: np.ndarray):
+        return self.scale * physics.calculateTurnByFrequency(
+            inst.lengths[strings],
+            inst.stringLengths[strings],
+            inst.frequencies[strings],
+            inst.youngModulus[strings],
+            inst.density[strings],
+        )
+
+
+class constantTurner:
+    """
+    A turner that always gives the same turn.
+    """
+
+    def __init__(self, turn: float) -> None:
+        self.turn = turn
+
+    def tuneStrings(self, inst: instrument.Instrument, strings: np.ndarray):
+        return np.full(len(strings), self.turn)
+
+
+class stuckTurner(scaledTurner):
+    """
+    A turner that gives the exact turn except to one string that never turns.
+    """
+
+    def __init__(self, stuck: int) -> None:
+        super().__init__(1)
+        self.stuck = stuck
+
+    def tuneStrings(self, inst: instrument.Instrument, strings: np.ndarray):
+        return np.where(strings == self.stuck, 0, super().tuneStrings(inst, strings))
+
+
+class test_monitor(numTests):
+
+    def nearGuitar(self, difference: float) -> instrument.Instrument:
+        """
+        Create a guitar with its strings a difference below the objective.
+
+        Args:
+            - difference (float): The difference in hertz.
+
+        Returns:
+            - instrument.Instrument: The guitar.
+        """
+        guitar = guitars.ClassicalGuitar()
+        guitar.stringFrequencies[:] = guitar.frequencies - difference
+        guitar.calculateTightness()
+        return guitar
+
+    def test_damping(self):
+        """
+        We test that the strings that go past the objective every
+        time are tuned with damping and fail as oscillating without it.
+        """
+        guitar = self.nearGuitar(50)
+        guitar.turner = scaledTurner(1.9)
+
+        with self.assertRaises(instrument.TuningError) as context:
+            guitar.tune(damping=False)
+
+        result = context.exception.result
+        self.assertFalse(result["converged"])
+        self.assertEqual(result["reason"], "failed")
+        self.assertEqual(set(result["failed"].values()), {"oscillating"})
+
+        guitar = self.nearGuitar(50)
+        guitar.turner = scaledTurner(1.9)
+
+        self.assertLess(len(guitar.tune()), 20)
+        self.assertFalse(np.any(guitar.outOfTune()))
+
+    def test_stagnation(self):
+        """
+        We test that the strings that never improve fail as stagnated.
+        """
+        guitar = guitars.ClassicalGuitar()
+        guitar.turner = constantTurner(0)
+
+        with self.assertRaises(instrument.TuningError) as context:
+            guitar.tune()
+
+        result = context.exception.result
+        self.assertEqual(result["status"], ["stagnated"] * 6)
+        self.assertEqual(
+            result["iterations"], instrument.TuningMonitor(guitar).patience
+        )
+
+    def test_divergence(self):
+        """
+        We test that the strings that get further and further
+        from the objective fail as diverged.
+        """
+        guitar = self.nearGuitar(-10)
+        guitar.turner = constantTurner(1)
+
+        with self.assertRaises(instrument.TuningError) as context:
+            guitar.tune()
+
+        self.assertEqual(context.exception.result["status"], ["diverged"] * 6)
+        self.assertLess(context.exception.result["iterations"], 50)
+
+    def test_maxIterations(self):
+        """
+        We test that the iterations are limited and that the error
+        is still a TimeoutError for the code that expects one.
+        """
+        guitar = self.nearGuitar(50)
+        guitar.turner = scaledTurner(0.01)
+
+        with self.assertRaises(TimeoutError) as context:
+            guitar.tune(maxIterations=5)
+
+        result = context.exception.result
+        self.assertEqual(result["reason"], "maxIterations")
+        self.assertEqual(result["iterations"], 5)
+        self.assertEqual(len(result["turns"]), 5)
+        self.assertEqual(set(result["failed"].values()), {"active"})
+
+    def test_someStringsFail(self):
+        """
+        We test that the failed strings stop being turned
+        while the others are tuned.
+        """
+        guitar = self.nearGuitar(50)
+        guitar.turner = stuckTurner(2)
+
+        with self.assertRaises(instrument.TuningError) as context:
+            guitar.tune()
+
+        result = context.exception.result
+        self.assertEqual(list(result["failed"]), [2])
+        self.assertEqual(result["status"].count("tuned"), 5)
+        # The tuned strings are not turned again
+        turns = np.array(result["turns"])
+        self.assertEqual(np.count_nonzero(turns[:, 0]), 1)
+
+
+class test_tolerance(numTests):
+
+    def test_cents(self):
+        """
+        We test that with the cents model a string is tuned
+        inside toleranceCents of its objective and not outside.
+        """
+        for _ in range(self.numTests):
+            inst = instrument.RandomInstrument(random.randint(1, 40))
+            # Away from the limit, where the rounding decides
+            offsets = np.random.uniform(0.1, 3, len(inst.frequencies))
+            offsets *= np.random.choice([-1, 1], len(inst.frequencies))
+            signs = np.random.choice([-1, 1], len(inst.frequencies))
+            cents = signs * (inst.toleranceCents + offsets)
+
+            inst.stringFrequencies = inst.frequencies * 2 ** (cents / 1200)
+
+            self.assertTrue(
+                np.array_equal(inst.outOfTune(), np.abs(cents) > inst.toleranceCents)
+            )
+
+    def test_relative(self):
+        """
+        We test that the cents model allows the same relative error to all
+        the strings and the jnd model a smaller one to the highest string
+        than to the lowest one.
+        """
+        harp = harplike.Harp36String()
+        relative = harp.tolerances() / harp.frequencies
+        self.assertTrue(np.allclose(relative, relative[0]))
+
+        harp.toleranceModel = "jnd"
+        order = np.argsort(harp.frequencies)
+        tolerances = harp.tolerances()[order]
+        relative = tolerances / harp.frequencies[order]
+        self.assertTrue(np.all(np.diff(tolerances) > 0))
+        self.assertLess(relative[-1], relative[0])
+
+    def test_bassString(self):
+        """
+        We test that the lowest string of the BassTuningGuitar 3.5 Hz
+        under its objective is only tuned with the hertz model.
+        """
+        guitar = guitars.BassTuningGuitar()
+        lowest = np.argmin(guitar.frequencies)
+        guitar.stringFrequencies[:] = guitar.frequencies
+        guitar.stringFrequencies[lowest] -= 3.5
+
+        for model in ["cents", "jnd"]:
+            guitar.toleranceModel = model
+            self.assertTrue(guitar.outOfTune()[lowest])
+
+        guitar.toleranceModel = "hertz"
+        self.assertFalse(np.any(guitar.outOfTune()))
+
+    def test_invalidModel(self):
+        """
+        We test that an unknown tolerance model raises a ValueError.
+        """
+        guitar = guitars.ClassicalGuitar()
+        guitar.toleranceModel = "decibels"
+
+        with self.assertRaises(ValueError):
+            guitar.outOfTune()
+
+    def test_tune(self):
+        """
+        We test that tune() stops when all the strings
+        are inside the tolerance of each model.
+        """
+        for model in instrument.Instrument.toleranceModels:
+            guitar = guitars.ElectricGuitar()
+            guitar.toleranceModel = model
+
+            guitar.tune()
+
+            self.assertTrue(
+                np.all(
+                    np.abs(guitar.frequencies - guitar.stringFrequencies)
+                    <= guitar.tolerances()
+                )
+            )
@@ -0,0 +1,138 @@
+import unittest
+import live
+import logic
+import sound
+import numpy as np
+import random
+import tempfile
+import os
+
+
+class numTests(unittest.TestCase):
+    numTests = 10
+    tuner = logic.Tuner(backend="numpy")
+
+
+def pluck(frequency: float, duration: float = 1) -> np.ndarray:
+    """
+    Create the sound of a string that is plucked.
+
+    Args:
+        - frequency (float): The frequency of the delay line in hertz.
+        - duration (float): The duration in seconds.
+
+    Returns:
+        - np.ndarray: The sound signal.
+    """
+    return sound.createCordFrequency(
+        frequency, duration=duration, rng=np.random.default_rng(0)
+    )
+
+
+class test_sources(numTests):
+
+    def test_frames(self):
+        """
+        We test that the frames overlap and that the
+        frames of a WAV file are the same as the ones
+        of the signal that was saved in it.
+        """
+        signal = np.random.rand(5000) - 0.5
+
+        frames = list(live.SignalSource(signal, frameLength=640, hop=320))
+
+        self.assertEqual(len(frames), 14)
+        self.assertTrue(np.array_equal(frames[3], signal[960:1600]))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "signal.wav")
+
+            with sound.OfflineRenderer(path) as renderer:
+                renderer.play(signal)
+
+            source = live.WavSource(path)
+            source.blockLength = 1000
+            wavFrames = list(source)
+
+        self.assertEqual(source.sr, 16000)
+        self.assertEqual(len(wavFrames), len(frames))
+        for frame, wavFrame in zip(frames, wavFrames):
+            self.assertTrue(np.allclose(frame, wavFrame, atol=1e-4))
+
+    def test_incompleteSource(self):
+        """
+        We test that a source without blocks() can't be created.
+        """
+
+        class Incomplete(live.AudioSource):
+            pass
+
+        for source in [live.AudioSource, Incomplete]:
+            with self.assertRaises(TypeError):
+                source(16000)
+
+
+class test_tuningSession(numTests):
+
+    def test_instructions(self):
+        """
+        We test that one instruction is given for each note
+        with the same turn as the Tuner.
+        """
+        for _ in range(self.numTests):
+            objective = random.uniform(80, 400)
+            # Notes far enough to be different
+            frequencies = random.uniform(60, 400) * np.array([1, 1.1, 1.2])
+            np.random.shuffle(frequencies)
+
+            session = live.TuningSession(objective, 0.65, tuner=self.tuner)
+            signal = np.concatenate([pluck(f) for f in frequencies])
+
+            instructions = list(session.run(live.SignalSource(signal)))
+
+            self.assertEqual(len(instructions), 3)
+
+            for instruction, frequency in zip(instructions, frequencies):
+                # Period of the string half a sample shorter
+                expected = 16000 / (int(16000 / frequency) - 0.5)
+                self.assertAlmostEqual(
+                    instruction["frequency"], expected, delta=expected / 500
+                )
+                self.assertEqual(
+                    instruction["tuned"],
+                    abs(objective - instruction["frequency"]) <= 3.6,
+                )
+                if not instruction["tuned"]:
+                    self.assertEqual(
+                        instruction["turn"],
+                        self.tuner.tune(objective, instruction["frequency"], 0.65),
+                    )
+
+    def test_tuned(self):
+        """
+        We test that a string close to the objective is tuned
+        and that the note is repeated after a silence.
+        """
+        objective = 16000 / (int(16000 / 196) - 0.5)
+        session = live.TuningSession(objective + 1, 0.65, tuner=self.tuner)
+
+        signal = np.concatenate([pluck(196), np.zeros(3200), pluck(196)])
+        instructions = list(session.run(live.SignalSource(signal)))
+
+        self.assertEqual(len(instructions), 2)
+        self.assertTrue(all(i["tuned"] for i in instructions))
+        self.assertTrue(all(i["turn"] == 0 for i in instructions))
+
+        # Without the silence it is the same note
+        session.reset()
+        signal = np.concatenate([pluck(196), pluck(196)])
+        self.assertEqual(len(list(session.run(live.SignalSource(signal)))), 1)
+
+    def test_noise(self):
+        """
+        We test that noise does not give instructions.
+        """
+        session = live.TuningSession(196, 0.65, tuner=self.tuner)
+
+        signal = np.random.rand(16000) - 0.5
+        self.assertEqual(list(session.run(live.SignalSource(signal))), [])
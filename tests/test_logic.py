@@ -1,6 +1,12 @@
 import unittest
 import logic
 import random
+import numpy as np
+import skfuzzy as fuzz
+import pandas as pd
+import tempfile
+import os
+from unittest import mock
 
 
 class numTests(unittest.TestCase):
@@ -124,3 +130,161 @@ class test_turner(numTests):
                 nSuccess += 1
 
         print(f"Success rate: {100*nSuccess/self.numTests}%")
+
+
+class test_tuneMany(numTests):
+
+    def test_sameAsTune(self):
+        """
+        We test that tuning several strings at the same
+        time gives the same turns as tuning them one by one.
+        """
+        objectiveFrequency = [random.uniform(0, 1000) for _ in range(self.numTests)]
+        frequency = [random.uniform(0, 1000) for _ in range(self.numTests)]
+        stringLength = [random.uniform(0, 2) for _ in range(self.numTests)]
+
+        for backend in logic.Tuner.backends:
+            # The table backend creates its files in a temporary directory
+            with tempfile.TemporaryDirectory() as directory, mock.patch.object(
+                logic.Tuner, "dataframePath", os.path.join(directory, "turns.parquet")
+            ), mock.patch.object(
+                logic.Tuner, "surfacePath", os.path.join(directory, "turns.surface")
+            ):
+                turner = logic.Tuner(backend=backend)
+
+            turns = turner.tuneMany(objectiveFrequency, frequency, stringLength)
+
+            for i in range(self.numTests):
+                self.assertAlmostEqual(
+                    turns[i],
+                    turner.tune(objectiveFrequency[i], frequency[i], stringLength[i]),
+                    delta=self.tolerance,
+                )
+
+    def test_broadcasting(self):
+        """
+        We test that the arguments are broadcasted
+        against each other.
+        """
+        objectiveFrequency = np.array([random.uniform(0, 1000) for _ in range(10)])
+        frequency = np.array([[random.uniform(0, 1000)] for _ in range(5)])
+        stringLength = 0.65
+
+        turner = logic.Tuner(backend="numpy")
+
+        turns = turner.tuneMany(objectiveFrequency, frequency, stringLength)
+
+        self.assertEqual(turns.shape, (5, 10))
+
+        for i in range(5):
+            for j in range(10):
+                self.assertAlmostEqual(
+                    turns[i, j],
+                    turner.tune(objectiveFrequency[j], frequency[i, 0], stringLength),
+                    delta=self.tolerance,
+                )
+
+
+class test_createDataframe(numTests):
+
+    def test_reducedGrid(self):
+        """
+        We test that the DataFrame has the turns of
+        the controller and that the saved chunks of
+        a stopped process are used.
+        """
+        frequencies = np.arange(0, 300, 1.0)
+        lengths = np.arange(0.08, 1.2, 0.05)
+
+        turner = logic.Tuner(backend="numpy")
+
+        with tempfile.TemporaryDirectory() as directory:
+            turner.dataframePath = os.path.join(directory, "turns.parquet")
+
+            turner.createDataframe(
+                frequencies=frequencies, lengths=lengths, nWorkers=2, chunkSize=64
+            )
+
+            data = pd.read_parquet(turner.dataframePath)
+
+            frequencyGrid, lengthGrid = np.meshgrid(frequencies, lengths, indexing="ij")
+            self.assertTrue(
+                np.allclose(
+                    data.values,
+                    turner.calculateTurns(frequencyGrid, lengthGrid),
+                    atol=self.tolerance,
+                )
+            )
+            self.assertFalse(os.path.exists(turner.dataframePath + ".partial"))
+
+            # We simulate a stopped process with a chunk already saved
+            partialPath = turner.dataframePath + ".partial"
+            os.makedirs(partialPath)
+            np.savez(
+                os.path.join(partialPath, "grid.npz"),
+                fingerprint=turner.fingerprint(frequencies, lengths),
+                backend="numpy",
+            )
+            np.save(os.path.join(partialPath, "0-64.npy"), -np.ones((64, len(lengths))))
+
+            turner.createDataframe(
+                frequencies=frequencies, lengths=lengths, nWorkers=2, chunkSize=64
+            )
+
+            data = pd.read_parquet(turner.dataframePath)
+
+            self.assertTrue(np.all(data.values[:64] == -1))
+            self.assertTrue(np.all(data.values[64:] >= 0))
+
+
+class test_fingerprint(numTests):
+
+    def test_sameController(self):
+        """
+        We test that the fingerprint only depends
+        on the definition of the controller.
+        """
+        self.assertEqual(
+            logic.Tuner().fingerprint(), logic.Tuner(backend="numpy").fingerprint()
+        )
+
+    def test_differentController(self):
+        """
+        We test that the fingerprint changes when a membership
+        function, the defuzzify method or the grid change.
+        """
+
+        class OtherTurn(logic.Tuner):
+            def consequentTurn(self):
+                turn = super().consequentTurn()
+                turn["large"] = fuzz.trapmf(turn.universe, [0.7, 0.8, 1, 1])
+                return turn
+
+        turner = logic.Tuner()
+        fingerprint = turner.fingerprint()
+
+        self.assertNotEqual(fingerprint, OtherTurn().fingerprint())
+        self.assertNotEqual(
+            fingerprint, turner.fingerprint(frequencies=np.arange(0, 100, 1))
+        )
+
+        turner.turnConsequent.defuzzify_method = "centroid"
+        self.assertNotEqual(fingerprint, turner.fingerprint())
+
+    def test_upToDate(self):
+        """
+        We test that the DataFrame is only valid
+        for the controller and grid that created it.
+        """
+        turner = logic.Tuner(backend="numpy")
+
+        with tempfile.TemporaryDirectory() as directory:
+            turner.dataframePath = os.path.join(directory, "turns.parquet")
+
+            self.assertFalse(turner.isDataframeUpToDate())
+
+            turner.createDataframe()
+            self.assertTrue(turner.isDataframeUpToDate())
+
+            turner.createDataframe(frequencies=np.arange(0, 100, 1.0))
+            self.assertFalse(turner.isDataframeUpToDate())
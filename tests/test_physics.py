@@ -1,6 +1,7 @@
 import unittest
 import physics
 import random
+import numpy as np
 
 
 class numTests(unittest.TestCase):
@@ -340,3 +341,88 @@ class test_frecuency2(numTests):
             physics.calculateStringNewFrequency(
                 ogLengths[i], lengths[i], turns[i], elasticModulus[i], densities[i]
             )
+
+
+class test_vectorized(numTests):
+
+    def arguments(self) -> dict:
+        """
+        Create random arguments for every kernel.
+
+        Args:
+            - None
+
+        Returns:
+            - dict: The kernels and their arguments as arrays.
+        """
+        ogLengths = np.random.uniform(0.1, 2, self.numTests)
+        lengths = ogLengths + np.random.uniform(0, 0.1, self.numTests)
+        turns = np.random.uniform(-5, 5, self.numTests)
+        elasticModulus = np.random.uniform(10**9, 10**11, self.numTests)
+        densities = np.random.uniform(1000, 20000, self.numTests)
+        frequencies = np.random.uniform(0, 1000, self.numTests)
+
+        return {
+            physics.calculateNewLength: (ogLengths, lengths, turns),
+            physics.calculateStringTension: (
+                elasticModulus,
+                densities * 1e-9,
+                ogLengths,
+                lengths,
+            ),
+            physics.calculateStringFrequencyMersenne: (
+                lengths,
+                elasticModulus,
+                densities,
+            ),
+            physics.calculateStringNewFrequency: (
+                ogLengths,
+                lengths,
+                turns,
+                elasticModulus,
+                densities,
+            ),
+            physics.calculateNewLengthByFrequency: (
+                ogLengths,
+                frequencies,
+                elasticModulus,
+                densities,
+            ),
+        }
+
+    def test_sameAsScalars(self):
+        """
+        We test that the kernels give the same bits
+        for arrays as for each string alone.
+        """
+        for kernel, arguments in self.arguments().items():
+            results = kernel(*arguments)
+
+            self.assertEqual(results.shape, (self.numTests,))
+
+            for i in range(self.numTests):
+                result = kernel(*[float(argument[i]) for argument in arguments])
+                self.assertIsInstance(result, float)
+                self.assertEqual(result, results[i])
+
+    def test_broadcast(self):
+        """
+        We test that the arguments are broadcasted and
+        that the result can be written in a given array.
+        """
+        for kernel, arguments in self.arguments().items():
+            # The same string with several values of the first argument
+            shared = [argument[:1] for argument in arguments[1:]]
+            expected = kernel(
+                arguments[0], *[np.repeat(s, self.numTests) for s in shared]
+            )
+
+            out = np.empty(self.numTests)
+            result = kernel(arguments[0], *[float(s[0]) for s in shared], out=out)
+
+            self.assertIs(result, out)
+            self.assertTrue(np.array_equal(result, expected))
+
+        self.assertEqual(
+            physics.calculateNewLength(np.ones((3, 1)), 2, np.zeros(4)).shape, (3, 4)
+        )
@@ -0,0 +1,89 @@
+import unittest
+import pitch
+import sound
+import numpy as np
+import random
+
+
+class numTests(unittest.TestCase):
+    numTests = 100
+    # Tolerance in cents
+    tolerance = 3
+
+
+class test_pitchDetector(numTests):
+
+    def test_karplusStrong(self):
+        """
+        We test that the frequencies of the signals of
+        createCordFrequency() are detected in the first
+        frames after the attack.
+
+        The averaging of two samples of the delay line makes
+        the period of the sound half a sample shorter than it.
+        """
+        detector = pitch.PitchDetector()
+        rng = np.random.default_rng(0)
+
+        for _ in range(self.numTests):
+            frequency = rng.uniform(60, 900)
+            signal = sound.createCordFrequency(frequency, rng=rng)
+            expected = 16000 / (int(16000 / frequency) - 0.5)
+
+            for start in [320, 800]:
+                detected, confidence = detector.detect(signal[start : start + 640])
+
+                self.assertLess(
+                    abs(1200 * np.log2(detected / expected)), self.tolerance
+                )
+                self.assertGreater(confidence, 0.8)
+
+    def test_sine(self):
+        """
+        We test that the frequency of pure tones
+        is detected with high confidence.
+        """
+        detector = pitch.PitchDetector()
+        t = np.arange(640) / 16000
+
+        for _ in range(self.numTests):
+            frequency = random.uniform(60, 2000)
+            detected, confidence = detector.detect(
+                np.sin(2 * np.pi * frequency * t + random.uniform(0, 2 * np.pi))
+            )
+
+            self.assertLess(abs(1200 * np.log2(detected / frequency)), self.tolerance)
+            self.assertGreater(confidence, 0.95)
+
+    def test_noPitch(self):
+        """
+        We test that silence and frames too short
+        for the lowest frequency give no pitch.
+        """
+        detector = pitch.PitchDetector(minFrequency=100)
+
+        self.assertEqual(detector.detect(np.zeros(640)), (0.0, 0.0))
+        self.assertEqual(detector.detect(np.full(640, 0.5)), (0.0, 0.0))
+        self.assertEqual(detector.detect(np.random.rand(16)), (0.0, 0.0))
+        self.assertEqual(detector.minFrameLength(), 323)
+
+        with self.assertRaises(ValueError):
+            pitch.PitchDetector(minFrequency=500, maxFrequency=100)
+
+    def test_detectFrames(self):
+        """
+        We test that the frames of a signal are analyzed
+        like when they are detected one by one.
+        """
+        detector = pitch.PitchDetector()
+        signal = sound.createCordFrequency(220, duration=0.2)
+
+        frequencies, confidences = detector.detectFrames(signal, 640, 320)
+
+        self.assertEqual(len(frequencies), 9)
+        self.assertEqual(
+            (frequencies[3], confidences[3]), detector.detect(signal[960:1600])
+        )
+        self.assertEqual(
+            pitch.detectPitch(signal[960:1600]), detector.detect(signal[960:1600])
+        )
@@ -0,0 +1,248 @@
+import unittest
+import solver
+import physics
+import instrument
+import guitars
+import harplike
+import fleet
+import logic
+import random
+import numpy as np
+
+
+class numTests(unittest.TestCase):
+    numTests = 100
+    tolerance = 1e-6
+
+
+class test_physicsSolver(numTests):
+
+    def test_exactTurn(self):
+        """
+        We test that the turn of calculateTurnByFrequency()
+        gives the objective frequency.
+        """
+        origLength = np.random.uniform(0.1, 1.5, self.numTests)
+        actualLength = origLength + np.random.uniform(0, 0.01, self.numTests)
+        frequency = np.random.uniform(50, 2000, self.numTests)
+        youngModulus = np.random.uniform(2.93e9, 200e9, self.numTests)
+        density = np.random.uniform(1140, 7850, self.numTests)
+
+        turn = physics.calculateTurnByFrequency(
+            origLength, actualLength, frequency, youngModulus, density
+        )
+
+        self.assertTrue(
+            np.allclose(
+                physics.calculateStringNewFrequency(
+                    origLength, actualLength, turn, youngModulus, density
+                ),
+                frequency,
+                rtol=self.tolerance,
+            )
+        )
+
+        for i in range(self.numTests):
+            self.assertEqual(
+                physics.calculateTurnByFrequency(
+                    origLength[i],
+                    actualLength[i],
+                    frequency[i],
+                    youngModulus[i],
+                    density[i],
+                ),
+                turn[i],
+            )
+
+    def test_oneIteration(self):
+        """
+        We test that without damping all the strings
+        are tuned in one iteration.
+        """
+        instruments = [
+            guitars.ClassicalGuitar(),
+            guitars.ElectricGuitar(),
+            harplike.Harp36String(),
+        ]
+        instruments += [
+            instrument.RandomInstrument(random.randint(1, 40))
+            for _ in range(self.numTests)
+        ]
+
+        for inst in instruments:
+            inst.turner = solver.PhysicsSolver()
+
+            self.assertEqual(len(inst.tune()), 1)
+            self.assertFalse(np.any(inst.outOfTune()))
+
+    def test_damping(self):
+        """
+        We test that with damping the strings get closer to
+        the objective in each iteration until they are tuned.
+        """
+        guitar = guitars.ClassicalGuitar()
+        guitar.turner = solver.PhysicsSolver(damping=0.5)
+
+        previous = np.abs(guitar.frequencies - guitar.stringFrequencies)
+
+        iterations = 0
+        while np.any(guitar.outOfTune()):
+            guitar.tuneStep()
+            iterations += 1
+
+            difference = np.abs(guitar.frequencies - guitar.stringFrequencies)
+            self.assertTrue(np.all(difference <= previous))
+            previous = difference
+
+        self.assertGreater(iterations, 1)
+
+    def test_invalidDamping(self):
+        """
+        We test that the damping must be between 0 and 1.
+        """
+        for damping in [0, -0.5, 1.5]:
+            with self.assertRaises(ValueError):
+                solver.PhysicsSolver(damping=damping)
+
+    def test_fleet(self):
+        """
+        We test that a fleet tuned with the solver converges in one iteration.
+        """
+        instruments = [
+            instrument.RandomInstrument(random.randint(1, 40)) for _ in range(10)
+        ]
+
+        results, summary = fleet.runFleet(
+            instruments, backend="physics", nWorkers=2, verbose=False
+        )
+
+        self.assertEqual(summary["converged"], len(instruments))
+        self.assertTrue(all(result["iterations"] == 1 for result in results))
+
+
+class test_adaptiveTuner(numTests):
+    tuner = logic.Tuner(backend="numpy")
+
+    def tuneIterations(self, inst: instrument.Instrument, limit: int = 100) -> int:
+        """
+        Tune an instrument with a maximum number of iterations.
+
+        Args:
+            - inst (instrument.Instrument): The instrument.
+            - limit (int): The maximum number of iterations.
+
+        Returns:
+            - int: The number of iterations or None if it didn't converge.
+        """
+        for iterations in range(limit + 1):
+            if not np.any(inst.outOfTune()):
+                return iterations
+            inst.tuneStep()
+        return None
+
+    def test_converges(self):
+        """
+        We test that the instruments that the fuzzy Tuner
+        can't tune are tuned in a few iterations.
+        """
+        instruments = [guitars.ElectricGuitar(), harplike.Harp36String()]
+        instruments += [
+            instrument.RandomInstrument(random.randint(1, 40))
+            for _ in range(self.numTests // 5)
+        ]
+
+        for inst in instruments:
+            inst.turner = solver.AdaptiveTuner(self.tuner)
+
+            self.assertIsNotNone(self.tuneIterations(inst))
+
+    def test_fewerIterations(self):
+        """
+        We test that the nylon strings of the ClassicalGuitar
+        are tuned in fewer iterations than with the fuzzy Tuner.
+        """
+        fuzzy = guitars.ClassicalGuitar()
+        fuzzy.turner = self.tuner
+
+        adaptive = guitars.ClassicalGuitar()
+        adaptive.turner = solver.AdaptiveTuner(self.tuner)
+
+        self.assertLess(self.tuneIterations(adaptive), self.tuneIterations(fuzzy))
+
+    def test_firstTurnIsFuzzy(self):
+        """
+        We test that before the gains are known the turns are the fuzzy ones.
+        """
+        guitar = guitars.ElectricGuitar()
+        guitar.turner = solver.AdaptiveTuner(self.tuner)
+
+        strings = np.arange(len(guitar.frequencies))
+        expected = self.tuner.tuneStrings(guitar, strings)
+
+        self.assertTrue(np.array_equal(guitar.tuneStep(), expected))
+
+    def test_gain(self):
+        """
+        We test that the estimated gain of a tuned string is of
+        the order of its change of frequency per revolution.
+        """
+        guitar = guitars.ElectricGuitar()
+        adaptive = solver.AdaptiveTuner(self.tuner)
+        guitar.turner = adaptive
+
+        self.tuneIterations(guitar)
+
+        # The change of frequency of a small turn from the current length
+        delta = 1e-6
+        slope = (
+            physics.calculateStringNewFrequency(
+                guitar.lengths,
+                guitar.stringLengths,
+                delta,
+                guitar.youngModulus,
+                guitar.density,
+            )
+            - guitar.stringFrequencies
+        ) / delta
+
+        # The gains come from secants of the last turns, so they are rough
+        ratio = adaptive.state(guitar)["gain"] / slope
+        self.assertTrue(np.all((ratio > 0.5) & (ratio < 2)))
+
+    def test_sharedState(self):
+        """
+        We test that each instrument has its own gains.
+        """
+        adaptive = solver.AdaptiveTuner(self.tuner)
+
+        electric = guitars.ElectricGuitar()
+        classical = guitars.ClassicalGuitar()
+        electric.turner = classical.turner = adaptive
+
+        for _ in range(3):
+            electric.tuneStep()
+            classical.tuneStep()
+
+        self.assertEqual(len(adaptive.states), 2)
+
+        # The steel strings are stiffer than the nylon ones
+        electricGains = adaptive.state(electric)["gain"]
+        classicalGains = adaptive.state(classical)["gain"]
+        known = np.isfinite(electricGains) & np.isfinite(classicalGains)
+
+        self.assertTrue(np.any(known))
+        self.assertTrue(np.all(electricGains[known] > classicalGains[known]))
+
+    def test_invalidParameters(self):
+        """
+        We test that the parameters are checked.
+        """
+        for kwargs in [
+            {"forgetting": 0},
+            {"forgetting": 1.5},
+            {"minScale": 0},
+            {"minScale": 2},
+            {"maxScale": 0.5},
+        ]:
+            with self.assertRaises(ValueError):
+                solver.AdaptiveTuner(self.tuner, **kwargs)
@@ -0,0 +1,345 @@
+import unittest
+import sound
+import numpy as np
+import random
+import time
+import tempfile
+import os
+import wave
+
+
+class numTests(unittest.TestCase):
+    numTests = 20
+    tolerance = 1e-12
+
+
+class test_karplusStrong(numTests):
+
+    def test_sameAsLoop(self):
+        """
+        We test that the vectorized Karplus-Strong algorithm
+        gives the same signal as the original loop.
+        """
+        for _ in range(self.numTests):
+            delayLength = random.randint(1, 600)
+            nSamples = random.randint(delayLength, 5000)
+            delayLine = np.random.rand(delayLength) * 2 - 1
+
+            self.assertTrue(
+                np.allclose(
+                    sound.karplusStrong(delayLine, nSamples, 0.99),
+                    sound.karplusStrongLoop(delayLine, nSamples, 0.99),
+                    rtol=0,
+                    atol=self.tolerance,
+                )
+            )
+
+    def test_blocksExact(self):
+        """
+        We test that calculating the signal by periods
+        gives exactly the signal of the original loop.
+        """
+        for _ in range(self.numTests):
+            delayLength = random.randint(1, 600)
+            nSamples = random.randint(delayLength, 5000)
+            delayLine = np.random.rand(delayLength) * 2 - 1
+
+            self.assertTrue(
+                np.array_equal(
+                    sound.karplusStrongBlocks(delayLine, nSamples, 0.99),
+                    sound.karplusStrongLoop(delayLine, nSamples, 0.99),
+                )
+            )
+
+    def test_createCordFrequency(self):
+        """
+        We test that the signal of a string has the same length
+        and starts with the noise for every frequency.
+        """
+        for frequency in [0, 30.87, 82.41, 329.63, 1864.655, 8000]:
+            np.random.seed(0)
+            signal = sound.createCordFrequency(frequency)
+
+            self.assertEqual(len(signal), 32000)
+
+            if frequency > 0:
+                np.random.seed(0)
+                delayLine = np.random.rand(int(16000 / frequency)) * 2 - 1
+                self.assertTrue(
+                    np.allclose(
+                        signal,
+                        sound.karplusStrongLoop(delayLine, 32000, 0.99),
+                        rtol=0,
+                        atol=self.tolerance,
+                    )
+                )
+
+
+class test_waveformCache(numTests):
+
+    def test_hitsAndMisses(self):
+        """
+        We test that frequencies within the cent resolution
+        share the signal and that the counters are updated.
+        """
+        cache = sound.WaveformCache(centResolution=5)
+
+        first = cache.get(440)
+        second = cache.get(440 * 2 ** (1 / 1200))
+        third = cache.get(450)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+        self.assertFalse(first.flags.writeable)
+
+    def test_key(self):
+        """
+        We test that the sample rate, duration, decay
+        and seed are part of the key.
+        """
+        cache = sound.WaveformCache()
+
+        signal = cache.get(220)
+
+        self.assertIsNot(signal, cache.get(220, sr=8000))
+        self.assertIsNot(signal, cache.get(220, duration=1))
+        self.assertIsNot(signal, cache.get(220, decay=0.9))
+        self.assertIsNot(signal, cache.get(220, seed=1))
+        self.assertEqual(cache.misses, 5)
+
+        self.assertEqual(len(cache.get(220, sr=8000)), 16000)
+        self.assertTrue(np.array_equal(signal, sound.WaveformCache().get(220)))
+
+    def test_leastRecentlyUsed(self):
+        """
+        We test that the least recently used
+        signal is removed when it is full.
+        """
+        cache = sound.WaveformCache(maxSize=2)
+
+        cache.get(100)
+        cache.get(200)
+        cache.get(100)
+        cache.get(300)
+
+        self.assertEqual(len(cache.signals), 2)
+
+        cache.get(100)
+        self.assertEqual(cache.hits, 2)
+
+        cache.get(200)
+        self.assertEqual(cache.misses, 4)
+
+    def test_silence(self):
+        """
+        We test that strings without tension are silent.
+        """
+        cache = sound.WaveformCache()
+
+        self.assertFalse(np.any(cache.get(0)))
+        self.assertIs(cache.get(0), cache.get(-5))
+
+
+class test_playbackEngine(numTests):
+
+    def test_mix(self):
+        """
+        We test that the sounds that are played are added
+        and that the buffer is empty after reading them.
+        """
+        engine = sound.PlaybackEngine(bufferSeconds=1)
+
+        first = np.random.rand(3000) * 2 - 1
+        second = np.random.rand(1000) * 2 - 1
+        engine.play(first)
+        engine.play(second)
+
+        self.assertEqual(engine.pending, 3000)
+
+        outdata = np.zeros((2048, 1), dtype=np.float32)
+        engine.callback(outdata, 2048, None, None)
+
+        expected = first[:2048].copy()
+        expected[:1000] += second
+        self.assertTrue(np.allclose(outdata[:, 0], expected, atol=1e-6))
+        self.assertFalse(np.any(engine.buffer[:2048]))
+        self.assertEqual(engine.pending, 952)
+
+    def test_wrapAround(self):
+        """
+        We test that the sounds continue at the start
+        of the buffer when they reach its end.
+        """
+        engine = sound.PlaybackEngine(sr=1000, bufferSeconds=1)
+
+        outdata = np.zeros((900, 1), dtype=np.float32)
+        engine.callback(outdata, 900, None, None)
+
+        signal = np.random.rand(500)
+        engine.play(signal)
+
+        outdata = np.zeros((500, 1), dtype=np.float32)
+        engine.callback(outdata, 500, None, None)
+
+        self.assertTrue(np.allclose(outdata[:, 0], signal, atol=1e-6))
+        self.assertEqual(engine.position, 400)
+        self.assertFalse(np.any(engine.buffer))
+
+    def test_nonBlocking(self):
+        """
+        We test that play returns without waiting
+        for the sound and that wait does.
+        """
+        signal = np.zeros(1600)
+
+        with sound.PlaybackEngine(device=sound.PlaybackEngine.nullDevice) as engine:
+            start = time.perf_counter()
+            engine.play(signal)
+            self.assertLess(time.perf_counter() - start, 0.05)
+
+            engine.wait()
+            self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+            self.assertEqual(engine.pending, 0)
+
+        self.assertIsNone(engine.stream)
+
+
+class test_offlineRenderer(numTests):
+
+    def test_npy(self):
+        """
+        We test that the sounds are saved one after
+        the other in a .npy file.
+        """
+        signals = [
+            np.random.rand(random.randint(1, 5000)) for _ in range(self.numTests)
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.npy")
+
+            with sound.OfflineRenderer(path) as renderer:
+                for signal in signals:
+                    sound.playSound(signal, output=renderer)
+
+            self.assertFalse(os.path.exists(path + ".part"))
+
+            saved = np.load(path)
+
+        self.assertEqual(saved.dtype, np.float32)
+        self.assertTrue(np.allclose(saved, np.concatenate(signals), atol=1e-6))
+
+    def test_wav(self):
+        """
+        We test that the sounds are saved in a .wav
+        file and that they are clipped.
+        """
+        signal = np.linspace(-2, 2, 16000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.wav")
+
+            with sound.OfflineRenderer(path, sr=8000) as renderer:
+                renderer.play(signal)
+                renderer.play(signal)
+
+            with wave.open(path, "rb") as file:
+                self.assertEqual(file.getframerate(), 8000)
+                self.assertEqual(file.getnframes(), 32000)
+                saved = np.frombuffer(file.readframes(32000), dtype="<i2")
+
+        self.assertTrue(
+            np.allclose(saved / 32767, np.clip(np.tile(signal, 2), -1, 1), atol=1e-4)
+        )
+
+    def test_unknownFormat(self):
+        """
+        We test that an unknown extension is rejected.
+        """
+        with self.assertRaises(ValueError):
+            sound.OfflineRenderer("session.mp3")
+
+
+class test_combineSounds(numTests):
+
+    def test_sameAsConcatenation(self):
+        """
+        We test that each signal starts sound length
+        samples after the previous one.
+        """
+        for _ in range(self.numTests):
+            soundLength = random.randint(1, 100)
+            signals = [
+                np.random.rand(random.randint(0, 300))
+                for _ in range(random.randint(0, 6))
+            ]
+
+            length = max(
+                [soundLength * len(signals)]
+                + [i * soundLength + len(s) for i, s in enumerate(signals)]
+            )
+
+            expected = np.zeros(length)
+            for i, signal in enumerate(signals):
+                expected[i * soundLength : i * soundLength + len(signal)] += signal
+
+            combined = sound.combineSounds(signals, soundLength)
+
+            self.assertEqual(len(combined), length)
+            self.assertTrue(np.array_equal(combined, expected))
+
+    def test_buffer(self):
+        """
+        We test that the signals are mixed in the given
+        buffer and that a short buffer is rejected.
+        """
+        signals = [np.random.rand(500) for _ in range(4)]
+        expected = sound.combineSounds(signals, 100)
+
+        buffer = np.random.rand(1000)
+        combined = sound.combineSounds(signals, 100, out=buffer)
+
+        self.assertTrue(np.shares_memory(combined, buffer))
+        self.assertTrue(np.array_equal(combined, expected))
+
+        with self.assertRaises(ValueError):
+            sound.combineSounds(signals, 100, out=np.zeros(799))
+
+    def test_gainsAndOffsets(self):
+        """
+        We test the gains and offsets of the signals,
+        also with the voices in a 2-D array.
+        """
+        voices = np.random.rand(3, 200)
+        gains = [0.5, 1, 2]
+        offsets = [50, 0, 50]
+
+        expected = np.zeros(250)
+        for voice, gain, offset in zip(voices, gains, offsets):
+            expected[offset : offset + 200] += gain * voice
+
+        for signals in [list(voices), voices]:
+            combined = sound.combineSounds(signals, 10, gains=gains, offsets=offsets)
+            self.assertTrue(np.allclose(combined, expected, atol=self.tolerance))
+
+        self.assertTrue(
+            np.allclose(
+                sound.combineSounds(voices, 10, gains=0.5, offsets=[0, 0, 0]),
+                0.5 * voices.sum(axis=0),
+                atol=self.tolerance,
+            )
+        )
+
+        # The default offsets, one after the other
+        self.assertTrue(
+            np.allclose(
+                sound.combineSounds(voices, 100),
+                sound.combineSounds(list(voices), 100),
+                atol=self.tolerance,
+            )
+        )
+
+        with self.assertRaises(ValueError):
+            sound.combineSounds(voices, offsets=[0, -1, 0])
@@ -0,0 +1,173 @@
+import unittest
+import tracing
+import instrument
+import guitars
+import logic
+import sound
+import numpy as np
+import contextlib
+import copy
+import io
+import os
+import tempfile
+
+
+class numTests(unittest.TestCase):
+    numTests = 5
+
+
+class recordingTracer(tracing.Tracer):
+    """
+    A tracer that keeps the calls of its hooks.
+    """
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.strings = []
+        self.result = None
+
+    def startTuning(self, inst) -> None:
+        self.calls.append("startTuning")
+
+    def startIteration(self, iteration: int) -> None:
+        self.calls.append(("startIteration", iteration))
+
+    def stringTurned(
+        self, iteration: int, index: int, turn: float, difference: float
+    ) -> None:
+        self.strings.append((iteration, index, turn, difference))
+
+    def endIteration(self, iteration: int, turns: np.ndarray) -> None:
+        self.calls.append(("endIteration", iteration))
+
+    def endTuning(self, inst, result: dict) -> None:
+        self.calls.append("endTuning")
+        self.result = result
+
+
+class test_tracer(numTests):
+
+    def test_hooks(self):
+        """
+        We test that the hooks are called once for each
+        iteration and for each string that is turned.
+        """
+        guitar = guitars.ClassicalGuitar()
+        tracer = recordingTracer()
+
+        turns = guitar.tune(tracer=tracer)
+
+        expected = ["startTuning"]
+        for iteration in range(len(turns)):
+            expected += [("startIteration", iteration), ("endIteration", iteration)]
+        expected.append("endTuning")
+        self.assertEqual(tracer.calls, expected)
+
+        turned = [
+            (iteration, index)
+            for iteration, turn in enumerate(turns)
+            for index in np.flatnonzero(turn)
+        ]
+        self.assertEqual([string[:2] for string in tracer.strings], turned)
+        for iteration, index, turn, _ in tracer.strings:
+            self.assertEqual(turn, turns[iteration][index])
+
+        self.assertTrue(tracer.result["converged"])
+        self.assertEqual(tracer.result["reason"], "tuned")
+
+    def test_failed(self):
+        """
+        We test that the end of the tuning is traced
+        before the error of a tuning that stopped.
+        """
+        guitar = guitars.ClassicalGuitar()
+        tracer = recordingTracer()
+
+        with self.assertRaises(instrument.TuningError):
+            guitar.tune(maxIterations=2, tracer=tracer)
+
+        self.assertEqual(tracer.calls[-1], "endTuning")
+        self.assertEqual(tracer.result["reason"], "maxIterations")
+        self.assertEqual(tracer.result["iterations"], 2)
+
+    def test_sameTurns(self):
+        """
+        We test that tracing the tuning doesn't change it.
+        """
+        tuner = logic.Tuner(backend="numpy")
+
+        for _ in range(self.numTests):
+            inst = instrument.RandomInstrument(np.random.randint(1, 40))
+            traced = copy.deepcopy(inst)
+            inst.turner = traced.turner = tuner
+
+            turns = inst.tune()
+            tracedTurns = traced.tune(tracer=tracing.ProfileTracer(verbose=False))
+
+            self.assertTrue(np.array_equal(turns, tracedTurns))
+            self.assertTrue(
+                np.array_equal(inst.stringFrequencies, traced.stringFrequencies)
+            )
+
+
+class test_profileTracer(numTests):
+
+    def test_phases(self):
+        """
+        We test that the phases of each iteration are measured
+        and that they are a part of the time of the tuning.
+        """
+        guitar = guitars.ClassicalGuitar()
+        tracer = tracing.ProfileTracer(verbose=False)
+
+        turns = guitar.tune(tracer=tracer)
+
+        self.assertEqual(len(tracer.timings), len(turns))
+        for timing in tracer.timings:
+            self.assertEqual(set(timing), {"inference", "physics"})
+            self.assertTrue(all(value >= 0 for value in timing.values()))
+
+        # Before each iteration and the one that finds all the strings tuned
+        self.assertEqual(len(tracer.outside["monitor"]), len(turns) + 1)
+
+        summary = tracer.summary()
+        self.assertEqual(summary["inference"]["calls"], len(turns))
+        self.assertEqual(summary["monitor"]["calls"], len(turns) + 1)
+        self.assertLessEqual(sum(row["share"] for row in summary.values()), 1)
+
+        self.assertTrue(
+            np.array_equal(
+                tracer.stringTurns, np.count_nonzero(np.array(turns), axis=0)
+            )
+        )
+
+    def test_sound(self):
+        """
+        We test that the synthesis and the playback
+        are measured when the sound is enabled.
+        """
+        guitar = guitars.ElectricGuitar()
+        tracer = tracing.ProfileTracer(verbose=False)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with sound.OfflineRenderer(os.path.join(directory, "tune.wav")) as output:
+                turns = guitar.tune(
+                    soundEnabled=True, soundOutput=output, tracer=tracer
+                )
+
+        summary = tracer.summary()
+        self.assertEqual(summary["synthesis"]["calls"], len(turns))
+        self.assertEqual(summary["playback"]["calls"], len(turns))
+
+    def test_printSummary(self):
+        """
+        We test that the summary is printed at the end if it is verbose.
+        """
+        guitar = guitars.ClassicalGuitar()
+        printed = io.StringIO()
+
+        with contextlib.redirect_stdout(printed):
+            turns = guitar.tune(tracer=tracing.ProfileTracer())
+
+        self.assertIn("inference", printed.getvalue())
+        self.assertIn(f"Iterations: {len(turns)}", printed.getvalue())
@@ -0,0 +1,283 @@
+"""
+Follow the tuning of an instrument with a tracer.
+
+Instrument.tune() calls the hooks of its tracer in each iteration and for
+each string that is turned, and measures its phases with Tracer.phase():
+    - monitor: TuningMonitor.update(), that finds the strings to turn.
+    - inference: The turns given by the turner, the fuzzy logic.Tuner by default.
+    - physics: The new frequencies and lengths of the strings.
+    - synthesis: The signal of the strum, if the sound is enabled.
+    - playback: Playing the strum, if the sound is enabled.
+    - output: Printing the tuning, if it is verbose.
+    - plotting: The graphs at the end, if they are shown.
+
+The default Tracer does nothing and its phases are not measured.
+A ProfileTracer adds up the time of each phase and prints a summary:
+    inst.tune(tracer=tracing.ProfileTracer())
+"""
+
+import contextlib
+import time
+import numpy as np
+
+
+class Tracer:
+    """
+    A tracer that does nothing.
+
+    The tracers that follow the tuning inherit from
+    it and only redefine the hooks that they need.
+    """
+
+    # The same context manager for every phase, so it doesn't allocate
+    noPhase = contextlib.nullcontext()
+
+    def startTuning(self, inst) -> None:
+        """
+        Called before the first iteration.
+
+        Args:
+            - inst (instrument.Instrument): The instrument that is tuned.
+
+        Returns:
+            - None
+        """
+
+    def startIteration(self, iteration: int) -> None:
+        """
+        Called at the start of each iteration.
+
+        Args:
+            - iteration (int): The number of the iteration, from 0.
+
+        Returns:
+            - None
+        """
+
+    def phase(self, name: str):
+        """
+        Give the context manager that measures a phase of the tuning.
+
+        Args:
+            - name (str): The name of the phase.
+
+        Returns:
+            - contextlib.AbstractContextManager: The context of the phase.
+        """
+        return self.noPhase
+
+    def stringTurned(
+        self, iteration: int, index: int, turn: float, difference: float
+    ) -> None:
+        """
+        Called for each string turned in an iteration.
+
+        Args:
+            - iteration (int): The number of the iteration.
+            - index (int): The index of the string.
+            - turn (float): The turn of the string in revolutions.
+            - difference (float): The difference between the objective
+                                and the frequency after the turn in hertz.
+
+        Returns:
+            - None
+        """
+
+    def endIteration(self, iteration: int, turns: np.ndarray) -> None:
+        """
+        Called at the end of each iteration.
+
+        Args:
+            - iteration (int): The number of the iteration.
+            - turns (np.ndarray): The turns of the strings, zero for the ones not turned.
+
+        Returns:
+            - None
+        """
+
+    def endTuning(self, inst, result: dict) -> None:
+        """
+        Called when the tuning ends, also if it failed.
+
+        Args:
+            - inst (instrument.Instrument): The instrument that was tuned.
+            - result (dict): The result of the tuning, see
+                            instrument.TuningMonitor.result().
+
+        Returns:
+            - None
+        """
+
+
+# The tracer used when none is given
+nullTracer = Tracer()
+
+
+class Phase:
+    """
+    The measurement of a phase of a ProfileTracer.
+    """
+
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer: "ProfileTracer", name: str) -> None:
+        """
+        Initialize the Phase class.
+
+        Args:
+            - tracer (ProfileTracer): The tracer that gets the time.
+            - name (str): The name of the phase.
+
+        Returns:
+            - None
+        """
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> "Phase":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tracer.addTime(self.name, time.perf_counter_ns() - self.start)
+
+
+class ProfileTracer(Tracer):
+    """
+    Measure the time of each phase of the tuning.
+
+    The nanoseconds of each phase are kept by iteration in timings and
+    the ones outside the iterations in outside, like the monitor, that
+    decides if there is another iteration, or the plotting.
+    The turns of each string are counted in stringTurns. At the end of
+    the tuning a summary is printed if it is verbose.
+    """
+
+    def __init__(self, verbose: bool = True) -> None:
+        """
+        Initialize the ProfileTracer class.
+
+        Args:
+            - verbose (bool): A boolean that indicates if the summary
+                            is printed at the end of the tuning.
+
+        Returns:
+            - None
+        """
+        self.verbose = verbose
+        self.timings = []
+        self.outside = {}
+        self.stringTurns = None
+        self.iteration = None
+        self.start = None
+        self.seconds = None
+
+    def startTuning(self, inst) -> None:
+        self.timings = []
+        self.outside = {}
+        self.stringTurns = np.zeros(len(inst.frequencies), dtype=int)
+        self.start = time.perf_counter_ns()
+
+    def startIteration(self, iteration: int) -> None:
+        self.iteration = iteration
+        self.timings.append({})
+
+    def phase(self, name: str) -> Phase:
+        return Phase(self, name)
+
+    def addTime(self, name: str, nanoseconds: int) -> None:
+        """
+        Add the time of a phase to the current iteration, if there is one.
+
+        Args:
+            - name (str): The name of the phase.
+            - nanoseconds (int): The time of the phase.
+
+        Returns:
+            - None
+        """
+        if self.iteration is None:
+            self.outside.setdefault(name, []).append(nanoseconds)
+        else:
+            timing = self.timings[-1]
+            timing[name] = timing.get(name, 0) + nanoseconds
+
+    def stringTurned(
+        self, iteration: int, index: int, turn: float, difference: float
+    ) -> None:
+        self.stringTurns[index] += 1
+
+    def endIteration(self, iteration: int, turns: np.ndarray) -> None:
+        self.iteration = None
+
+    def endTuning(self, inst, result: dict) -> None:
+        self.seconds = (time.perf_counter_ns() - self.start) / 1e9
+
+        if self.verbose:
+            self.printSummary()
+
+    def summary(self) -> dict:
+        """
+        Summarize the time of each phase.
+
+        Args:
+            - None
+
+        Returns:
+            - dict: For each phase, from the slowest one:
+                - seconds (float): The total time.
+                - share (float): The fraction of the time of the tuning.
+                - calls (int): The number of iterations where it was measured,
+                            and of times outside them.
+                - mean (float): The mean time of each call in seconds.
+                - max (float): The slowest call in seconds.
+        """
+        phases = {}
+        for timing in self.timings:
+            for name, nanoseconds in timing.items():
+                phases.setdefault(name, []).append(nanoseconds / 1e9)
+        for name, values in self.outside.items():
+            phases.setdefault(name, []).extend(value / 1e9 for value in values)
+
+        total = self.seconds if self.seconds else sum(map(sum, phases.values()))
+
+        summary = {
+            name: {
+                "seconds": sum(values),
+                "share": sum(values) / total if total else 0.0,
+                "calls": len(values),
+                "mean": sum(values) / len(values),
+                "max": max(values),
+            }
+            for name, values in phases.items()
+        }
+
+        return dict(
+            sorted(summary.items(), key=lambda item: item[1]["seconds"], reverse=True)
+        )
+
+    def printSummary(self) -> None:
+        """
+        Print the summary of the phases as a table.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        summary = self.summary()
+        width = max([len(name) for name in summary], default=5)
+
+        print(f"{'phase':<{width}}  {'seconds':>10} {'share':>7} {'mean ms':>10}")
+        for name, row in summary.items():
+            print(
+                f"{name:<{width}}  {row['seconds']:10.4f} {row['share']:7.1%} "
+                f"{row['mean'] * 1000:10.3f}"
+            )
+
+        if self.seconds is not None:
+            print(f"{'total':<{width}}  {self.seconds:10.4f}")
+        print(f"Iterations: {len(self.timings)}")
+        if self.stringTurns is not None:
+            print(f"Turns by string: {self.stringTurns.tolist()}")